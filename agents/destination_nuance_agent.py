@@ -24,12 +24,14 @@ from .data_models import (
     MultiLLMGenerationResult, SearchValidationResult, DestinationNuanceCollection
 )
 from src.evidence_deduplication_manager import EvidenceDeduplicationManager
+from src.core.embedding_store import get_embedding_store
+from src.core.search_scheduler import SearchScheduler
+from src.core.http_client import get_http_client
 
 # Required imports for LLM connections
 import openai
 import google.generativeai as genai
 import anthropic
-import aiohttp
 import os
 
 logger = logging.getLogger(__name__)
@@ -53,6 +55,7 @@ class DestinationNuanceAgent(BaseAgent):
         
         # Initialize semantic similarity model for comparing nuances
         self.semantic_model = SentenceTransformer('all-MiniLM-L6-v2')
+        self.embedding_store = get_embedding_store('all-MiniLM-L6-v2', config)
         self.semantic_threshold = 0.8  # Similarity threshold for semantic matching
         
         # Initialize configuration
@@ -110,8 +113,20 @@ class DestinationNuanceAgent(BaseAgent):
         
         # Search API setup - load after dotenv
         self.brave_api_key = os.getenv('BRAVE_SEARCH_API_KEY')
-        self.search_cache = {}
         self.search_validation_enabled = True  # Will be set to False if API not available
+        self.http = get_http_client(self.config)
+        
+        # One concurrency/rate budget for every search issued by this agent, with
+        # identical in-flight queries merged and results persisted across runs
+        self.query_variant_lookahead = validation_config.get('query_variant_lookahead', 2)
+        self.search_scheduler = SearchScheduler(
+            self._fetch_search_results,
+            max_concurrent=validation_config.get('max_concurrent_searches', validation_config.get('batch_size', 5)),
+            requests_per_second=validation_config.get('requests_per_second'),
+            burst=validation_config.get('request_burst', 1),
+            cache_namespace="nuance_search",
+            cache_expiry_days=validation_config.get('search_cache_expiry_days', 7)
+        )
         
         # Scoring configuration
         scoring_config = self.nuance_config.get('scoring', {})
@@ -379,16 +394,15 @@ authentic cultural immersion"""
         
         try:
             # Test search API with a simple query
-            async with aiohttp.ClientSession() as session:
-                headers = {'X-Subscription-Token': self.brave_api_key}
-                url = f"https://api.search.brave.com/res/v1/web/search?q=test&count=1"
-                
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 200:
-                        self.logger.info("✅ Brave Search API validated")
-                        self.search_validation_enabled = True
-                    else:
-                        raise Exception(f"Brave API returned status {response.status}")
+            headers = {'X-Subscription-Token': self.brave_api_key}
+            url = f"https://api.search.brave.com/res/v1/web/search?q=test&count=1"
+            
+            async with self.http.get(url, headers=headers) as response:
+                if response.status == 200:
+                    self.logger.info("✅ Brave Search API validated")
+                    self.search_validation_enabled = True
+                else:
+                    raise Exception(f"Brave API returned status {response.status}")
         
         except Exception as e:
             self.logger.warning(f"Search API validation failed: {e} - search validation will be disabled")
@@ -752,7 +766,11 @@ authentic cultural immersion"""
         processed_phrases = set()
         
         # Get embeddings for all unique phrases
-        embeddings = self.semantic_model.encode(unique_phrases)
+        if self.embedding_store is not None:
+            embeddings = self.embedding_store.encode(self.semantic_model, unique_phrases)
+        else:
+            embeddings = self.semantic_model.encode(unique_phrases)
+        embedding_by_phrase = dict(zip(unique_phrases, embeddings))
         
         for i, phrase in enumerate(unique_phrases):
             if phrase in processed_phrases:
@@ -789,12 +807,12 @@ authentic cultural immersion"""
                     # Find the phrase most similar to all others in the group
                     best_score = -1
                     for candidate in similar_phrases:
-                        candidate_embedding = self.semantic_model.encode([candidate])[0]
+                        candidate_embedding = embedding_by_phrase[candidate]
                         avg_similarity = np.mean([
                             np.dot(candidate_embedding, other_emb) / (
                                 np.linalg.norm(candidate_embedding) * np.linalg.norm(other_emb)
                             )
-                            for other_emb in [self.semantic_model.encode([p])[0] for p in similar_phrases if p != candidate]
+                            for other_emb in [embedding_by_phrase[p] for p in similar_phrases if p != candidate]
                         ]) if len(similar_phrases) > 1 else 1.0
                         
                         if avg_similarity > best_score:
@@ -828,64 +846,14 @@ authentic cultural immersion"""
                 processing_time=time.time() - start_time
             )
         
-        for category, phrases in phrases_by_category.items():
-            if not phrases:
-                continue
-                
-            # Get requirements for this category
-            requirements = self.category_requirements.get(category, {})
-            max_to_test = requirements.get('max_count', 10) + 10  # Test more phrases to ensure we get enough
-            test_phrases = phrases[:max_to_test]
-            
-            category_validated = []
-            
-            # Real search validation - 1 authoritative URL = sufficient evidence
-            validation_tasks = []
-            for phrase in test_phrases:
-                task = asyncio.create_task(self._validate_phrase_simple(destination, phrase, category))
-                validation_tasks.append((phrase, task))
-            
-            # Execute validations
-            for phrase, task in validation_tasks:
-                try:
-                    nuance_phrase = await task
-                    if nuance_phrase:
-                        category_validated.append(nuance_phrase)
-                    else:
-                        failed_phrases[category].append(phrase)
-                        
-                except Exception as e:
-                    self.logger.warning(f"Validation failed for phrase '{phrase}' in category {category}: {e}")
-                    failed_phrases[category].append(phrase)
-            
-            # Sort by score and ensure we meet minimum requirements
-            category_validated.sort(key=lambda x: x.score, reverse=True)
-            min_required = requirements.get('min_count', 6)
-            max_allowed = requirements.get('max_count', 10)
-            
-            # Implement fallback validation if we don't meet minimums
-            if len(category_validated) < min_required:
-                self.logger.warning(f"Only {len(category_validated)}/{min_required} {category} phrases validated - implementing fallback")
-                
-                # Get the failed phrases and try fallback validation on the best ones
-                category_failed = failed_phrases[category]
-                fallback_needed = min_required - len(category_validated)
-                
-                # Use confidence-based fallback validation for top failed phrases
-                fallback_phrases = await self._fallback_validation(destination, category_failed[:fallback_needed * 2], category)
-                category_validated.extend(fallback_phrases)
-                
-                # Remove successfully validated phrases from failed list
-                validated_phrase_texts = {p.phrase for p in fallback_phrases}
-                failed_phrases[category] = [p for p in category_failed if p not in validated_phrase_texts]
-                
-                # Re-sort after adding fallback phrases
-                category_validated.sort(key=lambda x: x.score, reverse=True)
-                self.logger.info(f"Fallback validation added {len(fallback_phrases)} phrases for {category}")
-            
-            # Take the best validated phrases up to max
-            final_validated = category_validated[:max_allowed]
-            
+        # Validate every category at once; the search scheduler enforces the shared budget
+        category_results = await asyncio.gather(*[
+            self._validate_category(destination, category, phrases, failed_phrases)
+            for category, phrases in phrases_by_category.items()
+            if phrases
+        ])
+        
+        for category, final_validated in category_results:
             # Add to collection based on category
             if category == 'destination':
                 validated_collection.destination_nuances = final_validated
@@ -906,6 +874,7 @@ authentic cultural immersion"""
             },
             'phrases_failed_by_category': {cat: len(phrases) for cat, phrases in failed_phrases.items()},
             'search_validation_enabled': self.search_validation_enabled,
+            'search_scheduler': dict(self.search_scheduler.stats),
             'minimum_requirements_met': {
                 cat: len(getattr(validated_collection, f"{cat}_nuances" if cat == "destination" else f"{cat}_expectations")) >= self.category_requirements[cat]['min_count']
                 for cat in ['destination', 'hotel', 'vacation_rental']
@@ -920,9 +889,90 @@ authentic cultural immersion"""
             processing_time=processing_time
         )
     
+    async def _validate_category(self, destination: str, category: str, phrases: List[str],
+                                 failed_phrases: Dict[str, List[str]]) -> Tuple[str, List[NuancePhrase]]:
+        """Search-validate one category's phrases and apply its min/max requirements"""
+        # Get requirements for this category
+        requirements = self.category_requirements.get(category, {})
+        max_to_test = requirements.get('max_count', 10) + 10  # Test more phrases to ensure we get enough
+        test_phrases = phrases[:max_to_test]
+        
+        category_validated = []
+        
+        # Real search validation - 1 authoritative URL = sufficient evidence
+        validation_tasks = []
+        for phrase in test_phrases:
+            task = asyncio.create_task(self._validate_phrase_simple(destination, phrase, category))
+            validation_tasks.append((phrase, task))
+        
+        # Execute validations
+        for phrase, task in validation_tasks:
+            try:
+                nuance_phrase = await task
+                if nuance_phrase:
+                    category_validated.append(nuance_phrase)
+                else:
+                    failed_phrases[category].append(phrase)
+                    
+            except Exception as e:
+                self.logger.warning(f"Validation failed for phrase '{phrase}' in category {category}: {e}")
+                failed_phrases[category].append(phrase)
+        
+        # Sort by score and ensure we meet minimum requirements
+        category_validated.sort(key=lambda x: x.score, reverse=True)
+        min_required = requirements.get('min_count', 6)
+        max_allowed = requirements.get('max_count', 10)
+        
+        # Implement fallback validation if we don't meet minimums
+        if len(category_validated) < min_required:
+            self.logger.warning(f"Only {len(category_validated)}/{min_required} {category} phrases validated - implementing fallback")
+            
+            # Get the failed phrases and try fallback validation on the best ones
+            category_failed = failed_phrases[category]
+            fallback_needed = min_required - len(category_validated)
+            
+            # Use confidence-based fallback validation for top failed phrases
+            fallback_phrases = await self._fallback_validation(destination, category_failed[:fallback_needed * 2], category)
+            category_validated.extend(fallback_phrases)
+            
+            # Remove successfully validated phrases from failed list
+            validated_phrase_texts = {p.phrase for p in fallback_phrases}
+            failed_phrases[category] = [p for p in category_failed if p not in validated_phrase_texts]
+            
+            # Re-sort after adding fallback phrases
+            category_validated.sort(key=lambda x: x.score, reverse=True)
+            self.logger.info(f"Fallback validation added {len(fallback_phrases)} phrases for {category}")
+        
+        # Take the best validated phrases up to max
+        final_validated = category_validated[:max_allowed]
+        
+        return category, final_validated
+    
     async def _validate_phrase_simple(self, destination: str, phrase: str, category: str) -> Optional[NuancePhrase]:
         """Validate a phrase using search API - 1 authoritative URL = sufficient evidence"""
         try:
+            # Reuse search validation from a previous session if the registry has it
+            known_evidence = self._known_search_evidence(destination, phrase, category)
+            if known_evidence:
+                primary = known_evidence[0]
+                self.logger.debug(f"♻️ Reusing registered evidence for '{phrase}' ({len(known_evidence)} sources)")
+                return NuancePhrase(
+                    phrase=phrase,
+                    category=category,
+                    score=0.8,  # Same base score a fresh search validation assigns
+                    search_hits=primary.get('search_metadata', {}).get('search_results_count', len(known_evidence)),
+                    uniqueness_ratio=1.0,
+                    evidence_sources=["search_validation"],
+                    source_urls=[e['source_url'] for e in known_evidence[:3]],
+                    validation_metadata={
+                        'search_results_count': primary.get('search_metadata', {}).get('search_results_count', len(known_evidence)),
+                        'primary_source': primary['source_url'],
+                        'source_title': primary.get('search_metadata', {}).get('source_title', ''),
+                        'authority_validated': True,
+                        'reused_from_registry': True
+                    }
+                )
+            
             # Try multiple search query formats (from most specific to least specific)
             search_queries = [
                 f'"{phrase}" "{destination}"',  # Exact match (strictest)
@@ -932,12 +982,11 @@ authentic cultural immersion"""
                 f'{phrase} Japan travel' if 'Japan' in destination else f'{phrase} travel'  # Broader context
             ]
             
-            search_results = []
-            for query in search_queries:
-                search_results = await self._search_phrase_with_urls(query)
-                if search_results and len(search_results) > 0:
-                    self.logger.debug(f"✅ Found results for '{phrase}' using query: {query}")
-                    break
+            # Variants run with limited lookahead; the first (most specific) one
+            # that returns URLs wins and the remaining variants are cancelled
+            search_results = await self.search_scheduler.first_with_results(
+                search_queries, lookahead=self.query_variant_lookahead
+            )
             
             if not search_results or len(search_results) == 0:
                 self.logger.debug(f"❌ No results found for '{phrase}' with any query format")
@@ -975,46 +1024,49 @@ authentic cultural immersion"""
     
     async def _search_phrase_with_urls(self, query: str) -> List[Dict[str, Any]]:
         """Search for a phrase and return actual URLs and content"""
-        # Check cache first
-        if query in self.search_cache:
-            return self.search_cache[query]
-        
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {'X-Subscription-Token': self.brave_api_key}
-                # Get more results to have better evidence
-                url = f"https://api.search.brave.com/res/v1/web/search?q={query}&count=5"
-                
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        # Extract actual URLs and content from Brave Search results
-                        web_results = data.get('web', {}).get('results', [])
-                        
-                        search_results = []
-                        for result in web_results:
-                            if result.get('url'):  # Must have a URL
-                                search_result = {
-                                    'url': result.get('url', ''),
-                                    'title': result.get('title', ''),
-                                    'description': result.get('description', ''),
-                                    'authority_score': 0.8,  # Brave Search results are generally authoritative
-                                    'relevance_score': 0.9   # Query-specific results are relevant
-                                }
-                                search_results.append(search_result)
-                        
-                        # Cache result
-                        self.search_cache[query] = search_results
-                        return search_results
-                    else:
-                        self.logger.warning(f"Search API returned status {response.status} for query: {query}")
-                        return []
-                        
+            return await self.search_scheduler.search(query)
         except Exception as e:
             self.logger.error(f"Search failed for query '{query}': {e}")
             return []
     
+    async def _fetch_search_results(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        """Perform one Brave Search request. Returns None when the request failed."""
+        try:
+            headers = {'X-Subscription-Token': self.brave_api_key}
+            # Get more results to have better evidence
+            url = f"https://api.search.brave.com/res/v1/web/search?q={query}&count=5"
+            
+            async with self.http.get(url, headers=headers) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    
+                    # Extract actual URLs and content from Brave Search results
+                    web_results = data.get('web', {}).get('results', [])
+                    
+                    search_results = []
+                    for result in web_results:
+                        if result.get('url'):  # Must have a URL
+                            search_result = {
+                                'url': result.get('url', ''),
+                                'title': result.get('title', ''),
+                                'description': result.get('description', ''),
+                                'authority_score': 0.8,  # Brave Search results are generally authoritative
+                                'relevance_score': 0.9   # Query-specific results are relevant
+                            }
+                            search_results.append(search_result)
+                    
+                    return search_results
+                else:
+                    self.logger.warning(f"Search API returned status {response.status} for query: {query}")
+                    return None
+                    
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Search failed for query '{query}': {e}")
+            return None
+    
     def _calculate_phrase_score(self, hit_count: int, uniqueness_ratio: float, evidence_sources: int) -> float:
         """Calculate final score for a phrase"""
         # Hit count score (log-scaled)
@@ -1265,6 +1317,11 @@ authentic cultural immersion"""
         """Collect multiple evidence pieces for a single phrase"""
         evidence_pieces = []
         
+        # Evidence already validated in an earlier session needs no new searches
+        known_evidence = self._known_search_evidence(destination, phrase.phrase, category)
+        if len(known_evidence) >= target_count:
+            return [NuanceEvidence(**e) for e in known_evidence[:target_count]]
+        
         for attempt in range(max_retries + 1):
             try:
                 if phrase.validation_metadata.get('validation_method') == 'fallback_confidence':
@@ -1291,6 +1348,14 @@ authentic cultural immersion"""
         
         return evidence_pieces[:target_count]  # Limit to target count
     
+    def _known_search_evidence(self, destination: str, phrase: str, category: str) -> List[Dict[str, Any]]:
+        """Search-validated evidence for this phrase recorded by a previous session"""
+        known = self.evidence_deduplication.get_known_evidence(destination, category, phrase)
+        return [
+            e for e in known
+            if e.get('source_type') == 'search_validation' and e.get('source_url')
+        ]
+    
     async def _create_multi_search_evidence(self, destination: str, phrase: NuancePhrase, category: str, target_count: int) -> List[NuanceEvidence]:
         """Create multiple evidence pieces from search-validated phrases"""
         evidence_list = []
@@ -6,9 +6,10 @@ Coordinates all major process agents for intelligent destination processing work
 
 import asyncio
 import logging
+import re
 import time
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 
 from .base_agent import BaseAgent, AgentMessage, AgentState
@@ -19,7 +20,9 @@ from .evidence_validation_agent import EvidenceValidationAgent
 from .quality_assurance_agent import QualityAssuranceAgent
 from .seasonal_image_agent import SeasonalImageAgent
 from .destination_nuance_agent import DestinationNuanceAgent
-from .data_models import WorkflowResult
+from .data_models import WorkflowResult, WebDiscoveryResult
+from src.core.phase_scheduler import PhaseScheduler
+from src.core.workflow_journal import WorkflowJournal
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +39,33 @@ class WorkflowState:
     resource_allocation: Dict[str, Any] = None
     error_count: int = 0
     retry_count: int = 0
+    phase_timings: Dict[str, Any] = None
+    phase_attempts: Dict[str, int] = field(default_factory=dict)
+    completed_phases: Dict[str, datetime] = field(default_factory=dict)
+    
+    def checkpoint(self, phase: str, result: Any):
+        """Keep a completed phase result so retries never redo finished phases"""
+        self.phase_results[phase] = result
+        self.completed_phases[phase] = datetime.now()
+    
+    def is_completed(self, phase: str) -> bool:
+        return phase in self.completed_phases
+    
+    def record_attempt(self, phase: str) -> int:
+        """Count an execution of ``phase`` and return its attempt number"""
+        self.phase_attempts[phase] = self.phase_attempts.get(phase, 0) + 1
+        return self.phase_attempts[phase]
+
+# Phases in workflow order (the order results are reported in)
+WORKFLOW_PHASES = (
+    'web_discovery',
+    'llm_processing',
+    'evidence_validation',
+    'intelligence_enhancement',
+    'destination_nuances',
+    'seasonal_image_generation',
+    'quality_assurance'
+)
 
 # WorkflowResult is now imported from data_models
 
@@ -140,16 +170,28 @@ class AgentOrchestrator(BaseAgent):
         else:
             raise ValueError(f"Unknown task type: {task_type}")
     
-    async def execute_workflow(self, destinations: List[str]) -> Dict[str, WorkflowResult]:
-        """Execute the complete workflow for multiple destinations"""
+    async def execute_workflow(self, destinations: List[str],
+                               journal: Optional[WorkflowJournal] = None) -> Dict[str, WorkflowResult]:
+        """
+        Execute the complete workflow for multiple destinations. With a
+        ``journal``, every completed phase and destination is checkpointed;
+        destinations the journal already marks complete are rebuilt from their
+        checkpointed phases, re-running only phases that had failed.
+        """
         self.logger.info(f"🚀 Starting workflow execution for {len(destinations)} destinations")
         
+        if journal is not None:
+            await journal.record_batch(destinations)
+            completed = [d for d in destinations if journal.is_complete(d)]
+            if completed:
+                self.logger.info(f"♻️ Resuming: {len(completed)} destinations already complete in {journal.journal_file}")
+        
         # Create workflow instances
         workflow_tasks = []
         for destination in destinations:
             workflow_id = f"workflow_{destination.lower().replace(' ', '_').replace(',', '')}_{int(time.time())}"
             task = asyncio.create_task(
-                self._execute_destination_workflow(workflow_id, destination)
+                self._execute_destination_workflow(workflow_id, destination, journal)
             )
             workflow_tasks.append(task)
         
@@ -189,8 +231,9 @@ class AgentOrchestrator(BaseAgent):
         self.logger.info(f"🎉 Workflow execution complete: {len([r for r in final_results.values() if r.success])}/{len(destinations)} successful")
         return final_results
     
-    async def _execute_destination_workflow(self, workflow_id: str, destination: str) -> WorkflowResult:
-        """Execute workflow for a single destination"""
+    async def _execute_destination_workflow(self, workflow_id: str, destination: str,
+                                            journal: Optional[WorkflowJournal] = None) -> WorkflowResult:
+        """Execute workflow for a single destination as a phase dependency graph"""
         start_time = time.time()
         workflow_state = WorkflowState(
             workflow_id=workflow_id,
@@ -208,22 +251,39 @@ class AgentOrchestrator(BaseAgent):
         enable_nuance_processing = processing_mode.get('enable_nuance_processing', True)
         enable_seasonal_images = processing_mode.get('enable_seasonal_images', True)
         
-        try:
-            self.logger.info(f"🎯 Starting workflow for {destination}")
-            
-            # Show processing mode status
-            if not enable_theme_processing:
-                self.logger.info(f"🛡️ Theme processing DISABLED - preserving existing themes for {destination}")
-            if not enable_seasonal_images:
-                self.logger.info(f"🎨 Seasonal images DISABLED - skipping image generation for {destination}")
+        # Phases checkpointed by an interrupted run are restored, not re-run
+        restored_phases = await journal.completed_phases(destination) if journal is not None else {}
+        for phase, result in restored_phases.items():
+            workflow_state.checkpoint(phase, result)
+        if restored_phases:
+            self.logger.info(f"♻️ Restored checkpointed phases for {destination}: {', '.join(restored_phases)}")
+        
+        def phase_started(phase: str):
+            workflow_state.current_phase = phase
+        
+        def phase_completed(phase: str, result: Any):
+            workflow_state.checkpoint(phase, result)
+        
+        scheduler = PhaseScheduler(on_phase_start=phase_started, on_phase_complete=phase_completed)
+        
+        def add_phase(phase: str, run, **options):
+            async def run_or_restore(inputs: Dict[str, Any]) -> Any:
+                if phase in restored_phases:
+                    return restored_phases[phase]
+                result = await run(inputs)
+                # Failed phases raise past this point, so a resumed run retries them
+                if journal is not None:
+                    await journal.record_phase(destination, phase, result)
+                return result
+            scheduler.add_phase(phase, run_or_restore, **options)
+        
+        async def web_discovery_phase(inputs: Dict[str, Any]) -> Any:
+            self.logger.info(f"📊 Phase 1: Web Discovery for {destination}")
+            discovery_strategy = await self.decision_engine.plan_discovery_strategy(destination)
+            discovery_result = None
             
-            # Skip theme processing phases if disabled
-            if enable_theme_processing:
-                # Phase 1: Web Discovery with intelligent strategy
-                self.logger.info(f"📊 Phase 1: Web Discovery for {destination}")
-                workflow_state.current_phase = "web_discovery"
-                
-                discovery_strategy = await self.decision_engine.plan_discovery_strategy(destination)
+            while True:
+                attempt = workflow_state.record_attempt('web_discovery')
                 discovery_task_result = await self._execute_agent_task(
                     'web_discovery',
                     'execute_discovery',
@@ -233,270 +293,147 @@ class AgentOrchestrator(BaseAgent):
                         'requirements': {'quality_threshold': self.quality_threshold}
                     }
                 )
-            else:
-                # Skip theme processing but create placeholder data
-                self.logger.info(f"🛡️ Skipping theme processing for {destination} - creating placeholders")
-                discovery_task_result = None
-            
-            # Extract the actual DiscoveryResult from the task result (only if theme processing enabled)
-            if enable_theme_processing and discovery_task_result:
-                if hasattr(discovery_task_result, 'data') and discovery_task_result.data:
-                    # AgentResponse format - use .data property
-                    discovery_result = discovery_task_result.data
-                elif hasattr(discovery_task_result, 'result'):
-                    # Legacy format - use .result property
-                    discovery_result = discovery_task_result.result
-                elif isinstance(discovery_task_result, dict):
-                    # Dict format - may contain nested AgentResponse
-                    nested_result = discovery_task_result.get('result')
-                    
-                    # Check if nested result is an AgentResponse
-                    if hasattr(nested_result, 'data') and nested_result.data:
-                        discovery_result = nested_result.data
-                    else:
-                        discovery_result = nested_result
-                else:
-                    discovery_result = discovery_task_result
-                
-                workflow_state.phase_results['web_discovery'] = discovery_result
-                
-                # Quality gate: Check discovery quality
-                discovery_quality = await self._assess_phase_quality('web_discovery', discovery_result)
-                if discovery_quality < 0.5 and workflow_state.retry_count < self.max_workflow_retries:
-                    self.logger.warning(f"Discovery quality low ({discovery_quality:.2f}), retrying...")
-                    workflow_state.retry_count += 1
-                    return await self._execute_destination_workflow(workflow_id, destination)
-            else:
-                # Create placeholder discovery result
-                discovery_result = None
-                workflow_state.phase_results['web_discovery'] = {'status': 'skipped', 'reason': 'theme_processing_disabled'}
-            
-            # Phase 2: LLM Processing with adaptive resource allocation (only if theme processing enabled)
-            if enable_theme_processing:
-                self.logger.info(f"🧠 Phase 2: LLM Processing for {destination}")
-                workflow_state.current_phase = "llm_processing"
-                
-                # Convert DiscoveryResult to dict for resource allocation
-                discovery_dict = discovery_result.__dict__ if hasattr(discovery_result, '__dict__') else discovery_result
-                llm_resources = await self.resource_allocator.allocate_llm_resources(
-                    discovery_dict, workflow_state.resource_allocation
+                # Sources from earlier attempts are kept, not thrown away
+                discovery_result = self._merge_discovery_results(
+                    discovery_result, self._unwrap_discovery_result(discovery_task_result)
                 )
                 
-                # Format web content for LLM processing
-                content_list = discovery_result.content if hasattr(discovery_result, 'content') else []
-                
-                # Convert WebContent objects to dictionaries for agents
-                content_dicts = []
-                for content_item in content_list:
-                    if hasattr(content_item, '__dict__'):
-                        # WebContent object - convert to dict
-                        content_dict = {
-                            'url': getattr(content_item, 'url', ''),
-                            'title': getattr(content_item, 'title', ''),
-                            'content': getattr(content_item, 'content', ''),
-                            'relevance_score': getattr(content_item, 'relevance_score', 0.5),
-                            'quality_score': getattr(content_item, 'quality_score', 0.5),
-                            'authority_score': getattr(content_item, 'authority_score', 0.5),
-                            'metadata': getattr(content_item, 'metadata', {})
-                        }
-                        content_dicts.append(content_dict)
-                    elif isinstance(content_item, dict):
-                        # Already a dict
-                        content_dicts.append(content_item)
-                
-                web_content = {
-                    'content': content_dicts
-                }
+                # Quality gate: only this phase is retried, nothing downstream has consumed it yet
+                discovery_quality = await self._assess_phase_quality('web_discovery', discovery_result)
+                if discovery_quality >= 0.5 or workflow_state.retry_count >= self.max_workflow_retries:
+                    return discovery_result
                 
-                llm_task_result = await self._execute_agent_task(
-                    'llm_orchestration',
-                    'execute_llm_pipeline',
-                    {
-                        'destination': destination,
-                        'web_content': web_content,
-                        'resource_allocation': llm_resources
-                    }
+                workflow_state.retry_count += 1
+                discovery_strategy = self.decision_engine.widen_discovery_strategy(discovery_strategy, attempt)
+                self.logger.warning(
+                    f"Discovery quality low ({discovery_quality:.2f}), retrying discovery with "
+                    f"{discovery_strategy['query_depth']} depth, {discovery_strategy['max_sources']} sources..."
                 )
-            else:
-                # Skip LLM processing - create placeholder data
-                llm_task_result = None
-                web_content = {'content': []}  # Empty content for nuance processing
-            
-            # Extract the actual LLMProcessingResult from the task result (only if theme processing enabled)
-            if enable_theme_processing and llm_task_result:
-                if hasattr(llm_task_result, 'data') and llm_task_result.data:
-                    # AgentResponse format - use .data property
-                    actual_llm_result = llm_task_result.data
-                elif hasattr(llm_task_result, 'result'):
-                    # Legacy format - use .result property
-                    actual_llm_result = llm_task_result.result
-                elif isinstance(llm_task_result, dict) and 'result' in llm_task_result:
-                    # AgentResponse dictionary format - extract from 'result' key
-                    actual_llm_result = llm_task_result['result']
-                else:
-                    actual_llm_result = llm_task_result
-                
-                workflow_state.phase_results['llm_processing'] = actual_llm_result
-                
-                # Extract themes for next phases using the actual LLMProcessingResult
-                if hasattr(actual_llm_result, '__dict__'):
-                    # Check if this is an AgentResponse with nested data
-                    if hasattr(actual_llm_result, 'data') and actual_llm_result.data:
-                        # Extract from the nested .data field (LLMProcessingResult)
-                        llm_data = actual_llm_result.data
-                        themes = getattr(llm_data, 'themes', [])
-                        affinities = getattr(llm_data, 'affinities', [])
-                    else:
-                        # Object format (direct LLMProcessingResult)
-                        themes = getattr(actual_llm_result, 'themes', [])
-                        affinities = getattr(actual_llm_result, 'affinities', [])
-                elif isinstance(actual_llm_result, dict):
-                    # Dictionary format
-                    themes = actual_llm_result.get('themes', [])
-                    affinities = actual_llm_result.get('affinities', [])
-                else:
-                    themes = []
-                    affinities = []
-            else:
-                # Skip LLM processing - create placeholder data
-                actual_llm_result = None
-                workflow_state.phase_results['llm_processing'] = {'status': 'skipped', 'reason': 'theme_processing_disabled'}
-                themes = []
-                affinities = []
-            
-            # Phase 3: Conditional Parallel Enhancement based on processing mode
-            self.logger.info(f"⚡ Phase 3: Conditional Enhancement for {destination}")
-            workflow_state.current_phase = "parallel_enhancement"
+        
+        async def llm_processing_phase(inputs: Dict[str, Any]) -> Any:
+            self.logger.info(f"🧠 Phase 2: LLM Processing for {destination}")
+            discovery_result = inputs['web_discovery']
             
-            # Prepare tasks based on processing mode
-            enhancement_tasks = []
-            task_names = []
+            # Convert DiscoveryResult to dict for resource allocation
+            discovery_dict = discovery_result.__dict__ if hasattr(discovery_result, '__dict__') else discovery_result
+            llm_resources = await self.resource_allocator.allocate_llm_resources(
+                discovery_dict, workflow_state.resource_allocation
+            )
             
-            # Only run theme-related tasks if theme processing is enabled
-            if enable_theme_processing:
-                self.logger.info(f"🧠 Running theme enhancement tasks for {destination}")
-                
-                # Evidence validation task
-                evidence_task = self._execute_agent_task(
-                    'evidence_validation',
-                    'validate_comprehensive_evidence',
-                    {
-                        'themes': affinities,  # Pass raw affinities for evidence validation
-                        'web_sources': web_content,
+            llm_task_result = await self._execute_agent_task(
+                'llm_orchestration',
+                'execute_llm_pipeline',
+                {
+                    'destination': destination,
+                    'web_content': self._build_web_content(discovery_result),
+                    'resource_allocation': llm_resources
+                }
+            )
+            return self._unwrap_llm_result(llm_task_result)
+        
+        async def evidence_validation_phase(inputs: Dict[str, Any]) -> Any:
+            web_content = self._build_web_content(inputs['web_discovery'])
+            return await self._execute_agent_task(
+                'evidence_validation',
+                'validate_comprehensive_evidence',
+                {
+                    'themes': self._extract_affinities(inputs['llm_processing']),  # Pass raw affinities for evidence validation
+                    'web_sources': web_content,
+                    'destination': destination
+                }
+            )
+        
+        async def intelligence_enhancement_phase(inputs: Dict[str, Any]) -> Any:
+            web_content = self._build_web_content(inputs['web_discovery'])
+            return await self._execute_agent_task(
+                'intelligence_enhancement',
+                'enhance_themes',
+                {
+                    'themes': self._extract_affinities(inputs['llm_processing']),  # Pass raw affinities for enhancement
+                    'destination_context': {'destination': destination},
+                    'evidence_data': web_content,  # Pass web content for evidence validation
+                    'web_sources': web_content  # Pass web sources for comprehensive processing
+                }
+            )
+        
+        async def destination_nuances_phase(inputs: Dict[str, Any]) -> Any:
+            self.logger.info(f"🎯 Running nuance generation for {destination}")
+            return await self._execute_agent_task(
+                'destination_nuance',
+                'generate_nuances',
+                {
+                    'destination': destination
+                }
+            )
+        
+        async def seasonal_image_phase(inputs: Dict[str, Any]) -> Any:
+            self.logger.info(f"🎨 Seasonal Image Generation for {destination}")
+            return await self._execute_agent_task(
+                'seasonal_image',
+                'generate_seasonal_images',
+                {
+                    'destination': destination,
+                    'output_dir': self._resolve_image_output_dir(workflow_id, workflow_state),
+                    'workflow_context': {
+                        'workflow_id': workflow_id,
                         'destination': destination
                     }
-                )
-                enhancement_tasks.append(evidence_task)
-                task_names.append('evidence_validation')
-                
-                # Intelligence enhancement task
-                enhancement_task = self._execute_agent_task(
-                    'intelligence_enhancement',
-                    'enhance_themes',
-                    {
-                        'themes': affinities,  # Pass raw affinities for enhancement
-                        'destination_context': {'destination': destination},
-                        'evidence_data': web_content,  # Pass web content for evidence validation
-                        'web_sources': web_content  # Pass web sources for comprehensive processing
-                    }
-                )
-                enhancement_tasks.append(enhancement_task)
-                task_names.append('intelligence_enhancement')
+                }
+            )
+        
+        async def quality_assurance_phase(inputs: Dict[str, Any]) -> Any:
+            self.logger.info(f"🔍 Phase 4: Quality Assurance for {destination}")
+            return await self._execute_agent_task(
+                'quality_assurance',
+                'continuous_quality_monitoring',
+                {
+                    'workflow_state': workflow_state,
+                    'all_results': workflow_state.phase_results
+                }
+            )
+        
+        try:
+            self.logger.info(f"🎯 Starting workflow for {destination}")
+            
+            # Build the phase graph for the enabled processing modes; skipped
+            # phases get placeholder results so QA and integration see every phase
+            if enable_theme_processing:
+                add_phase('web_discovery', web_discovery_phase)
+                add_phase('llm_processing', llm_processing_phase, depends_on=['web_discovery'])
+                # Enhancement failures are recorded as results, as with the former gather()
+                add_phase('evidence_validation', evidence_validation_phase,
+                          depends_on=['web_discovery', 'llm_processing'], capture_errors=True)
+                add_phase('intelligence_enhancement', intelligence_enhancement_phase,
+                          depends_on=['web_discovery', 'llm_processing'], capture_errors=True)
             else:
-                self.logger.info(f"🛡️ Skipping theme enhancement tasks for {destination} (theme processing disabled)")
+                self.logger.info(f"🛡️ Theme processing DISABLED - preserving existing themes for {destination}")
+                for phase in ('web_discovery', 'llm_processing', 'evidence_validation', 'intelligence_enhancement'):
+                    workflow_state.phase_results[phase] = {'status': 'skipped', 'reason': 'theme_processing_disabled'}
             
-            # Always run nuance generation if enabled
+            # Nuances and seasonal images do not consume theme outputs, so they
+            # start immediately and overlap the whole theme branch
             if enable_nuance_processing:
-                self.logger.info(f"🎯 Running nuance generation for {destination}")
-                nuance_task = self._execute_agent_task(
-                    'destination_nuance',
-                    'generate_nuances',
-                    {
-                        'destination': destination
-                    }
-                )
-                enhancement_tasks.append(nuance_task)
-                task_names.append('destination_nuances')
+                add_phase('destination_nuances', destination_nuances_phase, capture_errors=True)
             else:
                 self.logger.info(f"⏭️ Skipping nuance generation for {destination} (nuance processing disabled)")
-            
-            # Execute tasks in parallel (only the enabled ones)
-            if enhancement_tasks:
-                task_results = await asyncio.gather(*enhancement_tasks, return_exceptions=True)
-                
-                # Map results back to their respective phase names
-                for i, task_name in enumerate(task_names):
-                    if i < len(task_results):
-                        workflow_state.phase_results[task_name] = task_results[i]
-                    else:
-                        workflow_state.phase_results[task_name] = Exception("Task not executed")
-            
-            # Add placeholder results for skipped tasks
-            if not enable_theme_processing:
-                workflow_state.phase_results['evidence_validation'] = {'status': 'skipped', 'reason': 'theme_processing_disabled'}
-                workflow_state.phase_results['intelligence_enhancement'] = {'status': 'skipped', 'reason': 'theme_processing_disabled'}
-            
-            if not enable_nuance_processing:
                 workflow_state.phase_results['destination_nuances'] = {'status': 'skipped', 'reason': 'nuance_processing_disabled'}
             
-            # Phase 3.5: Seasonal Image Generation (only if enabled)
             if enable_seasonal_images:
-                self.logger.info(f"🎨 Phase 3.5: Seasonal Image Generation for {destination}")
-                workflow_state.current_phase = "seasonal_image_generation"
-                
-                # Determine output directory for images
-                output_dir = None
-                if workflow_state.resource_allocation:
-                    output_dir = workflow_state.resource_allocation.get('output_directory')
-                
-                if not output_dir:
-                    # Try to extract timestamp from workflow_id for session directory
-                    import re
-                    timestamp_match = re.search(r'(\d+)$', workflow_id)
-                    if timestamp_match:
-                        timestamp = timestamp_match.group(1)
-                        output_dir = f"outputs/session_agent_{timestamp}"
-                    else:
-                        # Fallback to current timestamp
-                        current_timestamp = int(time.time())
-                        output_dir = f"outputs/session_agent_{current_timestamp}"
-                
-                # Generate seasonal images
-                seasonal_image_result = await self._execute_agent_task(
-                    'seasonal_image',
-                    'generate_seasonal_images',
-                    {
-                        'destination': destination,
-                        'output_dir': output_dir,
-                        'enhanced_themes': workflow_state.phase_results.get('intelligence_enhancement', {}),
-                        'workflow_context': {
-                            'workflow_id': workflow_id,
-                            'destination': destination
-                        }
-                    }
-                )
-                
-                # Store seasonal image results
-                workflow_state.phase_results['seasonal_image_generation'] = seasonal_image_result
+                add_phase('seasonal_image_generation', seasonal_image_phase)
             else:
-                self.logger.info(f"🎨 Skipping seasonal image generation for {destination} (images disabled)")
+                self.logger.info(f"🎨 Seasonal images DISABLED - skipping image generation for {destination}")
                 workflow_state.phase_results['seasonal_image_generation'] = {'status': 'skipped', 'reason': 'seasonal_images_disabled'}
             
-            # Phase 4: Quality Assurance and Final Integration
-            self.logger.info(f"🔍 Phase 4: Quality Assurance for {destination}")
-            workflow_state.current_phase = "quality_assurance"
+            add_phase('quality_assurance', quality_assurance_phase, depends_on=scheduler.phase_names)
             
-            qa_result = await self._execute_agent_task(
-                'quality_assurance',
-                'continuous_quality_monitoring',
-                {
-                    'workflow_state': workflow_state,
-                    'all_results': workflow_state.phase_results
-                }
-            )
+            await scheduler.run()
+            workflow_state.phase_timings = scheduler.get_timing_metrics()
             
-            # Store actual result data directly (now receiving unwrapped data objects)
-            workflow_state.phase_results['quality_assurance'] = qa_result
+            # Completion order varies between runs; report phases in workflow order
+            workflow_state.phase_results = {
+                phase: workflow_state.phase_results[phase]
+                for phase in WORKFLOW_PHASES if phase in workflow_state.phase_results
+            }
             
             # Final Integration
             final_data = await self._integrate_workflow_results(workflow_state)
@@ -519,8 +456,13 @@ class AgentOrchestrator(BaseAgent):
             
             self.completed_workflows[workflow_id] = result
             del self.active_workflows[workflow_id]
+            if journal is not None and not journal.is_complete(destination):
+                await journal.record_workflow(destination, workflow_id)
             
-            self.logger.info(f"✅ Workflow complete for {destination}: Quality {final_quality:.3f}, Time {processing_time:.1f}s")
+            self.logger.info(
+                f"✅ Workflow complete for {destination}: Quality {final_quality:.3f}, Time {processing_time:.1f}s "
+                f"({workflow_state.phase_timings['sum_of_phase_seconds']:.1f}s of phase work)"
+            )
             return result
             
         except Exception as e:
@@ -536,7 +478,7 @@ class AgentOrchestrator(BaseAgent):
                 quality_score=0.0,
                 phases_completed=list(workflow_state.phase_results.keys()),
                 error_messages=[str(e)],
-                performance_metrics={}
+                performance_metrics={'phase_timings': scheduler.get_timing_metrics()}
             )
             
             if workflow_id in self.active_workflows:
@@ -544,6 +486,125 @@ class AgentOrchestrator(BaseAgent):
             
             return result
     
+    @staticmethod
+    def _unwrap_discovery_result(discovery_task_result: Any) -> Any:
+        """Extract the actual DiscoveryResult from a web discovery task result"""
+        if not discovery_task_result:
+            return None
+        if hasattr(discovery_task_result, 'data') and discovery_task_result.data:
+            # AgentResponse format - use .data property
+            return discovery_task_result.data
+        elif hasattr(discovery_task_result, 'result'):
+            # Legacy format - use .result property
+            return discovery_task_result.result
+        elif isinstance(discovery_task_result, dict):
+            # Dict format - may contain nested AgentResponse
+            nested_result = discovery_task_result.get('result')
+            
+            # Check if nested result is an AgentResponse
+            if hasattr(nested_result, 'data') and nested_result.data:
+                return nested_result.data
+            return nested_result
+        return discovery_task_result
+    
+    @staticmethod
+    def _merge_discovery_results(previous: Any, current: Any) -> Any:
+        """Union of two discovery attempts, keeping the better copy of each URL"""
+        if previous is None:
+            return current
+        if not (hasattr(previous, 'content') and hasattr(current, 'content')):
+            return current if current is not None else previous
+        
+        merged: Dict[str, Any] = {}
+        for content_item in list(previous.content) + list(current.content):
+            key = getattr(content_item, 'url', '') or id(content_item)
+            existing = merged.get(key)
+            if existing is None or getattr(content_item, 'quality_score', 0.0) > getattr(existing, 'quality_score', 0.0):
+                merged[key] = content_item
+        
+        return WebDiscoveryResult(
+            destination=getattr(current, 'destination', getattr(previous, 'destination', '')),
+            content=list(merged.values()),
+            sources_analyzed=getattr(previous, 'sources_analyzed', 0) + getattr(current, 'sources_analyzed', 0),
+            processing_time=getattr(previous, 'processing_time', 0.0) + getattr(current, 'processing_time', 0.0),
+            errors=list(getattr(previous, 'errors', [])) + list(getattr(current, 'errors', []))
+        )
+    
+    @staticmethod
+    def _unwrap_llm_result(llm_task_result: Any) -> Any:
+        """Extract the actual LLMProcessingResult from an LLM pipeline task result"""
+        if not llm_task_result:
+            return None
+        if hasattr(llm_task_result, 'data') and llm_task_result.data:
+            # AgentResponse format - use .data property
+            return llm_task_result.data
+        elif hasattr(llm_task_result, 'result'):
+            # Legacy format - use .result property
+            return llm_task_result.result
+        elif isinstance(llm_task_result, dict) and 'result' in llm_task_result:
+            # AgentResponse dictionary format - extract from 'result' key
+            return llm_task_result['result']
+        return llm_task_result
+    
+    @staticmethod
+    def _extract_affinities(actual_llm_result: Any) -> List[Any]:
+        """Raw affinities from an LLMProcessingResult in any of its wrapped formats"""
+        if hasattr(actual_llm_result, '__dict__'):
+            # Check if this is an AgentResponse with nested data
+            if hasattr(actual_llm_result, 'data') and actual_llm_result.data:
+                # Extract from the nested .data field (LLMProcessingResult)
+                return getattr(actual_llm_result.data, 'affinities', [])
+            # Object format (direct LLMProcessingResult)
+            return getattr(actual_llm_result, 'affinities', [])
+        elif isinstance(actual_llm_result, dict):
+            # Dictionary format
+            return actual_llm_result.get('affinities', [])
+        return []
+    
+    @staticmethod
+    def _build_web_content(discovery_result: Any) -> Dict[str, Any]:
+        """Format discovered web content as the dict payload agents expect"""
+        content_list = discovery_result.content if hasattr(discovery_result, 'content') else []
+        
+        # Convert WebContent objects to dictionaries for agents
+        content_dicts = []
+        for content_item in content_list:
+            if hasattr(content_item, '__dict__'):
+                # WebContent object - convert to dict
+                content_dicts.append({
+                    'url': getattr(content_item, 'url', ''),
+                    'title': getattr(content_item, 'title', ''),
+                    'content': getattr(content_item, 'content', ''),
+                    'relevance_score': getattr(content_item, 'relevance_score', 0.5),
+                    'quality_score': getattr(content_item, 'quality_score', 0.5),
+                    'authority_score': getattr(content_item, 'authority_score', 0.5),
+                    'metadata': getattr(content_item, 'metadata', {})
+                })
+            elif isinstance(content_item, dict):
+                # Already a dict
+                content_dicts.append(content_item)
+        
+        return {
+            'content': content_dicts
+        }
+    
+    @staticmethod
+    def _resolve_image_output_dir(workflow_id: str, workflow_state: WorkflowState) -> str:
+        """Determine output directory for seasonal images"""
+        output_dir = None
+        if workflow_state.resource_allocation:
+            output_dir = workflow_state.resource_allocation.get('output_directory')
+        
+        if not output_dir:
+            # Try to extract timestamp from workflow_id for session directory
+            timestamp_match = re.search(r'(\d+)$', workflow_id)
+            if timestamp_match:
+                output_dir = f"outputs/session_agent_{timestamp_match.group(1)}"
+            else:
+                # Fallback to current timestamp
+                output_dir = f"outputs/session_agent_{int(time.time())}"
+        return output_dir
+    
     async def _execute_agent_task(self, agent_id: str, task_type: str, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a task on a specific agent"""
         agent = self.agents.get(agent_id)
@@ -1174,6 +1235,10 @@ class AgentOrchestrator(BaseAgent):
             agent_metrics = agent.get_performance_metrics()
             metrics[agent_id] = agent_metrics
         
+        # Per-phase start/end from the phase scheduler
+        if workflow_state.phase_timings:
+            metrics['phase_timings'] = workflow_state.phase_timings
+        
         return metrics
     
     async def _cleanup_agent_specific(self):
@@ -1294,4 +1359,16 @@ class DecisionEngine:
                 'query_depth': 'standard',
                 'source_diversity': 'medium',
                 'max_sources': 8
-            } 
\ No newline at end of file
+            }
+    
+    def widen_discovery_strategy(self, strategy: Dict[str, Any], attempt: int) -> Dict[str, Any]:
+        """Broaden a discovery strategy after a low-quality attempt"""
+        depths = ['basic', 'standard', 'comprehensive']
+        current_depth = strategy.get('query_depth', 'standard')
+        depth_index = depths.index(current_depth) if current_depth in depths else 1
+        
+        widened = dict(strategy)
+        widened['query_depth'] = depths[min(depth_index + 1, len(depths) - 1)]
+        widened['source_diversity'] = 'high'
+        widened['max_sources'] = strategy.get('max_sources', 8) + 4 * attempt
+        return widened 
\ No newline at end of file
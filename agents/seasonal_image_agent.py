@@ -138,9 +138,7 @@ class SeasonalImageAgent(BaseAgent):
             
             while retry_count <= self.max_retries:
                 try:
-                    images_generated = await asyncio.get_event_loop().run_in_executor(
-                        None, 
-                        self.image_generator.generate_seasonal_images,
+                    images_generated = await self.image_generator.generate_seasonal_images_async(
                         destination,
                         images_dir
                     )
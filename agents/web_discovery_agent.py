@@ -60,6 +60,13 @@ class WebDiscoveryAgent(BaseAgent):
         self.min_content_quality = discovery_config.get('min_content_quality', 0.6)
         self.min_source_diversity = discovery_config.get('min_source_diversity', 0.7)
         
+        # Enhanced query fan-out: searches and page fetches run concurrently under these caps
+        fanout_config = discovery_config.get('enhanced_query_fanout', {})
+        self.max_concurrent_queries = fanout_config.get('max_concurrent_queries', 4)
+        self.max_concurrent_fetches = fanout_config.get('max_concurrent_fetches', 8)
+        self.results_per_query = fanout_config.get('results_per_query', 3)
+        self.enhanced_deadline_seconds = fanout_config.get('deadline_seconds', self.timeout_seconds)
+        
         # Initialize wrapped tools
         self.web_discovery_tool = None
         self.web_discovery_logic = None
@@ -233,15 +240,15 @@ class WebDiscoveryAgent(BaseAgent):
         if destination_type in ['major_city', 'famous_landmark'] or popularity == 'high':
             query_depth = strategy_config.get('query_depth', 'comprehensive')
             max_sources = strategy_config.get('max_sources', 12)
-            source_diversity = 'high'
+            source_diversity = strategy_config.get('source_diversity', 'high')
         elif destination_type in ['regional_city', 'tourist_area'] or popularity == 'medium':
             query_depth = strategy_config.get('query_depth', 'standard')
             max_sources = strategy_config.get('max_sources', 8)
-            source_diversity = 'medium'
+            source_diversity = strategy_config.get('source_diversity', 'medium')
         else:
             query_depth = strategy_config.get('query_depth', 'basic')
             max_sources = strategy_config.get('max_sources', 6)
-            source_diversity = 'low'
+            source_diversity = strategy_config.get('source_diversity', 'low')
         
         quality_threshold = requirements.get('quality_threshold', 0.7)
         
@@ -296,39 +303,77 @@ class WebDiscoveryAgent(BaseAgent):
         }
     
     async def _execute_enhanced_queries(self, destination: str, enhanced_queries: List[str]) -> List[Dict[str, Any]]:
-        """Execute enhanced queries for better content discovery"""
+        """
+        Execute enhanced queries for better content discovery.
+        
+        Queries fan out concurrently and each result page is fetched as soon
+        as its query returns; a URL found by several queries is fetched once.
+        Whatever content has arrived by the deadline is returned, in query
+        then rank order.
+        """
         
-        enhanced_results = []
+        if not self.web_discovery_logic or not enhanced_queries:
+            return []
         
-        if self.web_discovery_logic:
+        query_slots = asyncio.Semaphore(self.max_concurrent_queries)
+        fetch_slots = asyncio.Semaphore(self.max_concurrent_fetches)
+        seen_urls = set()
+        fetched: Dict[tuple, Dict[str, Any]] = {}
+        tasks: List[asyncio.Task] = []
+        
+        async def fetch(order: tuple, result: Dict[str, Any]):
+            url = result['url']
+            async with fetch_slots:
+                content = await self.web_discovery_logic._fetch_page_content(url, destination)
+            if content:
+                fetched[order] = {
+                    'url': url,
+                    'title': result.get('title', ''),
+                    'content': content,
+                    'relevance_score': 0.8,  # Enhanced query results get higher score
+                    'source': 'enhanced_query'
+                }
+        
+        async def search(query_index: int, query: str):
             try:
-                async with self.web_discovery_logic:
-                    for query in enhanced_queries:
-                        try:
-                            query_results = await self.web_discovery_logic._fetch_brave_search(query)
-                            
-                            # Extract content from top results
-                            for result in query_results[:3]:  # Top 3 per query
-                                url = result.get('url')
-                                if url:
-                                    content = await self.web_discovery_logic._fetch_page_content(url, destination)
-                                    if content:
-                                        enhanced_results.append({
-                                            'url': url,
-                                            'title': result.get('title', ''),
-                                            'content': content,
-                                            'relevance_score': 0.8,  # Enhanced query results get higher score
-                                            'source': 'enhanced_query'
-                                        })
-                                        
-                        except Exception as e:
-                            self.logger.warning(f"Enhanced query failed for '{query}': {e}")
-                            continue
-                            
+                async with query_slots:
+                    query_results = await self.web_discovery_logic._fetch_brave_search(query)
             except Exception as e:
-                self.logger.error(f"Enhanced query execution failed: {e}")
+                self.logger.warning(f"Enhanced query failed for '{query}': {e}")
+                return
+            
+            # Extract content from top results
+            for rank, result in enumerate(query_results[:self.results_per_query]):
+                url = result.get('url')
+                if url and url not in seen_urls:
+                    seen_urls.add(url)
+                    tasks.append(asyncio.create_task(fetch((query_index, rank), result)))
+        
+        try:
+            async with self.web_discovery_logic:
+                tasks.extend(asyncio.create_task(search(i, query)) for i, query in enumerate(enhanced_queries))
+                deadline = time.monotonic() + self.enhanced_deadline_seconds
+                
+                # Searches keep adding fetch tasks, so wait until nothing is pending or time is up
+                while True:
+                    pending = [task for task in tasks if not task.done()]
+                    remaining = deadline - time.monotonic()
+                    if not pending or remaining <= 0:
+                        break
+                    await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                
+                unfinished = [task for task in tasks if not task.done()]
+                if unfinished:
+                    self.logger.info(f"Enhanced discovery deadline reached for {destination}; "
+                                     f"returning {len(fetched)} pages, dropping {len(unfinished)} pending requests")
+                for task in unfinished:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        
+        except Exception as e:
+            self.logger.error(f"Enhanced query execution failed: {e}")
         
-        return enhanced_results
+        return [fetched[order] for order in sorted(fetched)]
     
     async def _post_process_content(self, discovery_results: Dict[str, Any], 
                                   strategy: DiscoveryStrategy) -> List[Dict[str, Any]]:
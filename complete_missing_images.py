@@ -25,6 +25,7 @@ import sys
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+from src.core.http_client import close_http_client
 from src.seasonal_image_generator import SeasonalImageGenerator
 
 class MissingImageCompletor:
@@ -41,9 +42,10 @@ class MissingImageCompletor:
         # Initialize image generator
         self.image_generator = SeasonalImageGenerator(self.config)
         
-        # Rate limiting settings for DALL-E 3
-        self.rate_limit_images_per_minute = 5  # Conservative limit for Tier 1
-        self.rate_limit_delay = 60 / self.rate_limit_images_per_minute  # 12 seconds between images
+        # Rate limiting is enforced by the generator's shared token bucket
+        self.rate_limit_images_per_minute = self.image_generator.rate_limit_images_per_minute
+        self.rate_limit_burst = self.image_generator.rate_limit_burst
+        self.rate_limit_delay = 60 / self.rate_limit_images_per_minute  # Steady-state seconds per image
         
         # Seasons and expected files
         self.seasons = ['spring', 'summer', 'autumn', 'winter']
@@ -53,7 +55,7 @@ class MissingImageCompletor:
         print("=" * 50)
         print(f"✅ Configuration loaded")
         print(f"✅ Rate limit: {self.rate_limit_images_per_minute} images/minute")
-        print(f"✅ Delay between images: {self.rate_limit_delay:.1f} seconds")
+        print(f"✅ Burst allowance: {self.rate_limit_burst} images")
     
     def analyze_missing_images(self, exports_dir: Path = Path("exports")) -> Dict[str, Dict]:
         """Analyze all exports to find missing seasonal images"""
@@ -143,7 +145,7 @@ class MissingImageCompletor:
         print(f"   Total missing images: {total_missing_images}")
         
         if total_missing_images > 0:
-            estimated_time = (total_missing_images * self.rate_limit_delay) / 60
+            estimated_time = (max(0, total_missing_images - self.rate_limit_burst) * self.rate_limit_delay) / 60
             print(f"   ⏱️  Estimated completion time: {estimated_time:.1f} minutes")
         
         return missing_analysis
@@ -151,7 +153,7 @@ class MissingImageCompletor:
     async def complete_missing_images(self, missing_analysis: Dict[str, Dict], 
                                     max_destinations: int = None, 
                                     batch_size: int = 3,
-                                    batch_delay_minutes: int = 2,
+                                    batch_delay_minutes: int = 0,
                                     dry_run: bool = False) -> Dict[str, bool]:
         """Complete missing images with batch processing and rate limiting"""
         
@@ -201,8 +203,8 @@ class MissingImageCompletor:
                              for _, data in batch)
             total_images_generated += batch_images
             
-            # Inter-batch delay (except for last batch)
-            if batch_idx < len(batches) and not dry_run:
+            # Optional cool-down between batches (pacing itself comes from the shared limiter)
+            if batch_idx < len(batches) and not dry_run and batch_delay_minutes > 0:
                 delay_seconds = batch_delay_minutes * 60
                 print(f"\n⏳ Inter-batch delay: {batch_delay_minutes} minutes...")
                 
@@ -230,11 +232,9 @@ class MissingImageCompletor:
         return results
     
     async def _process_batch(self, batch: List[Tuple[str, Dict]], dry_run: bool) -> Dict[str, bool]:
-        """Process a single batch of destinations"""
+        """Process a single batch of destinations concurrently"""
         
-        batch_results = {}
-        
-        for destination_name, dest_data in batch:
+        async def process_destination(destination_name: str, dest_data: Dict) -> bool:
             missing_seasons = [img for img in dest_data['missing_images'] if img in self.seasons]
             
             print(f"\n🎯 {destination_name}")
@@ -242,47 +242,32 @@ class MissingImageCompletor:
             
             if dry_run:
                 print("   🔄 DRY RUN - Would generate images here")
-                batch_results[destination_name] = True
-                continue
+                return True
+            
+            if not missing_seasons:
+                return True
             
-            dest_success = True
+            # Download directly to the export directory
+            dest_data['images_dir'].mkdir(parents=True, exist_ok=True)
+            results = await asyncio.gather(*[
+                self.image_generator.generate_season_image(
+                    destination_name, season, dest_data['images_dir'] / f"{season}.jpg"
+                )
+                for season in missing_seasons
+            ])
             
-            # Generate missing seasonal images with progress bar
-            if missing_seasons:
-                with tqdm(missing_seasons, desc=f"   Generating", unit="img") as pbar:
-                    for season in pbar:
-                        pbar.set_description(f"   Generating {season}")
-                        
-                        try:
-                            # Rate limiting delay (except for first image)
-                            if len([k for k in batch_results.keys()]) > 0 or season != missing_seasons[0]:
-                                await asyncio.sleep(self.rate_limit_delay)
-                            
-                            # Create prompt for this season
-                            season_details = self.image_generator.season_prompts.get(season, "")
-                            prompt = self.image_generator.prompt_template.format(
-                                destination=destination_name,
-                                season=season,
-                                details=season_details
-                            )
-                            
-                            # Generate image
-                            image_url = self.image_generator._generate_image_with_dalle(prompt)
-                            
-                            # Download and save directly to export directory
-                            dest_data['images_dir'].mkdir(parents=True, exist_ok=True)
-                            image_path = dest_data['images_dir'] / f"{season}.jpg"
-                            self.image_generator._download_image(image_url, image_path)
-                            
-                            pbar.set_postfix(status="✅ Saved")
-                            
-                        except Exception as e:
-                            pbar.set_postfix(status=f"❌ Failed: {str(e)[:30]}")
-                            dest_success = False
+            for season, result in zip(missing_seasons, results):
+                if 'error' in result:
+                    print(f"   ❌ {destination_name} {season}: {result['error'][:60]}")
+                else:
+                    print(f"   ✅ {destination_name} {season}: saved")
             
-            batch_results[destination_name] = dest_success
+            return all('error' not in result for result in results)
         
-        return batch_results
+        outcomes = await asyncio.gather(*[
+            process_destination(destination_name, dest_data) for destination_name, dest_data in batch
+        ])
+        return {destination_name: success for (destination_name, _), success in zip(batch, outcomes)}
     
     def _update_image_manifest(self, images_dir: Path, destination: str, seasonal_images: List[Path]):
         """Update the image manifest file with new images"""
@@ -324,8 +309,8 @@ async def main():
                        help='Maximum number of destinations to process (for rate limiting)')
     parser.add_argument('--batch-size', type=int, default=3,
                        help='Number of destinations per batch (default: 3)')
-    parser.add_argument('--batch-delay', type=int, default=2,
-                       help='Minutes to wait between batches (default: 2)')
+    parser.add_argument('--batch-delay', type=int, default=0,
+                       help='Extra minutes to wait between batches (default: 0)')
     parser.add_argument('--exports-dir', default='exports',
                        help='Path to exports directory (default: exports)')
     parser.add_argument('--show-rate-limits', action='store_true',
@@ -348,9 +333,9 @@ async def main():
             print("   • Check: https://platform.openai.com/account/limits")
             
             print("\n⏰ OPTION 2: Use This Batch Script")
-            print("   • python complete_missing_images.py --batch-size 3 --batch-delay 2")
-            print("   • Processes 3 destinations, waits 2 minutes, repeats")
-            print("   • Respects rate limits automatically")
+            print("   • python complete_missing_images.py --batch-size 3")
+            print("   • Processes 3 destinations at a time through one shared rate limiter")
+            print("   • Set seasonal_imagery.rate_limit_images_per_minute / rate_limit_burst to your tier")
             
             print("\n💰 OPTION 3: Alternative API Services")
             print("   • Services like laozhang.ai offer higher rate limits")
@@ -398,6 +383,8 @@ async def main():
     except Exception as e:
         print(f"❌ Error: {e}")
         return 1
+    finally:
+        await close_http_client()
 
 if __name__ == "__main__":
     import sys
@@ -28,6 +28,7 @@ from tools.config_loader import load_app_config
 from src.agent_integration_layer import AgentCompatibilityLayer
 from src.export_system import DestinationDataExporter
 from src.session_consolidation_manager import SessionConsolidationManager
+from src.core.json_fields import read_sidecar
 
 # Configure logging
 logging.basicConfig(
@@ -150,9 +151,7 @@ class StandaloneExporter:
                         json_dir = session_dir / "json"
                         if json_dir.exists():
                             for json_file in json_dir.glob("*_enhanced.json"):
-                                dest_name = json_file.stem.replace("_enhanced", "").replace("__", ", ").replace("_", " ")
-                                # Capitalize words
-                                dest_name = " ".join(word.capitalize() for word in dest_name.split())
+                                dest_name = self._read_destination_name(json_file)
                                 if dest_name not in destinations:
                                     destinations.append(dest_name)
                 
@@ -162,6 +161,17 @@ class StandaloneExporter:
             logger.error(f"❌ Failed to discover destinations: {e}")
             return []
     
+    def _read_destination_name(self, json_file: Path) -> str:
+        """Destination name from the .meta.json sidecar, falling back to the filename"""
+        # Never the file itself: destination_name can follow a multi-megabyte affinities array
+        metadata = read_sidecar(json_file)
+        if metadata and metadata.get('destination_name'):
+            return metadata['destination_name']
+        
+        dest_name = json_file.stem.replace("_enhanced", "").replace("__", ", ").replace("_", " ")
+        # Capitalize words
+        return " ".join(word.capitalize() for word in dest_name.split())
+    
     async def list_destinations(self) -> List[str]:
         """List all available destinations"""
         destinations = await self.discover_destinations()
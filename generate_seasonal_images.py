@@ -24,6 +24,7 @@ from dotenv import load_dotenv
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+from src.core.http_client import close_http_client
 from src.seasonal_image_generator import SeasonalImageGenerator
 
 class StandaloneSeasonalGenerator:
@@ -52,6 +53,9 @@ class StandaloneSeasonalGenerator:
         print(f"✅ Configuration loaded from {config_path}")
         print(f"✅ DALL-E Model: {self.seasonal_config.get('model', 'dall-e-3')}")
         print(f"✅ Image Size: {self.seasonal_config.get('image_size', '1024x1024')}")
+        if self.image_generator.rate_limiter is not None:
+            print(f"✅ Rate Limit: {self.image_generator.rate_limit_images_per_minute} images/minute "
+                  f"(burst {self.image_generator.rate_limit_burst})")
         print(f"✅ Available Destinations: {len(self.default_destinations)}")
     
     async def generate_for_destination(self, destination: str, output_dir: Path, 
@@ -76,9 +80,7 @@ class StandaloneSeasonalGenerator:
         start_time = time.time()
         
         try:
-            results = await asyncio.get_event_loop().run_in_executor(
-                None,
-                self.image_generator.generate_seasonal_images,
+            results = await self.image_generator.generate_seasonal_images_async(
                 destination,
                 dest_output_dir
             )
@@ -315,6 +317,8 @@ Examples:
     except Exception as e:
         print(f"\n❌ Error: {e}")
         return 1
+    finally:
+        await close_http_client()
 
 if __name__ == "__main__":
     sys.exit(asyncio.run(main())) 
\ No newline at end of file
@@ -23,6 +23,7 @@ warnings.filterwarnings("ignore", message=".*POLLER.*")
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from tools.config_loader import load_app_config
+from src.core.http_client import close_http_client
 
 # Configure logging
 logging.basicConfig(
@@ -49,6 +50,11 @@ def parse_arguments():
     parser.add_argument('--seasonal-images-only', action='store_true',
                        help='Only generate seasonal images (skip main processing)')
     
+    # Checkpoint / resume options
+    parser.add_argument('--resume', metavar='SESSION',
+                       help='Resume an interrupted run from its session (e.g. session_agent_20250101_120000), '
+                            'skipping finished destinations and phases')
+    
     return parser.parse_args()
 
 def load_config():
@@ -134,13 +140,9 @@ async def run_seasonal_images_only(destinations: List[str], config: Dict[str, An
     
     # Process destinations
     total_start_time = time.time()
-    successful_destinations = 0
-    failed_destinations = 0
     
-    for i, destination in enumerate(destinations, 1):
-        print(f"\n🎯 [{i}/{len(destinations)}] Processing: {destination}")
-        print("-" * 50)
-        
+    async def process_destination(i: int, destination: str) -> bool:
+        # Destinations run concurrently; the generator's shared limiter paces the API calls
         start_time = time.time()
         
         try:
@@ -156,15 +158,13 @@ async def run_seasonal_images_only(destinations: List[str], config: Dict[str, An
                         existing_seasons.append(season)
             
             if existing_seasons and not force_regenerate:
+                print(f"\n🎯 [{i}/{len(destinations)}] {destination}")
                 print(f"⚠️  Images already exist: {', '.join(existing_seasons)}")
                 print("   Use --force-seasonal-images to regenerate")
-                successful_destinations += 1
-                continue
+                return True
             
             # Generate images
-            images_generated = await asyncio.get_event_loop().run_in_executor(
-                None,
-                image_generator.generate_seasonal_images,
+            images_generated = await image_generator.generate_seasonal_images_async(
                 destination,
                 output_dir / "images"
             )
@@ -177,6 +177,7 @@ async def run_seasonal_images_only(destinations: List[str], config: Dict[str, An
             failed_seasons = [season for season, data in images_generated.items() 
                             if season != 'collage' and 'error' in data]
             
+            print(f"\n🎯 [{i}/{len(destinations)}] {destination}")
             print(f"✅ Generated {len(successful_seasons)} seasonal images in {processing_time:.1f}s")
             
             if successful_seasons:
@@ -189,16 +190,20 @@ async def run_seasonal_images_only(destinations: List[str], config: Dict[str, An
             if 'collage' in images_generated and 'error' not in images_generated['collage']:
                 print("   🖼️  Seasonal collage created")
             
-            if len(successful_seasons) > 0:
-                successful_destinations += 1
-            else:
-                failed_destinations += 1
+            return len(successful_seasons) > 0
                 
         except Exception as e:
             processing_time = time.time() - start_time
+            print(f"\n🎯 [{i}/{len(destinations)}] {destination}")
             print(f"❌ Failed to generate images: {e}")
             print(f"   Processing time: {processing_time:.1f}s")
-            failed_destinations += 1
+            return False
+    
+    results = await asyncio.gather(*[
+        process_destination(i, destination) for i, destination in enumerate(destinations, 1)
+    ])
+    successful_destinations = sum(1 for success in results if success)
+    failed_destinations = len(results) - successful_destinations
     
     # Final summary
     total_time = time.time() - total_start_time
@@ -213,7 +218,8 @@ async def run_seasonal_images_only(destinations: List[str], config: Dict[str, An
     
     return failed_destinations == 0
 
-async def run_full_pipeline(destinations: List[str], config: Dict[str, Any]) -> Dict[str, str]:
+async def run_full_pipeline(destinations: List[str], config: Dict[str, Any],
+                            resume_session_dir: str = None) -> Dict[str, str]:
     """Run the complete processing pipeline for all destinations using agent integration."""
     
     # Import agent integration layer
@@ -222,7 +228,7 @@ async def run_full_pipeline(destinations: List[str], config: Dict[str, Any]) ->
     print(f"\n⚙️  Initializing processing system...")
     
     # Initialize agent integration layer
-    agent_layer = AgentCompatibilityLayer(config)
+    agent_layer = AgentCompatibilityLayer(config, resume_session_dir=resume_session_dir)
     await agent_layer.initialize()
     
     # Check if using agents or legacy system
@@ -464,10 +470,31 @@ async def main():
     # Apply seasonal image configuration
     config = apply_seasonal_image_config(config, args)
     
+    # Resolve the session being resumed
+    resume_session_dir = None
+    resumed_destinations = []
+    if args.resume:
+        from src.core.workflow_journal import resolve_session_dir, WorkflowJournal
+        try:
+            resume_session_dir = str(resolve_session_dir(args.resume))
+        except FileNotFoundError as e:
+            print(f"❌ {e}")
+            return
+        from src.agent_integration_layer import processing_route, RESUMABLE_ROUTE
+        route = 'seasonal_images_only' if args.seasonal_images_only else processing_route(config)
+        if route != RESUMABLE_ROUTE:
+            # Other paths keep no checkpoint journal and would silently start a new session
+            print(f"❌ --resume only works with agents.migration_mode: {RESUMABLE_ROUTE} "
+                  f"(this run would use '{route}')")
+            return
+        resumed_destinations = WorkflowJournal(resume_session_dir).destinations
+        print(f"♻️  Resuming session {resume_session_dir}")
+    
     # Get destinations to process
     print("📊 Loading destinations...")
     try:
-        destinations = get_destinations_to_process(args.destinations)
+        # A resumed run keeps the destination list it was started with
+        destinations = get_destinations_to_process(args.destinations or resumed_destinations or None)
         print(f"✅ Loaded {len(destinations)} destinations: {', '.join(destinations)}")
     except Exception as e:
         print(f"❌ Error loading destinations: {e}")
@@ -489,7 +516,7 @@ async def main():
             return
         
         # Full pipeline mode with optional seasonal images
-        processed_files = await run_full_pipeline(destinations, config)
+        processed_files = await run_full_pipeline(destinations, config, resume_session_dir)
         
         if processed_files:
             print(f"\n🎉 Processing Complete!")
@@ -539,6 +566,8 @@ async def main():
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
         print(f"❌ An error occurred: {e}")
+    finally:
+        await close_http_client()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
@@ -8,6 +8,7 @@ Supports parallel execution modes for comparison and validation.
 import asyncio
 import logging
 import time
+from datetime import datetime
 from typing import Dict, Any, List, Optional, Union
 from dataclasses import dataclass
 from pathlib import Path
@@ -31,6 +32,8 @@ from src.theme_lifecycle_manager import ThemeLifecycleManager
 from src.session_consolidation_manager import SessionConsolidationManager
 from src.enhanced_caching_system import ConsolidatedDataCache
 from src.export_system import DestinationDataExporter
+from src.core.workflow_journal import WorkflowJournal
+from src.core.session_index import write_session_json
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +49,35 @@ class ProcessingResult:
     legacy_results: Optional[Dict[str, Any]] = None
     comparison_data: Optional[Dict[str, Any]] = None
 
+# The processing path whose workflow checkpoints --resume can pick up
+RESUMABLE_ROUTE = 'agent_only'
+
+
+def processing_route(config: Dict[str, Any], migration_mode: Optional[str] = None) -> str:
+    """
+    Which path ``process_destinations`` takes: 'themes_only', 'nuances_only',
+    'no_processing', or the migration mode for standard processing.
+    """
+    processing_mode = config.get('processing_mode', {})
+    if migration_mode is None:
+        migration_mode = config.get('agents', {}).get('migration_mode', 'legacy_only')
+    
+    if processing_mode.get('theme_controls', {}).get('theme_only_mode', False):
+        return 'themes_only'
+    if processing_mode.get('nuance_controls', {}).get('nuance_only_mode', False):
+        return 'nuances_only'
+    
+    # Disabling one kind of processing preserves its existing data and runs only the other
+    themes_enabled = processing_mode.get('enable_theme_processing', True)
+    nuances_enabled = processing_mode.get('enable_nuance_processing', True)
+    if not themes_enabled:
+        return 'nuances_only' if nuances_enabled else 'no_processing'
+    if not nuances_enabled:
+        return 'themes_only'
+    
+    return migration_mode
+
+
 class AgentCompatibilityLayer:
     """
     Integration layer that provides backward compatibility while enabling
@@ -58,10 +90,14 @@ class AgentCompatibilityLayer:
     - fallback: Try agents first, fallback to legacy on failure
     """
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], resume_session_dir: Optional[str] = None):
         self.config = config
         self.agent_config = config.get('agents', {})
         
+        # Session to resume from its workflow checkpoint journal (--resume)
+        self.resume_session_dir = resume_session_dir
+        self.checkpoints_enabled = self.agent_config.get('workflow_checkpoints', {}).get('enabled', True)
+        
         # Migration settings
         self.enabled = self.agent_config.get('enabled', False)
         self.migration_mode = self.agent_config.get('migration_mode', 'legacy_only')
@@ -144,50 +180,40 @@ class AgentCompatibilityLayer:
     async def process_destinations(self, destinations: List[str]) -> ProcessingResult:
         """Process destinations using the configured migration mode and processing controls"""
         
-        # Check processing mode configuration
-        processing_mode = self.config.get('processing_mode', {})
+        route = processing_route(self.config, self.migration_mode)
+        
+        # Only the agent-only path keeps a checkpoint journal to resume from
+        if self.resume_session_dir and route != RESUMABLE_ROUTE:
+            raise ValueError(f"--resume is only supported for agent_only processing, "
+                             f"but this run would use '{route}'")
         
-        # Handle theme-only mode
-        if processing_mode.get('theme_controls', {}).get('theme_only_mode', False):
+        # Handle theme-only / nuance-only processing
+        if route == 'themes_only':
             logger.info("🎨 Theme-only processing mode enabled")
             return await self._process_themes_only(destinations)
         
-        # Handle nuance-only mode
-        if processing_mode.get('nuance_controls', {}).get('nuance_only_mode', False):
+        if route == 'nuances_only':
             logger.info("🎯 Nuance-only processing mode enabled")
             return await self._process_nuances_only(destinations)
         
-        # Handle disabled theme processing
-        if not processing_mode.get('enable_theme_processing', True):
-            logger.info("🛡️ Theme processing disabled - preserving existing themes")
-            if processing_mode.get('enable_nuance_processing', True):
-                logger.info("🎯 Running nuance processing only")
-                return await self._process_nuances_only(destinations)
-            else:
-                logger.warning("⚠️ Both theme and nuance processing disabled - no processing will occur")
-                return ProcessingResult(
-                    destinations_processed=len(destinations),
-                    successful_destinations=0,
-                    processing_time=0.0,
-                    system_used="no_processing",
-                    processed_files={}
-                )
-        
-        # Handle disabled nuance processing (theme-only mode without explicit flag)
-        if not processing_mode.get('enable_nuance_processing', True):
-            logger.info("🛡️ Nuance processing disabled - preserving existing nuances")
-            if processing_mode.get('enable_theme_processing', True):
-                logger.info("🎨 Running theme processing only")
-                return await self._process_themes_only(destinations)
+        if route == 'no_processing':
+            logger.warning("⚠️ Both theme and nuance processing disabled - no processing will occur")
+            return ProcessingResult(
+                destinations_processed=len(destinations),
+                successful_destinations=0,
+                processing_time=0.0,
+                system_used="no_processing",
+                processed_files={}
+            )
         
         # Standard processing modes
-        if self.migration_mode == 'agent_only':
+        if route == 'agent_only':
             return await self._process_agent_only(destinations)
-        elif self.migration_mode == 'legacy_only':
+        elif route == 'legacy_only':
             return await self._process_legacy_only(destinations)
-        elif self.migration_mode == 'parallel':
+        elif route == 'parallel':
             return await self._process_parallel(destinations)
-        elif self.migration_mode == 'fallback':
+        elif route == 'fallback':
             return await self._process_with_fallback(destinations)
         else:
             raise ValueError(f"Unknown migration mode: {self.migration_mode}")
@@ -198,12 +224,20 @@ class AgentCompatibilityLayer:
         start_time = time.time()
         
         try:
+            # The session directory exists from the start so its checkpoint
+            # journal survives a crash part-way through the batch
+            session_dir = self.resume_session_dir or f"outputs/session_agent_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            journal = None
+            if self.checkpoints_enabled or self.resume_session_dir:
+                journal = WorkflowJournal(session_dir)
+                logger.info(f"📒 Workflow checkpoints: {journal.journal_file}")
+            
             # Execute agent workflow
-            agent_results = await self.orchestrator.execute_workflow(destinations)
+            agent_results = await self.orchestrator.execute_workflow(destinations, journal=journal)
             processing_time = time.time() - start_time
             
             # Convert agent results to legacy-compatible format
-            processed_files = await self._convert_agent_results_to_legacy_format(agent_results)
+            processed_files = await self._convert_agent_results_to_legacy_format(agent_results, session_dir)
             
             # Track performance
             self.performance_data['agent_calls'] += 1
@@ -545,7 +579,6 @@ class AgentCompatibilityLayer:
     
     async def _create_theme_only_session(self, destinations: List[str], theme_results: Dict[str, Any]) -> Dict[str, str]:
         """Create a session directory with only theme files, preserving existing nuance data"""
-        import json
         import os
         from datetime import datetime
         from src.dev_staging_manager import DevStagingManager
@@ -575,13 +608,11 @@ class AgentCompatibilityLayer:
                     theme_data = theme_results[destination]
                     
                     # Save enhanced themes JSON
-                    with open(enhanced_file_path, 'w', encoding='utf-8') as f:
-                        json.dump(theme_data, f, indent=2, ensure_ascii=False)
+                    write_session_json(enhanced_file_path, theme_data, self.config, indent=2, ensure_ascii=False)
                     
                     # Create or copy evidence file (may be empty if no evidence collected)
                     evidence_data = theme_data.get('evidence', [])
-                    with open(evidence_file_path, 'w', encoding='utf-8') as f:
-                        json.dump(evidence_data, f, indent=2, ensure_ascii=False)
+                    write_session_json(evidence_file_path, evidence_data, self.config, indent=2, ensure_ascii=False)
                     
                     processed_files[destination] = enhanced_file_path
                     logger.info(f"✅ Saved theme files for {destination}")
@@ -724,17 +755,19 @@ class AgentCompatibilityLayer:
         
         return processed_files
     
-    async def _convert_agent_results_to_legacy_format(self, agent_results: Dict[str, WorkflowResult]) -> Dict[str, str]:
+    async def _convert_agent_results_to_legacy_format(self, agent_results: Dict[str, WorkflowResult],
+                                                      session_dir: Optional[str] = None) -> Dict[str, str]:
         """Convert agent workflow results to legacy processed files format and generate dashboard"""
-        import json
         import os
-        from datetime import datetime
         from src.enhanced_viewer_generator import EnhancedViewerGenerator
         from src.dev_staging_manager import DevStagingManager
         
         # Create session directory
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        session_dir = f"outputs/session_agent_{timestamp}"
+        if session_dir:
+            timestamp = os.path.basename(os.path.normpath(session_dir)).replace("session_agent_", "")
+        else:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            session_dir = f"outputs/session_agent_{timestamp}"
         json_dir = os.path.join(session_dir, "json")
         dashboard_dir = os.path.join(session_dir, "dashboard")
         
@@ -759,22 +792,22 @@ class AgentCompatibilityLayer:
                 legacy_data = self._convert_workflow_result_to_legacy_data(destination, workflow_result)
                 
                 # Save enhanced data JSON
-                with open(json_file_path, 'w', encoding='utf-8') as f:
-                    json.dump(legacy_data['enhanced_data'], f, indent=2, ensure_ascii=False)
+                write_session_json(json_file_path, legacy_data['enhanced_data'], self.config,
+                                   indent=2, ensure_ascii=False)
                 
                 # Save evidence data JSON  
-                with open(evidence_file_path, 'w', encoding='utf-8') as f:
-                    json.dump(legacy_data['evidence_data'], f, indent=2, ensure_ascii=False)
+                write_session_json(evidence_file_path, legacy_data['evidence_data'], self.config,
+                                   indent=2, ensure_ascii=False)
                 
                 # Save destination nuances JSON (NEW)
                 if 'nuances_data' in legacy_data and legacy_data['nuances_data']:
-                    with open(nuances_file_path, 'w', encoding='utf-8') as f:
-                        json.dump(legacy_data['nuances_data'], f, indent=2, ensure_ascii=False)
+                    write_session_json(nuances_file_path, legacy_data['nuances_data'], self.config,
+                                       indent=2, ensure_ascii=False)
                     
                     # Save nuances evidence JSON (NEW)
                     if 'nuances_evidence_data' in legacy_data:
-                        with open(nuances_evidence_file_path, 'w', encoding='utf-8') as f:
-                            json.dump(legacy_data['nuances_evidence_data'], f, indent=2, ensure_ascii=False)
+                        write_session_json(nuances_evidence_file_path, legacy_data['nuances_evidence_data'], self.config,
+                                           indent=2, ensure_ascii=False)
                     
                     logger.info(f"✅ Saved nuance data for {destination}: {nuances_file_path}")
                 
@@ -1623,7 +1656,6 @@ class AgentCompatibilityLayer:
     
     async def _create_nuance_only_session(self, destinations: List[str], nuance_results: Dict[str, Any]) -> Dict[str, str]:
         """Create a session directory with only nuance files, preserving existing theme data"""
-        import json
         import os
         from datetime import datetime
         from src.dev_staging_manager import DevStagingManager
@@ -1659,19 +1691,15 @@ class AgentCompatibilityLayer:
                     file_config = self.config.get('destination_nuances', {}).get('file_organization', {})
                     optimize_json = file_config.get('optimize_json_storage', True)
                     
+                    dump_kwargs = {'separators': (',', ':')} if optimize_json else {'indent': 2}
+                    
                     # Save nuances JSON (minified if enabled)
-                    with open(nuances_file_path, 'w', encoding='utf-8') as f:
-                        if optimize_json:
-                            json.dump(converted_data['nuances_data'], f, separators=(',', ':'), ensure_ascii=False)
-                        else:
-                            json.dump(converted_data['nuances_data'], f, indent=2, ensure_ascii=False)
+                    write_session_json(nuances_file_path, converted_data['nuances_data'], self.config,
+                                       ensure_ascii=False, **dump_kwargs)
                     
                     # Save nuances evidence JSON (minified if enabled)
-                    with open(nuances_evidence_file_path, 'w', encoding='utf-8') as f:
-                        if optimize_json:
-                            json.dump(converted_data['nuances_evidence_data'], f, separators=(',', ':'), ensure_ascii=False)
-                        else:
-                            json.dump(converted_data['nuances_evidence_data'], f, indent=2, ensure_ascii=False)
+                    write_session_json(nuances_evidence_file_path, converted_data['nuances_evidence_data'], self.config,
+                                       ensure_ascii=False, **dump_kwargs)
                     
                     processed_files[destination] = nuances_file_path
                     logger.info(f"✅ Saved nuance files for {destination}")
@@ -1,55 +1,297 @@
 import time
+import json
+import glob
+import hashlib
 import logging
 import pickle
+import sqlite3
+import threading
 import os
 from datetime import timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List, Sequence, Tuple
 
 # --- Cache Configuration ---
 CACHE_DIR = "cache"
+KV_CACHE_DIR = os.path.join(CACHE_DIR, "kv")
+KV_SHARD_COUNT = 8
+KV_SWEEP_INTERVAL_SECONDS = 3600
 PAGE_CONTENT_CACHE_EXPIRY_DAYS = 30
 BRAVE_SEARCH_CACHE_EXPIRY_DAYS = 7
 
+# Records written without an explicit expiry (e.g. migrated pickles) are swept
+# once they are older than the longest expiry any reader asks for.
+MAX_CACHE_EXPIRY_DAYS = max(PAGE_CONTENT_CACHE_EXPIRY_DAYS, BRAVE_SEARCH_CACHE_EXPIRY_DAYS)
+
 if not os.path.exists(CACHE_DIR):
     os.makedirs(CACHE_DIR)
 
+# --- Key-Value Store ---
+
+class ShardedKVStore:
+    """
+    Sharded SQLite key-value store. Each record carries its own creation and
+    expiry time; expired records are removed by a background sweeper rather
+    than on the read path.
+    """
+    
+    def __init__(self, directory: str = KV_CACHE_DIR, shard_count: int = KV_SHARD_COUNT,
+                 sweep_interval: float = KV_SWEEP_INTERVAL_SECONDS):
+        self.directory = directory
+        self.shard_count = shard_count
+        self.sweep_interval = sweep_interval
+        os.makedirs(directory, exist_ok=True)
+        
+        self._locks = [threading.Lock() for _ in range(shard_count)]
+        self._shards = [self._open_shard(i) for i in range(shard_count)]
+        self._has_legacy_keys = any(
+            self._shard_has_legacy(i) for i in range(shard_count)
+        )
+        
+        self._stop_event = threading.Event()
+        self._sweeper = None
+        if sweep_interval and sweep_interval > 0:
+            self._sweeper = threading.Thread(target=self._sweep_loop, name="kv-cache-sweeper", daemon=True)
+            self._sweeper.start()
+    
+    def _open_shard(self, index: int) -> sqlite3.Connection:
+        path = os.path.join(self.directory, f"shard_{index:02d}.sqlite")
+        conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS kv ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "created_at REAL NOT NULL, expires_at REAL, legacy INTEGER NOT NULL DEFAULT 0)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS kv_expires ON kv (expires_at)")
+        conn.commit()
+        return conn
+    
+    def _shard_has_legacy(self, index: int) -> bool:
+        with self._locks[index]:
+            return self._shards[index].execute("SELECT 1 FROM kv WHERE legacy = 1 LIMIT 1").fetchone() is not None
+    
+    def _shard_for(self, key: str) -> int:
+        return int(hashlib.md5(key.encode('utf-8')).hexdigest()[:8], 16) % self.shard_count
+    
+    def _group_by_shard(self, keys: Iterable[str]) -> Dict[int, List[str]]:
+        grouped: Dict[int, List[str]] = {}
+        for key in keys:
+            grouped.setdefault(self._shard_for(key), []).append(key)
+        return grouped
+    
+    def get_many(self, keys: Sequence[str], max_age_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """Return {key: value} for every key that exists and has not expired."""
+        now = time.time()
+        found: Dict[str, Any] = {}
+        
+        for shard, shard_keys in self._group_by_shard(keys).items():
+            with self._locks[shard]:
+                conn = self._shards[shard]
+                for start in range(0, len(shard_keys), 500):
+                    chunk = shard_keys[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = conn.execute(
+                        f"SELECT key, value, created_at, expires_at FROM kv WHERE key IN ({placeholders})", chunk
+                    ).fetchall()
+                    for key, value, created_at, expires_at in rows:
+                        if expires_at is not None and expires_at <= now:
+                            continue
+                        if max_age_seconds is not None and now - created_at > max_age_seconds:
+                            continue
+                        found[key] = value
+        
+        results = {}
+        for key, value in found.items():
+            try:
+                results[key] = pickle.loads(value)
+            except Exception as e:
+                logging.error(f"Failed to unpickle cache record {key}: {e}")
+        return results
+    
+    def set_many(self, items: Iterable[Tuple[str, Any]], ttl_seconds: Optional[float] = None):
+        """Insert or replace records in one transaction per shard."""
+        created = time.time()
+        expires = created + ttl_seconds if ttl_seconds is not None else None
+        self._write_rows((key, value, created, expires, False) for key, value in items)
+    
+    def import_legacy_records(self, records: Iterable[Tuple[str, Any, float]]):
+        """Insert (key, value, created_at) records migrated from the old pickle cache."""
+        self._write_rows((key, value, created_at, None, True) for key, value, created_at in records)
+        self._has_legacy_keys = True
+    
+    def _write_rows(self, records: Iterable[Tuple[str, Any, float, Optional[float], bool]]):
+        rows_by_shard: Dict[int, List[tuple]] = {}
+        for key, value, created_at, expires_at, legacy in records:
+            row = (key, sqlite3.Binary(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)),
+                   created_at, expires_at, 1 if legacy else 0)
+            rows_by_shard.setdefault(self._shard_for(key), []).append(row)
+        
+        for shard, rows in rows_by_shard.items():
+            with self._locks[shard]:
+                conn = self._shards[shard]
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO kv (key, value, created_at, expires_at, legacy) "
+                        "VALUES (?, ?, ?, ?, ?)", rows
+                    )
+    
+    def delete(self, key: str):
+        shard = self._shard_for(key)
+        with self._locks[shard]:
+            with self._shards[shard] as conn:
+                conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+    
+    def delete_matching(self, substring: str) -> int:
+        """Delete every record whose key contains ``substring`` (all records if empty). Returns number removed."""
+        escaped = substring.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        removed = 0
+        for shard in range(self.shard_count):
+            with self._locks[shard]:
+                with self._shards[shard] as conn:
+                    cursor = conn.execute("DELETE FROM kv WHERE key LIKE ? ESCAPE '\\'", (f"%{escaped}%",))
+                    removed += cursor.rowcount
+        return removed
+    
+    def sweep(self) -> int:
+        """Delete expired records from every shard. Returns number of records removed."""
+        now = time.time()
+        legacy_cutoff = now - timedelta(days=MAX_CACHE_EXPIRY_DAYS).total_seconds()
+        removed = 0
+        for shard in range(self.shard_count):
+            with self._locks[shard]:
+                with self._shards[shard] as conn:
+                    cursor = conn.execute(
+                        "DELETE FROM kv WHERE (expires_at IS NOT NULL AND expires_at <= ?) "
+                        "OR (expires_at IS NULL AND created_at <= ?)",
+                        (now, legacy_cutoff)
+                    )
+                    removed += cursor.rowcount
+        if removed:
+            logging.info(f"Cache sweep removed {removed} expired records")
+        return removed
+    
+    def _sweep_loop(self):
+        while not self._stop_event.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                logging.warning(f"Cache sweep failed: {e}")
+    
+    def close(self):
+        self._stop_event.set()
+        for shard in range(self.shard_count):
+            with self._locks[shard]:
+                self._shards[shard].close()
+
+
+_kv_store: Optional[ShardedKVStore] = None
+_kv_store_lock = threading.Lock()
+
+
+def get_kv_store() -> ShardedKVStore:
+    """Returns the process-wide cache store, opening it on first use."""
+    global _kv_store
+    if _kv_store is None:
+        with _kv_store_lock:
+            if _kv_store is None:
+                _kv_store = ShardedKVStore()
+    return _kv_store
+
 # --- Core Caching Functions ---
 
+def encode_cache_key(key: list) -> str:
+    """Creates an unambiguous string key from a list of key parts."""
+    return json.dumps([str(k) for k in key], ensure_ascii=False, separators=(',', ':'))
+
 def get_cache_path(key: list) -> str:
-    """Creates a consistent, file-system-safe path from a cache key."""
+    """Creates the legacy pickle-file path for a cache key (used for migration lookups)."""
     # Simple key-to-filename conversion
     filename = "_".join(str(k) for k in key).replace('/', '_').replace(':', '')
     return os.path.join(CACHE_DIR, f"{filename}.pkl")
 
-def write_to_cache(key: list, data: Any):
-    """Writes data to a cache file."""
+def _legacy_cache_key(key: list) -> str:
+    return "legacy:" + os.path.splitext(os.path.basename(get_cache_path(key)))[0]
+
+def write_to_cache(key: list, data: Any, expiry_days: Optional[int] = None):
+    """Writes data to the cache, optionally recording when it expires."""
+    write_many_to_cache([(key, data)], expiry_days)
+
+def write_many_to_cache(items: Iterable[Tuple[list, Any]], expiry_days: Optional[int] = None):
+    """Writes several (key, data) pairs to the cache in one batch."""
+    items = list(items)
     try:
-        path = get_cache_path(key)
-        with open(path, 'wb') as f:
-            pickle.dump(data, f)
-        logging.debug(f"Successfully wrote to cache with key: {key}")
+        ttl_seconds = timedelta(days=expiry_days).total_seconds() if expiry_days is not None else None
+        get_kv_store().set_many(((encode_cache_key(k), v) for k, v in items), ttl_seconds=ttl_seconds)
+        logging.debug(f"Successfully wrote {len(items)} record(s) to cache")
     except Exception as e:
-        logging.error(f"Failed to write to cache for key {key}: {e}", exc_info=True)
+        logging.error(f"Failed to write to cache for keys {[k for k, _ in items]}: {e}", exc_info=True)
 
 def read_from_cache(key: list, expiry_days: int) -> Optional[Any]:
-    """Reads data from a cache file if it exists and is not expired."""
+    """Reads data from the cache if it exists and is not expired."""
+    return read_many_from_cache([key], expiry_days).get(encode_cache_key(key))
+
+def read_many_from_cache(keys: Sequence[list], expiry_days: int) -> Dict[str, Any]:
+    """
+    Reads several keys at once. Returns a dict keyed by ``encode_cache_key(key)``
+    containing only the keys that were found and are not expired.
+    """
     try:
-        path = get_cache_path(key)
-        if not os.path.exists(path):
-            return None
+        store = get_kv_store()
+        max_age = timedelta(days=expiry_days).total_seconds()
+        encoded = [encode_cache_key(k) for k in keys]
+        results = store.get_many(encoded, max_age_seconds=max_age)
         
-        # Check if the file is expired
-        file_mod_time = os.path.getmtime(path)
-        if (time.time() - file_mod_time) > timedelta(days=expiry_days).total_seconds():
-            logging.info(f"Cache expired for key: {key}")
-            os.remove(path)
-            return None
+        # Fall back to records imported from the old pickle directory
+        if store._has_legacy_keys and len(results) < len(encoded):
+            missing = {_legacy_cache_key(k): e for k, e in zip(keys, encoded) if e not in results}
+            for legacy_key, value in store.get_many(list(missing), max_age_seconds=max_age).items():
+                results[missing[legacy_key]] = value
         
-        with open(path, 'rb') as f:
-            return pickle.load(f)
+        return results
     except Exception as e:
-        logging.error(f"Failed to read from cache for key {key}: {e}", exc_info=True)
-        return None
+        logging.error(f"Failed to read from cache for keys {keys}: {e}", exc_info=True)
+        return {}
+
+def migrate_pickle_cache(cache_dir: str = CACHE_DIR, remove_files: bool = False) -> int:
+    """
+    One-shot import of the old one-``.pkl``-per-key cache directory into the
+    key-value store. File modification times are kept as record creation times
+    so existing expiry behaviour is preserved. Returns the number of records imported.
+    """
+    store = get_kv_store()
+    migrated = 0
+    batch: List[Tuple[str, Any, float]] = []
+    batch_paths: List[str] = []
+    
+    def flush():
+        store.import_legacy_records(batch)
+        if remove_files:
+            for migrated_path in batch_paths:
+                os.remove(migrated_path)
+        batch.clear()
+        batch_paths.clear()
+    
+    for path in glob.glob(os.path.join(cache_dir, "*.pkl")):
+        try:
+            with open(path, 'rb') as f:
+                data = pickle.load(f)
+            stem = os.path.splitext(os.path.basename(path))[0]
+            batch.append((f"legacy:{stem}", data, os.path.getmtime(path)))
+            batch_paths.append(path)
+            migrated += 1
+        except Exception as e:
+            logging.warning(f"Skipping unreadable cache file {path}: {e}")
+            continue
+        
+        if len(batch) >= 500:
+            flush()
+    
+    if batch:
+        flush()
+    
+    logging.info(f"Migrated {migrated} pickle cache files from {cache_dir}")
+    return migrated
 
 # --- Affinity Cache Class (for pipeline state) ---
 
@@ -61,16 +303,16 @@ class AffinityCache:
     def __init__(self, config: dict):
         self.config = config
         self.ttl_days = self.config.get("caching", {}).get("affinity_expiry_days", 1)
-
+    
     def get(self, destination_name: str) -> Optional[Dict]:
         """Retrieves final affinity data for a destination."""
         cache_key = ["affinity_result", destination_name]
         return read_from_cache(cache_key, self.ttl_days)
-
+    
     def set(self, destination_name: str, data: dict):
         """Stores final affinity data for a destination."""
         cache_key = ["affinity_result", destination_name]
-        write_to_cache(cache_key, data)
+        write_to_cache(cache_key, data, self.ttl_days)
 
 # The more advanced cache from your design would look something like this.
 # This is for future implementation.
@@ -79,7 +321,7 @@ class AdvancedAffinityCache:
         # self.redis_client = Redis(**settings.REDIS_CONFIG)
         # self.vector_db = Pinecone(**settings.PINECONE_CONFIG)
         pass
-        
+    
     def smart_cache_strategy(self, destination):
         # Tier destinations by popularity/query frequency
         # tier = self.get_destination_tier(destination)
@@ -92,4 +334,17 @@ class AdvancedAffinityCache:
         # }
         
         # return cache_ttl.get(tier)
-        pass 
\ No newline at end of file
+        pass
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Migrate the legacy pickle cache into the key-value store")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="Directory containing legacy .pkl cache files")
+    parser.add_argument("--remove", action="store_true", help="Delete pickle files after importing them")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO)
+    count = migrate_pickle_cache(args.cache_dir, remove_files=args.remove)
+    print(f"Migrated {count} cache entries")
@@ -7,14 +7,95 @@ Extracts URL citations from LLM text outputs with context and quality filtering.
 import re
 import asyncio
 import logging
+import threading
 import time
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Set, Tuple
 from dataclasses import dataclass
 from urllib.parse import urlparse, urljoin
-from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+URL_PATTERN_FLAGS = re.IGNORECASE | re.MULTILINE
+DEFAULT_URL_PATTERNS = (
+    r'https?://[\w\.-]+\.\w+[\w\-._~!$&\'()*+,;=:@/]*',
+    r'www\.[\w\.-]+\.\w+[\w\-._~!$&\'()*+,;=:@/]*'
+)
+
+RawCitation = Tuple[str, int, str]
+
+
+@lru_cache(maxsize=8)
+def _compile_url_patterns(sources: Tuple[str, ...]) -> Tuple[Optional[re.Pattern], Tuple[re.Pattern, ...]]:
+    """
+    One alternation over every URL pattern, each alternative in a named group
+    so a match reports which pattern produced it. Patterns that cannot be
+    combined (inline global flags, or groups of their own whose numbering and
+    backreferences the wrapping would shift) fall back to one pass per pattern.
+    """
+    separate = tuple(re.compile(source, URL_PATTERN_FLAGS) for source in sources)
+    if any(pattern.groups for pattern in separate):
+        logger.debug("URL patterns define their own groups; matching them one at a time")
+        return None, separate
+    try:
+        combined = re.compile(
+            '|'.join(f"(?P<pattern_{i}>{source})" for i, source in enumerate(sources)), URL_PATTERN_FLAGS
+        )
+    except re.error as e:
+        logger.warning(f"URL patterns could not be merged ({e}); matching them one at a time")
+        combined = None
+    return combined, separate
+
+
+def scan_urls(text: str, pattern_sources: Tuple[str, ...]) -> List[RawCitation]:
+    """
+    ``(url, position, pattern_name)`` for every URL in ``text``, first
+    occurrence of each URL only. With merged patterns the text is scanned
+    once and a span claimed by one pattern is not re-matched by another.
+    """
+    combined, separate = _compile_url_patterns(pattern_sources)
+    if combined is not None:
+        matches = ((match.group(0), match.start(), match.lastgroup) for match in combined.finditer(text))
+    else:
+        matches = (
+            (match.group(0), match.start(), f"pattern_{i}")
+            for i, pattern in enumerate(separate) for match in pattern.finditer(text)
+        )
+    
+    seen_urls = set()
+    citations = []
+    for url, position, method in matches:
+        # Basic URL cleanup
+        url = url.rstrip('.,;:!?)')  # Remove trailing punctuation
+        if url not in seen_urls:
+            seen_urls.add(url)
+            citations.append((url, position, method))
+    return citations
+
+
+def scan_urls_batch(texts: List[str], pattern_sources: Tuple[str, ...]) -> List[List[RawCitation]]:
+    """Process-pool entry point: ``scan_urls`` for each text"""
+    return [scan_urls(text, pattern_sources) for text in texts]
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Process-wide pool for batch citation scans (created on first batch)"""
+    global _process_pool
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                # Spawned workers do not inherit the parent's threads and locks mid-use
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')
+                )
+    return _process_pool
+
 @dataclass
 class ExtractedCitation:
     """Represents a citation extracted from LLM text"""
@@ -49,14 +130,10 @@ class CitationExtractor:
         # Extract configuration
         citation_config = config.get('llm_citation_enhancement', {}).get('citation_extraction', {})
         
-        # URL patterns (compiled for performance)
-        self.url_patterns = [
-            re.compile(pattern, re.IGNORECASE | re.MULTILINE)
-            for pattern in citation_config.get('url_patterns', [
-                r'https?://[\w\.-]+\.\w+[\w\-._~!$&\'()*+,;=:@/]*',
-                r'www\.[\w\.-]+\.\w+[\w\-._~!$&\'()*+,;=:@/]*'
-            ])
-        ]
+        # URL patterns, merged into one regex and compiled once per pattern set
+        self.url_pattern_sources = tuple(citation_config.get('url_patterns', DEFAULT_URL_PATTERNS))
+        self.combined_url_pattern, separate_patterns = _compile_url_patterns(self.url_pattern_sources)
+        self.url_patterns = list(separate_patterns)
         
         # Context settings
         self.extract_context = citation_config.get('extract_surrounding_context', True)
@@ -76,6 +153,12 @@ class CitationExtractor:
         self.extraction_timeout = citation_config.get('extraction_timeout', 5.0)
         self.parallel_extraction = citation_config.get('parallel_extraction', True)
         
+        # Large batches can scan their texts in worker processes
+        pool_config = citation_config.get('process_pool', {})
+        self.process_pool_enabled = pool_config.get('enabled', False)
+        self.process_pool_min_batch = pool_config.get('min_batch_size', 16)
+        self.process_pool_workers = pool_config.get('max_workers', 4)
+        
         # Performance metrics
         self.metrics = {
             'total_extractions': 0,
@@ -108,6 +191,12 @@ class CitationExtractor:
         # Extract URLs using regex patterns
         raw_citations = await self._extract_raw_citations(llm_response)
         
+        return self._build_extraction_result(llm_response, response_id, raw_citations, start_time)
+    
+    def _build_extraction_result(self, llm_response: str, response_id: Optional[str],
+                                 raw_citations: List[RawCitation], start_time: float) -> CitationExtractionResult:
+        """Validate raw URLs of one response and package the result"""
+        
         # Filter and validate the extracted citations
         valid_citations = self._filter_and_validate_citations(raw_citations, llm_response)
         
@@ -287,11 +376,25 @@ class CitationExtractor:
         
         return True
     
-    async def extract_citations_from_multiple_responses(self, responses: List[Dict[str, Any]]) -> List[CitationExtractionResult]:
-        """Extract citations from multiple LLM responses in parallel"""
+    async def extract_citations_from_multiple_responses(self, responses: List[Dict[str, Any]],
+                                                        use_process_pool: Optional[bool] = None) -> List[CitationExtractionResult]:
+        """
+        Extract citations from multiple LLM responses in parallel. Batches of
+        at least ``process_pool.min_batch_size`` responses (or any batch when
+        ``use_process_pool`` is True) have their texts scanned in worker
+        processes; validation and metrics stay in this process.
+        """
         if not responses:
             return []
         
+        if use_process_pool is None:
+            use_process_pool = self.process_pool_enabled and len(responses) >= self.process_pool_min_batch
+        if use_process_pool:
+            try:
+                return await self._extract_batch_in_processes(responses)
+            except Exception as e:
+                logger.warning(f"Process-pool citation extraction failed ({e}); extracting in-process")
+        
         if self.parallel_extraction and len(responses) > 1:
             # Process in parallel
             tasks = []
@@ -345,54 +448,36 @@ class CitationExtractor:
             
             return results
     
-    async def _extract_raw_citations(self, text: str) -> List[Tuple[str, int, str]]:
-        """Extract raw URLs using all patterns"""
-        citations = []
-        
-        # Use ThreadPoolExecutor for CPU-intensive regex operations
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            # Submit pattern matching tasks
-            futures = []
-            for i, pattern in enumerate(self.url_patterns):
-                future = executor.submit(self._extract_with_pattern, text, pattern, f"pattern_{i}")
-                futures.append(future)
-            
-            # Collect results
-            for future in futures:
-                try:
-                    pattern_citations = future.result(timeout=2.0)  # 2 second timeout per pattern
-                    citations.extend(pattern_citations)
-                except Exception as e:
-                    logger.warning(f"Pattern matching failed: {e}")
-        
-        # Remove duplicates while preserving order
-        seen_urls = set()
-        unique_citations = []
-        for url, pos, method in citations:
-            if url not in seen_urls:
-                seen_urls.add(url)
-                unique_citations.append((url, pos, method))
+    async def _extract_batch_in_processes(self, responses: List[Dict[str, Any]]) -> List[CitationExtractionResult]:
+        """Scan response texts in the shared process pool, one chunk per worker"""
+        texts = [response_data.get('text', response_data.get('content', '')) or '' for response_data in responses]
+        ids = [response_data.get('id', response_data.get('response_id', '')) for response_data in responses]
         
-        return unique_citations
+        start_time = time.time()
+        pool = _get_process_pool(self.process_pool_workers)
+        chunk_size = max(1, -(-len(texts) // self.process_pool_workers))
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(pool, scan_urls_batch, texts[i:i + chunk_size], self.url_pattern_sources)
+            for i in range(0, len(texts), chunk_size)
+        ))
+        raw_per_text = [raw for chunk in chunks for raw in chunk]
+        
+        results = []
+        for text, response_id, raw_citations in zip(texts, ids, raw_per_text):
+            if not text.strip():
+                results.append(await self.extract_citations_from_response(text, response_id))
+            else:
+                results.append(self._build_extraction_result(text, response_id, raw_citations, start_time))
+        return results
     
-    def _extract_with_pattern(self, text: str, pattern: re.Pattern, method: str) -> List[Tuple[str, int, str]]:
-        """Extract URLs using a specific pattern"""
-        citations = []
-        
+    async def _extract_raw_citations(self, text: str) -> List[RawCitation]:
+        """Extract raw URLs with the merged pattern in a single pass"""
         try:
-            for match in pattern.finditer(text):
-                url = match.group(0)
-                position = match.start()
-                
-                # Basic URL cleanup
-                url = url.rstrip('.,;:!?)')  # Remove trailing punctuation
-                
-                citations.append((url, position, method))
-                
+            return scan_urls(text, self.url_pattern_sources)
         except Exception as e:
-            logger.warning(f"Pattern extraction failed for {method}: {e}")
-        
-        return citations
+            logger.warning(f"Pattern matching failed: {e}")
+            return []
     
     def _filter_and_validate_citations(self, raw_citations: List[Tuple[str, int, str]], source_text: str) -> List[ExtractedCitation]:
         """Filter and validate extracted citations"""
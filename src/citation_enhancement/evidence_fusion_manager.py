@@ -9,7 +9,7 @@ import logging
 import time
 from typing import List, Dict, Any, Optional, Set, Tuple
 from dataclasses import dataclass
-from difflib import SequenceMatcher
+from src.core.near_duplicate_index import NearDuplicateIndex
 
 logger = logging.getLogger(__name__)
 
@@ -372,45 +372,44 @@ class EvidenceFusionManager:
         return min(1.0, composite)
     
     def _deduplicate_evidence(self, evidence_list: List[FusedEvidence]) -> Tuple[List[FusedEvidence], int]:
-        """Remove duplicate evidence using similarity analysis"""
+        """Remove duplicate evidence using URL matching and MinHash/LSH similarity analysis"""
         
         if not evidence_list:
             return [], 0
         
-        unique_evidence = []
+        unique_evidence: List[FusedEvidence] = []
+        slots_by_url: Dict[str, int] = {}
+        content_index = NearDuplicateIndex(threshold=self.similarity_threshold)
         dedup_count = 0
         
         for evidence in evidence_list:
-            is_duplicate = False
+            # Check URL duplicates
+            if evidence.source_url in slots_by_url:
+                dedup_count += 1
+                continue
             
-            for existing in unique_evidence:
-                # Check URL similarity
-                if evidence.source_url == existing.source_url:
-                    is_duplicate = True
-                    break
+            # Check content similarity against LSH candidates only
+            slot = content_index.find_duplicate(evidence.text_content)
+            if slot is not None:
+                existing = unique_evidence[slot]
                 
-                # Check content similarity
-                similarity = SequenceMatcher(None, 
-                    evidence.text_content.lower(), 
-                    existing.text_content.lower()
-                ).ratio()
+                # Keep the higher-scored evidence
+                existing_score = existing.fusion_metadata.get('composite_score', 0)
+                current_score = evidence.fusion_metadata.get('composite_score', 0)
                 
-                if similarity > self.similarity_threshold:
-                    # Keep the higher-scored evidence
-                    existing_score = existing.fusion_metadata.get('composite_score', 0)
-                    current_score = evidence.fusion_metadata.get('composite_score', 0)
-                    
-                    if current_score > existing_score:
-                        # Replace existing with current
-                        unique_evidence.remove(existing)
-                        unique_evidence.append(evidence)
-                    
-                    is_duplicate = True
-                    dedup_count += 1
-                    break
+                if current_score > existing_score:
+                    # Replace existing with current
+                    del slots_by_url[existing.source_url]
+                    unique_evidence[slot] = evidence
+                    slots_by_url[evidence.source_url] = slot
+                    content_index.add(slot, evidence.text_content)
+                
+                dedup_count += 1
+                continue
             
-            if not is_duplicate:
-                unique_evidence.append(evidence)
+            slots_by_url[evidence.source_url] = len(unique_evidence)
+            content_index.add(len(unique_evidence), evidence.text_content)
+            unique_evidence.append(evidence)
         
         return unique_evidence, dedup_count
     
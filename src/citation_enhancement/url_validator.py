@@ -5,7 +5,6 @@ Basic URL validation with essential checks for citation enhancement.
 """
 
 import asyncio
-import aiohttp
 import logging
 import time
 from typing import List, Dict, Any, Optional
@@ -13,6 +12,8 @@ from dataclasses import dataclass
 from urllib.parse import urlparse
 from enum import Enum
 
+from src.core.http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 class ValidationStatus(Enum):
@@ -45,11 +46,9 @@ class URLValidator:
         self.metrics = {'total': 0, 'valid': 0, 'invalid': 0}
     
     async def initialize(self):
-        """Initialize HTTP session"""
+        """Attach to the shared HTTP client"""
         if not self.session:
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            headers = {'User-Agent': self.user_agent}
-            self.session = aiohttp.ClientSession(timeout=timeout, headers=headers)
+            self.session = get_http_client(self.config)
         return True
     
     async def validate_urls_batch(self, urls: List[str]) -> List[URLValidationResult]:
@@ -110,7 +109,9 @@ class URLValidator:
         # HTTP check
         try:
             normalized_url = url if url.startswith(('http://', 'https://')) else f'https://{url}'
-            async with self.session.head(normalized_url, allow_redirects=True) as response:
+            # No retries: a validation verdict should cost one request per URL
+            async with self.session.head(normalized_url, allow_redirects=True, timeout=self.timeout,
+                                         headers={'User-Agent': self.user_agent}, retries=0) as response:
                 is_valid = response.status < 400
                 self.metrics['total'] += 1
                 if is_valid:
@@ -153,7 +154,5 @@ class URLValidator:
         return self.metrics.copy()
     
     async def cleanup(self):
-        """Cleanup session"""
-        if self.session:
-            await self.session.close()
-            self.session = None 
\ No newline at end of file
+        """Detach from the shared HTTP client (its connections stay pooled)"""
+        self.session = None 
\ No newline at end of file
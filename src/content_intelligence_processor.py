@@ -4,9 +4,13 @@ Extracts enhanced content attributes like iconic landmarks, practical intelligen
 neighborhood insights, and content discovery metadata from web sources.
 """
 
+import asyncio
+import copy
 import logging
 import re
 import json
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional
 from src.schemas import (
     IconicLandmarks, PracticalTravelIntelligence, 
@@ -16,6 +20,24 @@ from src.schemas import (
 
 logger = logging.getLogger(__name__)
 
+# Corpora kept per processor; a run works through one destination at a time
+MAX_CACHED_CORPORA = 4
+
+
+@dataclass
+class ContentCorpus:
+    """Theme-independent scan of one destination's web pages, shared by every theme"""
+    destination: str
+    web_pages: List[PageContent]
+    web_content: str
+    high_quality_sources: List[str]
+    landmark_mentions: List[str] = field(default_factory=list)
+    cost_mentions: List[str] = field(default_factory=list)
+    timing_mentions: List[str] = field(default_factory=list)
+    booking_mentions: List[str] = field(default_factory=list)
+    neighborhood_mentions: List[str] = field(default_factory=list)
+    content_discovery: Dict[str, Any] = field(default_factory=dict)
+
 class ContentIntelligenceProcessor:
     """Processes web content to extract enhanced content intelligence attributes"""
     
@@ -68,6 +90,75 @@ class ContentIntelligenceProcessor:
             r'free\s+(?:admission|entry|access)',
             r'discounts?\s+(?:available|offered)',
         ]
+        
+        # Compiled once; every destination corpus is scanned with these
+        self._authority_regex = re.compile(
+            '|'.join(re.escape(domain) for domain in self.travel_authority_domains)
+        )
+        self._landmark_regexes = [re.compile(p, re.IGNORECASE) for p in self.landmark_patterns]
+        self._neighborhood_regexes = [re.compile(p, re.IGNORECASE) for p in self.neighborhood_patterns]
+        self._practical_regexes = [
+            (re.compile(p, re.IGNORECASE), self._practical_category(p)) for p in self.practical_patterns
+        ]
+        self._corpora: "OrderedDict[tuple, ContentCorpus]" = OrderedDict()
+    
+    @staticmethod
+    def _practical_category(pattern: str) -> Optional[str]:
+        """Which mention list a practical pattern feeds"""
+        if any(word in pattern for word in ['cost', 'price', '$']):
+            return 'cost'
+        elif any(word in pattern for word in ['book', 'advance', 'time']):
+            return 'timing'
+        elif 'book' in pattern:
+            return 'booking'
+        return None
+    
+    @staticmethod
+    def _scan_contexts(regex: "re.Pattern", text: str, before: int, after: int) -> List[str]:
+        """Surrounding context of every match of ``regex`` in ``text``"""
+        return [
+            text[max(0, match.start() - before):min(len(text), match.end() + after)].strip()
+            for match in regex.finditer(text)
+        ]
+    
+    def get_corpus(self, destination: str, web_pages: Optional[List[PageContent]]) -> ContentCorpus:
+        """
+        Corpus for this destination's pages, built on first use and reused by
+        every theme that passes the same page list.
+        """
+        key = (destination, id(web_pages), len(web_pages or []))
+        corpus = self._corpora.get(key)
+        if corpus is not None and corpus.web_pages is web_pages:
+            self._corpora.move_to_end(key)
+            return corpus
+        
+        corpus = self._build_corpus(destination, web_pages)
+        self._corpora[key] = corpus
+        while len(self._corpora) > MAX_CACHED_CORPORA:
+            self._corpora.popitem(last=False)
+        return corpus
+    
+    def _build_corpus(self, destination: str, web_pages: Optional[List[PageContent]]) -> ContentCorpus:
+        pages = web_pages or []
+        web_content = ''.join(f"\n{page.title}\n{page.content}" for page in pages)
+        
+        # Check which sources are from travel authorities
+        high_quality_sources = [
+            page.url for page in pages
+            if self._authority_regex.search(self._extract_domain(page.url).lower())
+        ]
+        
+        corpus = ContentCorpus(destination, web_pages, web_content, high_quality_sources)
+        for regex in self._landmark_regexes:
+            corpus.landmark_mentions.extend(self._scan_contexts(regex, web_content, 100, 200))
+        for regex, category in self._practical_regexes:
+            contexts = self._scan_contexts(regex, web_content, 50, 100)
+            if category:
+                getattr(corpus, f"{category}_mentions").extend(contexts)
+        for regex in self._neighborhood_regexes:
+            corpus.neighborhood_mentions.extend(self._scan_contexts(regex, web_content, 80, 150))
+        corpus.content_discovery = self._extract_content_discovery_intelligence(web_content, high_quality_sources)
+        return corpus
     
     async def extract_content_intelligence(self, theme: str, destination: str, 
                                          web_pages: List[PageContent] = None,
@@ -76,60 +167,29 @@ class ContentIntelligenceProcessor:
         
         logger.info(f"Extracting content intelligence for {theme} in {destination}")
         
-        # Collect web content
-        web_content = ""
-        high_quality_sources = []
-        
-        if web_pages:
-            for page in web_pages:
-                web_content += f"\n{page.title}\n{page.content}"
-                
-                # Check if source is from travel authority
-                domain = self._extract_domain(page.url)
-                if any(auth_domain in domain.lower() for auth_domain in self.travel_authority_domains):
-                    high_quality_sources.append(page.url)
-        
-        # Extract each intelligence type
-        iconic_landmarks = await self._extract_iconic_landmarks(
-            theme, destination, web_content, llm_generator
-        )
+        # Pattern scans don't depend on the theme, so all themes share one corpus
+        corpus = self.get_corpus(destination, web_pages)
         
-        practical_intelligence = await self._extract_practical_intelligence(
-            theme, destination, web_content, llm_generator
-        )
-        
-        neighborhood_insights = await self._extract_neighborhood_insights(
-            theme, destination, web_content, llm_generator
-        )
-        
-        content_discovery = self._extract_content_discovery_intelligence(
-            web_content, high_quality_sources
+        # The three extractions are independent LLM calls
+        iconic_landmarks, practical_intelligence, neighborhood_insights = await asyncio.gather(
+            self._extract_iconic_landmarks(theme, destination, corpus, llm_generator),
+            self._extract_practical_intelligence(theme, destination, corpus, llm_generator),
+            self._extract_neighborhood_insights(theme, destination, corpus, llm_generator)
         )
         
         return {
             'iconic_landmarks': iconic_landmarks,
             'practical_travel_intelligence': practical_intelligence,
             'neighborhood_insights': neighborhood_insights,
-            'content_discovery_intelligence': content_discovery
+            'content_discovery_intelligence': copy.deepcopy(corpus.content_discovery)
         }
     
     async def _extract_iconic_landmarks(self, theme: str, destination: str, 
-                                      web_content: str, llm_generator=None) -> Dict[str, Any]:
+                                      corpus: ContentCorpus, llm_generator=None) -> Dict[str, Any]:
         """Extract specific landmarks and their compelling descriptions"""
         
-        # Pattern-based extraction first
-        landmark_mentions = []
-        descriptions = {}
-        
-        # Find landmark patterns in text
-        for pattern in self.landmark_patterns:
-            matches = re.finditer(pattern, web_content, re.IGNORECASE)
-            for match in matches:
-                # Extract surrounding context
-                start = max(0, match.start() - 100)
-                end = min(len(web_content), match.end() + 200)
-                context = web_content[start:end].strip()
-                landmark_mentions.append(context)
+        # Pattern-based mentions come from the shared corpus scan
+        landmark_mentions = corpus.landmark_mentions
         
         # Use LLM to enhance extraction if available
         if llm_generator and landmark_mentions:
@@ -159,27 +219,12 @@ class ContentIntelligenceProcessor:
         }
     
     async def _extract_practical_intelligence(self, theme: str, destination: str,
-                                            web_content: str, llm_generator=None) -> Dict[str, Any]:
+                                            corpus: ContentCorpus, llm_generator=None) -> Dict[str, Any]:
         """Extract factual travel planning information"""
         
-        # Pattern-based extraction
-        cost_mentions = []
-        timing_mentions = []
-        booking_mentions = []
-        
-        for pattern in self.practical_patterns:
-            matches = re.finditer(pattern, web_content, re.IGNORECASE)
-            for match in matches:
-                start = max(0, match.start() - 50)
-                end = min(len(web_content), match.end() + 100)
-                context = web_content[start:end].strip()
-                
-                if any(word in pattern for word in ['cost', 'price', '$']):
-                    cost_mentions.append(context)
-                elif any(word in pattern for word in ['book', 'advance', 'time']):
-                    timing_mentions.append(context)
-                elif 'book' in pattern:
-                    booking_mentions.append(context)
+        cost_mentions = corpus.cost_mentions
+        timing_mentions = corpus.timing_mentions
+        booking_mentions = corpus.booking_mentions
         
         # Use LLM for structured extraction if available
         if llm_generator and (cost_mentions or timing_mentions):
@@ -209,19 +254,10 @@ class ContentIntelligenceProcessor:
         }
     
     async def _extract_neighborhood_insights(self, theme: str, destination: str,
-                                           web_content: str, llm_generator=None) -> Dict[str, Any]:
+                                           corpus: ContentCorpus, llm_generator=None) -> Dict[str, Any]:
         """Extract area-specific intelligence"""
         
-        # Pattern-based neighborhood extraction
-        neighborhood_mentions = []
-        
-        for pattern in self.neighborhood_patterns:
-            matches = re.finditer(pattern, web_content, re.IGNORECASE)
-            for match in matches:
-                start = max(0, match.start() - 80)
-                end = min(len(web_content), match.end() + 150)
-                context = web_content[start:end].strip()
-                neighborhood_mentions.append(context)
+        neighborhood_mentions = corpus.neighborhood_mentions
         
         # Use LLM for structured extraction
         if llm_generator and neighborhood_mentions:
@@ -0,0 +1,182 @@
+"""
+Adaptive Concurrency Limiter
+AIMD (additive-increase / multiplicative-decrease) control of in-flight
+requests to one upstream provider. The limit grows by about one slot per
+limit's worth of successful responses and is cut sharply when the provider
+signals overload (429 / 5xx), so each provider settles near its own quota
+tier. Latency is reported but does not steer the limit: LLM response time
+tracks output length far more than provider load.
+"""
+
+import asyncio
+import logging
+import math
+import re
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+OVERLOAD_STATUS_CODES = {429, 500, 502, 503, 504, 529}
+_OVERLOAD_MARKERS = (
+    'rate limit', 'ratelimit', 'too many requests', 'quota', 'resource exhausted',
+    'resource_exhausted', 'overloaded', 'service unavailable', 'bad gateway', 'internal server error'
+)
+_OVERLOAD_CODE_RE = re.compile(r'\b(429|503|529)\b')
+
+# Request outcomes reported to ``release``
+SUCCESS = 'success'
+OVERLOAD = 'overload'
+ERROR = 'error'
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    for candidate in (exc, getattr(exc, 'response', None)):
+        if candidate is None:
+            continue
+        for attr in ('status_code', 'status', 'http_status', 'code'):
+            value = getattr(candidate, attr, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """Whether an exception from an LLM client means the provider is overloaded"""
+    status = _status_code(exc)
+    if status is not None:
+        return status in OVERLOAD_STATUS_CODES
+    message = str(exc).lower()
+    return any(marker in message for marker in _OVERLOAD_MARKERS) or bool(_OVERLOAD_CODE_RE.search(message))
+
+
+def classify_outcome(exc: Optional[BaseException]) -> str:
+    if exc is None:
+        return SUCCESS
+    return OVERLOAD if is_overload_error(exc) else ERROR
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on concurrent requests, awaited with ``acquire``/``release``"""
+    
+    def __init__(self, name: str, initial_limit: float = 4, min_limit: float = 1,
+                 max_limit: float = 16, increase_step: float = 1.0, backoff_ratio: float = 0.5,
+                 error_rate_threshold: float = 0.1, backoff_cooldown_seconds: float = 2.0,
+                 smoothing: float = 0.1):
+        self.name = name
+        self.min_limit = max(1.0, float(min_limit))
+        self.max_limit = max(self.min_limit, float(max_limit))
+        self.limit = min(self.max_limit, max(self.min_limit, float(initial_limit)))
+        self.increase_step = increase_step
+        self.backoff_ratio = backoff_ratio
+        self.error_rate_threshold = error_rate_threshold
+        self.backoff_cooldown_seconds = backoff_cooldown_seconds
+        self.smoothing = smoothing
+        
+        self.in_flight = 0
+        self.queue_depth = 0
+        self.average_latency: Optional[float] = None
+        self.error_rate = 0.0
+        self._last_backoff = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+        
+        self.stats = {
+            'acquired': 0,
+            'successes': 0,
+            'overloads': 0,
+            'errors': 0,
+            'increases': 0,
+            'backoffs': 0,
+            'max_queue_depth': 0,
+            'total_wait_seconds': 0.0
+        }
+    
+    @classmethod
+    def from_config(cls, name: str, config: Dict[str, Any], default_max: int) -> "AdaptiveConcurrencyLimiter":
+        """Build from an ``adaptive_concurrency`` block with optional ``providers.<name>`` overrides"""
+        settings = {k: v for k, v in config.items() if k not in ('enabled', 'providers')}
+        settings.update(config.get('providers', {}).get(name, {}) or {})
+        if settings.get('max_limit') is None:
+            settings['max_limit'] = default_max
+        return cls(name, **settings)
+    
+    @property
+    def current_limit(self) -> int:
+        return max(1, math.floor(self.limit))
+    
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+    
+    async def acquire(self):
+        """Wait for an in-flight slot under the current limit"""
+        condition = self._get_condition()
+        wait_start = time.monotonic()
+        async with condition:
+            if self.in_flight >= self.current_limit:
+                self.queue_depth += 1
+                self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], self.queue_depth)
+                try:
+                    await condition.wait_for(lambda: self.in_flight < self.current_limit)
+                finally:
+                    self.queue_depth -= 1
+            self.in_flight += 1
+        self.stats['acquired'] += 1
+        self.stats['total_wait_seconds'] += time.monotonic() - wait_start
+    
+    async def release(self, latency: float, outcome: str = SUCCESS):
+        """Return a slot and adjust the limit from the request's outcome"""
+        condition = self._get_condition()
+        async with condition:
+            in_flight = self.in_flight
+            self.in_flight = max(0, self.in_flight - 1)
+            self._adjust(latency, outcome, in_flight)
+            condition.notify_all()
+    
+    def _adjust(self, latency: float, outcome: str, in_flight: int):
+        now = time.monotonic()
+        self.error_rate += self.smoothing * ((outcome != SUCCESS) - self.error_rate)
+        
+        if outcome == OVERLOAD:
+            self.stats['overloads'] += 1
+            self._backoff(now, self.backoff_ratio, "overload")
+            return
+        if outcome != SUCCESS:
+            self.stats['errors'] += 1
+            return
+        
+        self.stats['successes'] += 1
+        if self.average_latency is None:
+            self.average_latency = latency
+        self.average_latency += self.smoothing * (latency - self.average_latency)
+        
+        if (self.error_rate <= self.error_rate_threshold and
+              in_flight * 2 >= self.current_limit and self.limit < self.max_limit):
+            # Only grow a limit that is actually being used
+            self.limit = min(self.max_limit, self.limit + self.increase_step / self.limit)
+            self.stats['increases'] += 1
+    
+    def _backoff(self, now: float, ratio: float, reason: str):
+        # One backoff per cooldown: a burst of failures from the same window is one signal
+        if now - self._last_backoff < self.backoff_cooldown_seconds:
+            return
+        previous = self.limit
+        self.limit = max(self.min_limit, self.limit * ratio)
+        self._last_backoff = now
+        self.stats['backoffs'] += 1
+        if math.floor(previous) != math.floor(self.limit):
+            logger.info(f"{self.name}: concurrency limit {previous:.1f} -> {self.limit:.1f} ({reason})")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'concurrency_limit': self.current_limit,
+            'concurrency_limit_raw': round(self.limit, 2),
+            'min_limit': self.min_limit,
+            'max_limit': self.max_limit,
+            'in_flight': self.in_flight,
+            'queue_depth': self.queue_depth,
+            'average_latency': self.average_latency,
+            'error_rate': round(self.error_rate, 3),
+            **self.stats
+        }
@@ -0,0 +1,249 @@
+"""
+Persistent Embedding Store
+Content-addressed on-disk cache for sentence embeddings keyed by (model name, text hash).
+Vectors live in a memory-mapped float32 array file; a small SQLite index maps text
+hashes to rows so repeated runs reuse every vector they have already computed.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_CACHE_DIR = os.path.join("cache", "embeddings")
+
+_SQLITE_PARAM_CHUNK = 500
+
+
+class EmbeddingStore:
+    """Memory-mapped float32 embedding store with a SQLite hash -> row index"""
+    
+    def __init__(self, model_name: str, cache_dir: str = DEFAULT_EMBEDDING_CACHE_DIR):
+        self.model_name = model_name
+        safe_model = re.sub(r'[^A-Za-z0-9_.-]', '_', model_name)
+        self.store_dir = os.path.join(cache_dir, safe_model)
+        os.makedirs(self.store_dir, exist_ok=True)
+        
+        self.vectors_path = os.path.join(self.store_dir, "vectors.f32")
+        self.index_path = os.path.join(self.store_dir, "index.sqlite")
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.index_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (text_hash TEXT PRIMARY KEY, row INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+        
+        self.dimension: Optional[int] = self._read_meta_int("dimension")
+        self._mmap: Optional[np.memmap] = None
+        self._mmap_rows = 0
+        
+        self.stats = {'hits': 0, 'misses': 0, 'inserted': 0}
+    
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """Content address for a piece of text"""
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+    
+    def _read_meta_int(self, key: str) -> Optional[int]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return int(row[0]) if row else None
+    
+    def _row_count(self) -> int:
+        return self._read_meta_int("rows") or 0
+    
+    def _vectors(self, required_rows: int) -> np.memmap:
+        """Return a read-only mapping that covers at least ``required_rows`` rows"""
+        if self._mmap is None or self._mmap_rows < required_rows:
+            rows = os.path.getsize(self.vectors_path) // (4 * self.dimension)
+            self._mmap = np.memmap(self.vectors_path, dtype=np.float32, mode='r',
+                                   shape=(rows, self.dimension))
+            self._mmap_rows = rows
+        return self._mmap
+    
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Bulk lookup; returns one vector (or None on miss) per input text"""
+        if not texts:
+            return []
+        
+        hashes = [self.text_hash(text) for text in texts]
+        rows_by_hash: Dict[str, int] = {}
+        
+        with self._lock:
+            if self.dimension is None or not os.path.exists(self.vectors_path):
+                self.stats['misses'] += len(texts)
+                return [None] * len(texts)
+            
+            unique_hashes = list(dict.fromkeys(hashes))
+            for start in range(0, len(unique_hashes), _SQLITE_PARAM_CHUNK):
+                chunk = unique_hashes[start:start + _SQLITE_PARAM_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows_by_hash.update(self._conn.execute(
+                    f"SELECT text_hash, row FROM embeddings WHERE text_hash IN ({placeholders})", chunk
+                ).fetchall())
+            
+            if not rows_by_hash:
+                self.stats['misses'] += len(texts)
+                return [None] * len(texts)
+            
+            vectors = self._vectors(max(rows_by_hash.values()) + 1)
+            results = []
+            for text_hash in hashes:
+                row = rows_by_hash.get(text_hash)
+                if row is None or row >= self._mmap_rows:
+                    results.append(None)
+                    self.stats['misses'] += 1
+                else:
+                    results.append(np.array(vectors[row]))
+                    self.stats['hits'] += 1
+            return results
+    
+    def put_many(self, texts: Sequence[str], vectors: Any) -> int:
+        """Bulk insert; texts already present are skipped. Returns number of new rows."""
+        if not len(texts):
+            return 0
+        
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        
+        with self._lock:
+            if self.dimension is None:
+                self.dimension = int(matrix.shape[1])
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO meta (key, value) VALUES ('dimension', ?)", (str(self.dimension),)
+                )
+                self._conn.commit()
+                self.dimension = self._read_meta_int("dimension")
+            if matrix.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Embedding dimension {matrix.shape[1]} does not match store dimension {self.dimension}"
+                )
+            
+            # BEGIN IMMEDIATE serialises writers across processes, so row
+            # allocation and the vector append happen atomically
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                seen = set()
+                new_items = []
+                for text, vector in zip(texts, matrix):
+                    text_hash = self.text_hash(text)
+                    if text_hash in seen:
+                        continue
+                    seen.add(text_hash)
+                    new_items.append((text_hash, vector))
+                
+                existing = set()
+                candidate_hashes = [h for h, _ in new_items]
+                for start in range(0, len(candidate_hashes), _SQLITE_PARAM_CHUNK):
+                    chunk = candidate_hashes[start:start + _SQLITE_PARAM_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    existing.update(h for (h,) in self._conn.execute(
+                        f"SELECT text_hash FROM embeddings WHERE text_hash IN ({placeholders})", chunk
+                    ))
+                new_items = [(h, v) for h, v in new_items if h not in existing]
+                
+                if not new_items:
+                    self._conn.execute("COMMIT")
+                    return 0
+                
+                first_row = self._row_count()
+                block = np.stack([v for _, v in new_items]).astype(np.float32, copy=False)
+                with open(self.vectors_path, 'ab') as f:
+                    f.seek(first_row * 4 * self.dimension)
+                    f.truncate(first_row * 4 * self.dimension)
+                    f.write(block.tobytes())
+                
+                self._conn.executemany(
+                    "INSERT INTO embeddings (text_hash, row) VALUES (?, ?)",
+                    [(h, first_row + i) for i, (h, _) in enumerate(new_items)]
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('rows', ?)",
+                    (str(first_row + len(new_items)),)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            
+            self.stats['inserted'] += len(new_items)
+            return len(new_items)
+    
+    def encode(self, model: Any, texts: Sequence[str], batch_size: int = 64) -> np.ndarray:
+        """
+        Return embeddings for ``texts`` in order, encoding only the ones missing
+        from the store (in a single batched call) and persisting them.
+        """
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self.dimension or 0), dtype=np.float32)
+        
+        cached = self.get_many(texts)
+        missing = list(dict.fromkeys(t for t, v in zip(texts, cached) if v is None))
+        
+        computed: Dict[str, np.ndarray] = {}
+        if missing:
+            encoded = np.asarray(
+                model.encode(missing, batch_size=batch_size, convert_to_numpy=True), dtype=np.float32
+            )
+            computed = dict(zip(missing, encoded))
+            try:
+                self.put_many(missing, encoded)
+            except Exception as e:
+                logger.warning(f"Failed to persist {len(missing)} embeddings: {e}")
+        
+        return np.stack([v if v is not None else computed[t] for t, v in zip(texts, cached)])
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Store statistics"""
+        with self._lock:
+            return {
+                'model_name': self.model_name,
+                'dimension': self.dimension,
+                'rows': self._row_count(),
+                **self.stats
+            }
+    
+    def close(self):
+        with self._lock:
+            self._mmap = None
+            self._conn.close()
+
+
+_stores: Dict[tuple, EmbeddingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_embedding_store(model_name: str, config: Optional[Dict[str, Any]] = None) -> Optional[EmbeddingStore]:
+    """
+    Return the process-wide store for ``model_name``, or None when the
+    embedding cache is disabled in ``performance_optimization.embedding_cache``.
+    """
+    cache_config = (config or {}).get('performance_optimization', {}).get('embedding_cache', {})
+    if not cache_config.get('enabled', True):
+        return None
+    
+    cache_dir = cache_config.get('cache_dir', DEFAULT_EMBEDDING_CACHE_DIR)
+    key = (model_name, os.path.abspath(cache_dir))
+    
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            try:
+                store = EmbeddingStore(model_name, cache_dir)
+            except Exception as e:
+                logger.warning(f"Could not open embedding store at {cache_dir}: {e}")
+                return None
+            _stores[key] = store
+        return store
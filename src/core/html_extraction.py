@@ -0,0 +1,154 @@
+"""
+Fast HTML-to-Text Extraction
+Single-pass page extraction for web discovery: one parse yields both the
+cleaned body text and the title. A C-backed parser (selectolax, then lxml) is
+used when installed, with BeautifulSoup and finally a regex pass as fallbacks.
+Parsing runs on a shared executor so large pages never stall the event loop.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import re
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence
+
+try:
+    from selectolax.parser import HTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from bs4 import BeautifulSoup
+    BS4_AVAILABLE = True
+except ImportError:
+    BS4_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NOISY_ELEMENTS = ("script", "style", "nav", "footer", "header", "aside")
+_WHITESPACE = re.compile(r'\s+')
+_TAG = re.compile(r'<[^>]+>')
+_TITLE = re.compile(r'<title[^>]*>([^<]+)</title>', re.IGNORECASE)
+
+
+@dataclass
+class ExtractedPage:
+    """Cleaned text and title of one HTML document"""
+    text: str
+    title: str
+    parser: str
+
+
+def _collapse(text: str) -> str:
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def _extract_selectolax(html: str, noisy_elements: Sequence[str]) -> ExtractedPage:
+    tree = HTMLParser(html)
+    title_node = tree.css_first('title') or tree.css_first('h1')
+    title = _collapse(title_node.text()) if title_node else ''
+    tree.strip_tags(list(noisy_elements))
+    root = tree.body or tree.root
+    text = root.text(separator=' ') if root else ''
+    return ExtractedPage(_collapse(text), title, 'selectolax')
+
+
+def _extract_lxml(html: str, noisy_elements: Sequence[str]) -> ExtractedPage:
+    doc = lxml.html.document_fromstring(html)
+    title_node = doc.find('.//title')
+    if title_node is None:
+        title_node = doc.find('.//h1')
+    title = _collapse(title_node.text_content()) if title_node is not None else ''
+    etree.strip_elements(doc, *noisy_elements, with_tail=False)
+    body = doc.find('body')
+    root = body if body is not None else doc
+    return ExtractedPage(_collapse(' '.join(root.itertext())), title, 'lxml')
+
+
+def _extract_bs4(html: str, noisy_elements: Sequence[str]) -> ExtractedPage:
+    soup = BeautifulSoup(html, 'html.parser')
+    title_node = soup.find('title') or soup.find('h1')
+    title = _collapse(title_node.get_text()) if title_node else ''
+    for element in noisy_elements:
+        for node in soup.select(element):
+            node.decompose()
+    return ExtractedPage(_collapse(soup.get_text(separator=' ')), title, 'bs4')
+
+
+def _extract_regex(html: str, noisy_elements: Sequence[str]) -> ExtractedPage:
+    title_match = _TITLE.search(html)
+    title = _collapse(title_match.group(1)) if title_match else ''
+    tags = '|'.join(re.escape(tag) for tag in ('head', *noisy_elements))
+    text = re.sub(rf'<({tags})\b.*?</\1\s*>', ' ', html, flags=re.IGNORECASE | re.DOTALL)
+    text = _TAG.sub(' ', text)
+    return ExtractedPage(_collapse(text), title, 'regex')
+
+
+_PARSERS = [
+    ('selectolax', SELECTOLAX_AVAILABLE, _extract_selectolax),
+    ('lxml', LXML_AVAILABLE, _extract_lxml),
+    ('bs4', BS4_AVAILABLE, _extract_bs4),
+]
+
+
+def extract_page(html: str, noisy_elements: Sequence[str] = DEFAULT_NOISY_ELEMENTS,
+                 parser: str = 'auto') -> ExtractedPage:
+    """
+    Parse ``html`` once, drop ``noisy_elements`` (tag names) and return the
+    whitespace-collapsed text with the page title (``<title>``, else the
+    first ``<h1>``). ``parser`` pins one backend; ``'auto'`` takes the
+    fastest installed one and falls through to the next if it fails.
+    """
+    if not html:
+        return ExtractedPage('', '', 'none')
+    for name, available, extract in _PARSERS:
+        if not available or parser not in ('auto', name):
+            continue
+        try:
+            return extract(html, noisy_elements)
+        except Exception as e:
+            logger.debug(f"{name} extraction failed ({e}); falling back")
+    return _extract_regex(html, noisy_elements)
+
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(config: Optional[Dict[str, Any]]) -> Executor:
+    """Process-wide pool for parsing (``performance_optimization.html_extraction``)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                settings = (config or {}).get('performance_optimization', {}).get('html_extraction', {})
+                max_workers = settings.get('max_workers', 4)
+                if settings.get('executor', 'thread') == 'process':
+                    # Spawned workers do not inherit the parent's threads and locks mid-use
+                    _executor = ProcessPoolExecutor(
+                        max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')
+                    )
+                else:
+                    _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="html-extract")
+    return _executor
+
+
+async def extract_page_async(html: str, noisy_elements: Sequence[str] = DEFAULT_NOISY_ELEMENTS,
+                             config: Optional[Dict[str, Any]] = None) -> ExtractedPage:
+    """``extract_page`` on the shared parsing pool"""
+    settings = (config or {}).get('performance_optimization', {}).get('html_extraction', {})
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_executor(config), extract_page, html, tuple(noisy_elements), settings.get('parser', 'auto')
+    )
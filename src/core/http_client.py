@@ -0,0 +1,266 @@
+"""
+Shared HTTP Client
+One process-wide aiohttp client for all web I/O (search APIs, page fetches,
+Jina Reader, URL validation, image downloads). A single connector per event
+loop keeps TLS connections alive across callers and caches DNS; per-host caps
+bound how hard any one domain is hit, and transient failures (connection
+errors, timeouts, 429/5xx) on GET/HEAD are retried with one shared backoff
+policy. Other methods are only retried when the request provably never ran
+(429, or the connection could not be opened), so a POST is never resent after
+its body may have reached the server.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {'GET', 'HEAD'}
+
+
+class SharedHTTPClient:
+    """Keep-alive aiohttp session per event loop with per-host limits and retries"""
+    
+    def __init__(self, total_connections: int = 100, per_host_connections: int = 8,
+                 host_limits: Optional[Dict[str, int]] = None, dns_cache_ttl_seconds: int = 300,
+                 keepalive_timeout_seconds: float = 30.0, default_timeout_seconds: float = 30.0,
+                 retry_attempts: int = 2, retry_base_delay: float = 0.5, retry_max_delay: float = 8.0,
+                 user_agent: str = DEFAULT_USER_AGENT):
+        # Sessions and semaphores are bound to the loop that created them
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._host_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # Sessions opened under limits that ``configure`` has since replaced; closed with the loop's session
+        self._retired_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, List[aiohttp.ClientSession]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+        
+        self._apply_settings(total_connections, per_host_connections, host_limits, dns_cache_ttl_seconds,
+                             keepalive_timeout_seconds, default_timeout_seconds, retry_attempts,
+                             retry_base_delay, retry_max_delay, user_agent)
+        
+        self.stats = {
+            'requests': 0,
+            'retries': 0,
+            'failures': 0,
+            'sessions_created': 0,
+            'host_waits': 0
+        }
+    
+    def _apply_settings(self, total_connections: int = 100, per_host_connections: int = 8,
+                        host_limits: Optional[Dict[str, int]] = None, dns_cache_ttl_seconds: int = 300,
+                        keepalive_timeout_seconds: float = 30.0, default_timeout_seconds: float = 30.0,
+                        retry_attempts: int = 2, retry_base_delay: float = 0.5, retry_max_delay: float = 8.0,
+                        user_agent: str = DEFAULT_USER_AGENT):
+        self.total_connections = total_connections
+        self.per_host_connections = per_host_connections
+        self.host_limits = {host.lower(): limit for host, limit in (host_limits or {}).items()}
+        self.dns_cache_ttl_seconds = dns_cache_ttl_seconds
+        self.keepalive_timeout_seconds = keepalive_timeout_seconds
+        self.default_timeout_seconds = default_timeout_seconds
+        self.retry_attempts = retry_attempts
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.user_agent = user_agent
+    
+    @staticmethod
+    def _config_settings(config: Dict[str, Any]) -> Dict[str, Any]:
+        settings = dict(config.get('performance_optimization', {}).get('http_client', {}) or {})
+        settings.pop('enabled', None)
+        return settings
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "SharedHTTPClient":
+        return cls(**cls._config_settings(config))
+    
+    def configure(self, config: Dict[str, Any]):
+        """
+        Replace the limits with ``performance_optimization.http_client``.
+        Open sessions keep serving their in-flight requests; new requests
+        get a session built with the new limits.
+        """
+        settings = self._config_settings(config)
+        with self._lock:
+            self._apply_settings(**settings)
+            for loop, session in list(self._sessions.items()):
+                self._retired_sessions.setdefault(loop, []).append(session)
+            self._sessions.clear()
+            self._host_slots.clear()
+    
+    def _session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.total_connections,
+                    limit_per_host=self.per_host_connections,
+                    ttl_dns_cache=self.dns_cache_ttl_seconds,
+                    keepalive_timeout=self.keepalive_timeout_seconds
+                )
+                session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=self.default_timeout_seconds),
+                    headers={'User-Agent': self.user_agent}
+                )
+                self._sessions[loop] = session
+                self.stats['sessions_created'] += 1
+            return session
+    
+    def _host_slot(self, host: str) -> Optional[asyncio.Semaphore]:
+        """Semaphore for hosts with a cap tighter than the connector's per-host limit"""
+        limit = self.host_limits.get(host)
+        if not limit:
+            return None
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            slots = self._host_slots.setdefault(loop, {})
+            if host not in slots:
+                slots[host] = asyncio.Semaphore(limit)
+            return slots[host]
+    
+    def _backoff_delay(self, attempt: int, response: Optional[aiohttp.ClientResponse] = None) -> float:
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return min(self.retry_max_delay, float(retry_after))
+        delay = min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt))
+        return delay * (0.5 + random.random() / 2)
+    
+    async def _send(self, method: str, url: str, retries: int, **kwargs) -> aiohttp.ClientResponse:
+        session = self._session()
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        # A non-idempotent request may have been acted on once its body went out;
+        # only retry it when it was rejected before any work happened
+        retry_errors = ((aiohttp.ClientConnectionError, asyncio.TimeoutError) if idempotent
+                        else (aiohttp.ClientConnectorError,))
+        retry_statuses = RETRY_STATUSES if idempotent else {429}
+        attempt = 0
+        while True:
+            self.stats['requests'] += 1
+            try:
+                response = await session.request(method, url, **kwargs)
+            except retry_errors as e:
+                if attempt >= retries:
+                    self.stats['failures'] += 1
+                    raise
+                delay = self._backoff_delay(attempt)
+                logger.debug(f"{method} {url} failed ({e!r}); retrying in {delay:.1f}s")
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self.stats['failures'] += 1
+                raise
+            else:
+                if response.status not in retry_statuses or attempt >= retries:
+                    return response
+                delay = self._backoff_delay(attempt, response)
+                logger.debug(f"{method} {url} returned {response.status}; retrying in {delay:.1f}s")
+                response.release()
+            self.stats['retries'] += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+    
+    @asynccontextmanager
+    async def request(self, method: str, url: str, retries: Optional[int] = None,
+                      **kwargs) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        ``async with client.request('GET', url, ...) as response:`` on the
+        shared session. ``timeout`` may be given in seconds; ``retries``
+        overrides the configured retry count for this call. Only GET and
+        HEAD retry on timeouts, dropped connections and 5xx; other methods
+        retry on 429 and failed connects only.
+        """
+        timeout = kwargs.get('timeout')
+        if isinstance(timeout, (int, float)):
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+        retries = self.retry_attempts if retries is None else retries
+        
+        slot = self._host_slot((urlparse(url).hostname or '').lower())
+        if slot is not None:
+            if slot.locked():
+                self.stats['host_waits'] += 1
+            await slot.acquire()
+        try:
+            response = await self._send(method, url, retries, **kwargs)
+            try:
+                yield response
+            finally:
+                response.release()
+        finally:
+            if slot is not None:
+                slot.release()
+    
+    def get(self, url: str, **kwargs):
+        return self.request('GET', url, **kwargs)
+    
+    def post(self, url: str, **kwargs):
+        return self.request('POST', url, **kwargs)
+    
+    def head(self, url: str, **kwargs):
+        return self.request('HEAD', url, **kwargs)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'open_sessions': sum(1 for s in list(self._sessions.values()) if not s.closed),
+            'per_host_connections': self.per_host_connections,
+            'host_limits': dict(self.host_limits),
+            **self.stats
+        }
+    
+    async def close(self):
+        """Close the sessions belonging to the running loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            sessions = self._retired_sessions.pop(loop, [])
+            session = self._sessions.pop(loop, None)
+            if session is not None:
+                sessions.append(session)
+            self._host_slots.pop(loop, None)
+        for session in sessions:
+            if not session.closed:
+                await session.close()
+
+
+_client: Optional[SharedHTTPClient] = None
+_client_configured = False
+_client_lock = threading.Lock()
+
+
+def get_http_client(config: Optional[Dict[str, Any]] = None) -> SharedHTTPClient:
+    """
+    Process-wide HTTP client. The first call that passes a config sets its
+    limits (``performance_optimization.http_client``), even if callers
+    without a config created the client earlier with the defaults.
+    """
+    global _client, _client_configured
+    if _client is None or (config and not _client_configured):
+        with _client_lock:
+            if _client is None:
+                _client = SharedHTTPClient.from_config(config) if config else SharedHTTPClient()
+                _client_configured = bool(config)
+            elif config and not _client_configured:
+                _client.configure(config)
+                _client_configured = True
+    return _client
+
+
+async def close_http_client():
+    """Close the shared session for the running loop (call before the loop exits)"""
+    if _client is not None:
+        await _client.close()
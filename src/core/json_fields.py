@@ -0,0 +1,228 @@
+"""
+Streaming JSON Field Reader
+Reads selected top-level fields from a JSON object file member by member and
+stops as soon as every requested key has been found, holding at most one
+top-level value in memory. Also manages the small
+``*.meta.json`` sidecars written next to large session files, so metadata
+scans cost kilobytes instead of the full evidence payload, and parses JSON
+arrays incrementally as streamed LLM output arrives.
+"""
+
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'\s*')
+_SCALAR_END = re.compile(r'[,}\]\s]')
+_DECODER = json.JSONDecoder()
+
+
+class _StreamingObjectReader:
+    """Incremental reader over the members of a top-level JSON object"""
+    
+    def __init__(self, stream, chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+    
+    def _fill(self, min_chars: int = 0):
+        """Drop consumed text and append at least one chunk (or ``min_chars``)"""
+        if self.eof:
+            raise ValueError("Unexpected end of JSON document")
+        chunk = self.stream.read(max(self.chunk_size, min_chars))
+        if not chunk:
+            self.eof = True
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+    
+    def peek(self) -> str:
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            self._fill()
+    
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' in JSON object")
+        self.pos += 1
+    
+    def read_value(self) -> Any:
+        """Decode the next value, growing the buffer geometrically until it is complete"""
+        if self.peek() not in '"{[':
+            # Numbers and literals can be cut at the buffer boundary
+            while not self.eof and not _SCALAR_END.search(self.buf, self.pos):
+                self._fill()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Truncated value: read as much again as is buffered so the
+                # total re-decoding work stays linear in the value size
+                self._fill(min_chars=len(self.buf) - self.pos)
+                continue
+            self.pos = end
+            return value
+
+
+class JSONArrayStreamParser:
+    """
+    Incremental parser for a top-level JSON array arriving in text chunks.
+    ``feed`` returns every element that closed within the new text, so
+    callers can act on early elements while later ones are still being
+    produced. Text before the opening ``[`` (e.g. a markdown fence) is
+    skipped, and an element that fails to decode is dropped and counted.
+    """
+    
+    def __init__(self):
+        self.buf = ''
+        self.pos = 0
+        self.started = False
+        self.finished = False
+        self.errors = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._element_start: Optional[int] = None
+    
+    def _emit(self, end: int, elements: List[Any]):
+        text = self.buf[self._element_start:end].strip()
+        self._element_start = None
+        if not text:
+            return
+        try:
+            elements.append(json.loads(text))
+        except ValueError:
+            self.errors += 1
+    
+    def feed(self, text: str) -> List[Any]:
+        elements: List[Any] = []
+        if self.finished or not text:
+            return elements
+        self.buf += text
+        buf = self.buf
+        i = self.pos
+        
+        while i < len(buf) and not self.finished:
+            char = buf[i]
+            if not self.started:
+                self.started = char == '['
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+                if self._element_start is None:
+                    self._element_start = i
+            elif char in '{[':
+                if self._element_start is None:
+                    self._element_start = i
+                self._depth += 1
+            elif self._depth > 0:
+                if char in '}]':
+                    self._depth -= 1
+                    if self._depth == 0:
+                        # Containers are emitted the moment they close
+                        self._emit(i + 1, elements)
+            elif char in ',]':
+                if self._element_start is not None:
+                    self._emit(i, elements)
+                self.finished = char == ']'
+            elif self._element_start is None and not char.isspace():
+                self._element_start = i
+            i += 1
+        
+        # Keep only the unfinished element so the buffer stays small
+        keep = self._element_start if self._element_start is not None else i
+        self.buf = buf[keep:]
+        if self._element_start is not None:
+            self._element_start = 0
+        self.pos = i - keep
+        return elements
+
+
+def read_json_fields(path, fields: Iterable[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    Return ``{key: value}`` for the requested top-level keys of the JSON object
+    stored at ``path``. Keys that are absent are omitted. Reading stops once
+    every requested key has been decoded, so fields near the start of a large
+    file cost only the bytes before them.
+    """
+    wanted = set(fields)
+    found: Dict[str, Any] = {}
+    if not wanted:
+        return found
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _StreamingObjectReader(f, chunk_size)
+        reader.expect('{')
+        if reader.peek() == '}':
+            return found
+        
+        while True:
+            key = reader.read_value()
+            reader.expect(':')
+            value = reader.read_value()
+            if key in wanted:
+                found[key] = value
+                if len(found) == len(wanted):
+                    return found
+            
+            separator = reader.peek()
+            reader.pos += 1
+            if separator == '}':
+                return found
+            if separator != ',':
+                raise ValueError("Expected ',' or '}' in JSON object")
+
+
+def sidecar_path(path) -> Path:
+    """``x_enhanced.json`` -> ``x_enhanced.meta.json``"""
+    path = Path(path)
+    return path.with_name(f"{path.stem}.meta.json")
+
+
+def write_sidecar(path, metadata: Dict[str, Any]) -> Path:
+    """Write ``metadata`` next to the (already written) JSON file at ``path``"""
+    path = Path(path)
+    st = path.stat()
+    payload = {
+        **metadata,
+        'source_file': path.name,
+        'source_size': st.st_size,
+        'source_mtime': st.st_mtime,
+        'generated_at': datetime.now().isoformat()
+    }
+    
+    target = sidecar_path(path)
+    tmp_file = target.with_name(target.name + '.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False, default=str)
+    os.replace(tmp_file, target)
+    return target
+
+
+def read_sidecar(path) -> Optional[Dict[str, Any]]:
+    """Sidecar metadata for ``path``, or None when missing or stale"""
+    target = sidecar_path(path)
+    try:
+        st = Path(path).stat()
+        with open(target, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if metadata.get('source_size') != st.st_size or metadata.get('source_mtime') != st.st_mtime:
+        return None
+    return metadata
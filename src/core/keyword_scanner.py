@@ -0,0 +1,94 @@
+"""
+Multi-Keyword Scanner
+Compiles every keyword an analyzer cares about into one matcher and scans a
+document once, returning where each keyword first occurs. Analyzers then
+answer their containment and context questions from the hits instead of
+rescanning the full text once per keyword.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+class KeywordHits:
+    """First match position of each keyword found in one scanned (lowercased) text"""
+    
+    def __init__(self, first_positions: Dict[str, int], text_length: int):
+        self.first_positions = first_positions
+        self.text_length = text_length
+    
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self.first_positions
+    
+    def __len__(self) -> int:
+        return len(self.first_positions)
+    
+    def first(self, keyword: str) -> int:
+        """Start of the first match, or -1 (like ``str.find``)"""
+        return self.first_positions.get(keyword, -1)
+    
+    def any_of(self, keywords: Iterable[str]) -> bool:
+        return any(keyword in self.first_positions for keyword in keywords)
+    
+    def count_of(self, keywords: Iterable[str]) -> int:
+        """How many of ``keywords`` occur at least once"""
+        return sum(1 for keyword in keywords if keyword in self.first_positions)
+    
+    def found(self, keywords: Iterable[str]) -> List[str]:
+        """The ``keywords`` that occur, in the order given"""
+        return [keyword for keyword in keywords if keyword in self.first_positions]
+    
+    def prefix(self, end: int) -> "KeywordHits":
+        """Hits restricted to matches that lie entirely within ``text[:end]``"""
+        return KeywordHits(
+            {keyword: pos for keyword, pos in self.first_positions.items() if pos + len(keyword) <= end},
+            min(end, self.text_length)
+        )
+
+
+class KeywordScanner:
+    """
+    One-pass scanner over a fixed keyword set. Text is lowercased before
+    matching; keywords are matched as given, so they should be lowercase.
+    Uses an Aho-Corasick automaton when ``pyahocorasick`` is installed;
+    otherwise each keyword is located with a single ``str.find``.
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = list(dict.fromkeys(keyword for keyword in keywords if keyword))
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE and self.keywords:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+    
+    @classmethod
+    def from_keyword_maps(cls, *sources: Any) -> "KeywordScanner":
+        """Scanner over every keyword in the given lists and ``{category: [keywords]}`` maps"""
+        keywords: List[str] = []
+        for source in sources:
+            values = source.values() if isinstance(source, dict) else [source]
+            for value in values:
+                keywords.extend([value] if isinstance(value, str) else value)
+        return cls(keywords)
+    
+    def scan(self, text: Optional[str]) -> KeywordHits:
+        text_lower = (text or '').lower()
+        first_positions: Dict[str, int] = {}
+        if self._automaton is not None:
+            # Matches arrive in order of end position, so the first one seen is the earliest
+            for end, keyword in self._automaton.iter(text_lower):
+                if keyword not in first_positions:
+                    first_positions[keyword] = end - len(keyword) + 1
+        else:
+            for keyword in self.keywords:
+                pos = text_lower.find(keyword)
+                if pos != -1:
+                    first_positions[keyword] = pos
+        return KeywordHits(first_positions, len(text_lower))
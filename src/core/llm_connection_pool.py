@@ -5,11 +5,12 @@ Implements connection pooling for LLM providers to improve performance and resou
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator
 from datetime import datetime, timedelta
 import time
 from dataclasses import dataclass
-from src.core.llm_factory import LLMFactory
+from src.core.llm_factory import LLMFactory, chunk_text
+from src.core.adaptive_concurrency import AdaptiveConcurrencyLimiter, classify_outcome
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +69,30 @@ class LLMConnection:
                 logger.warning(f"Connection {self.connection_id} marked unhealthy due to errors")
             raise e
     
+    async def stream_request(self, prompt: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """Yield response text chunks as the provider produces them"""
+        start_time = time.time()
+        
+        try:
+            self.last_used = datetime.now()
+            async for chunk in self.llm.astream(prompt):
+                text = chunk_text(chunk)
+                if text:
+                    yield text
+            
+            self.total_response_time += time.time() - start_time
+            self.request_count += 1
+            if self.request_count >= self.max_requests:
+                self.is_healthy = False
+                logger.debug(f"Connection {self.connection_id} marked for recycling (max requests reached)")
+                
+        except Exception as e:
+            self.error_count += 1
+            if self.error_count > 5:  # Mark unhealthy after 5 errors
+                self.is_healthy = False
+                logger.warning(f"Connection {self.connection_id} marked unhealthy due to errors")
+            raise e
+    
     @property
     def avg_response_time(self) -> float:
         """Calculate average response time for this connection"""
@@ -97,13 +122,23 @@ class LLMConnectionPool:
         self.provider = provider
         self.config = config
         
-        # Pool configuration
+        # Pool configuration (llm_connection_pool block, legacy flat keys as fallback)
         perf_config = config.get('performance_optimization', {})
-        self.min_connections = max(1, perf_config.get('llm_connection_pool_size', 15) // 3)
-        self.max_connections = perf_config.get('llm_connection_pool_size', 15)
+        pool_config = perf_config.get('llm_connection_pool', {})
+        pool_size = perf_config.get('llm_connection_pool_size') or pool_config.get('max_connections', 15)
+        self.min_connections = max(1, pool_config.get('min_connections', pool_size // 3))
+        self.max_connections = pool_size
         self.max_requests_per_connection = perf_config.get('max_requests_per_connection', 1000)
-        self.connection_timeout = perf_config.get('connection_timeout_seconds', 30)
-        self.health_check_interval = perf_config.get('health_check_interval_seconds', 60)
+        self.connection_timeout = perf_config.get('connection_timeout_seconds', pool_config.get('connection_timeout', 30))
+        self.health_check_interval = perf_config.get('health_check_interval_seconds', pool_config.get('health_check_interval', 60))
+        
+        # AIMD limit on in-flight requests, tuned per provider
+        adaptive_config = pool_config.get('adaptive_concurrency', {})
+        self.concurrency = None
+        if adaptive_config.get('enabled', True):
+            self.concurrency = AdaptiveConcurrencyLimiter.from_config(
+                f"llm:{provider}", adaptive_config, default_max=self.max_connections
+            )
         
         # Pool state
         self.available_connections: asyncio.Queue = asyncio.Queue(maxsize=self.max_connections)
@@ -161,27 +196,23 @@ class LLMConnectionPool:
         if not self.is_initialized:
             await self.initialize()
         
-        try:
-            # Try to get from available pool with timeout
-            connection = await asyncio.wait_for(
-                self.available_connections.get(),
-                timeout=self.connection_timeout
-            )
+        while True:
+            try:
+                connection = self.available_connections.get_nowait()
+            except asyncio.QueueEmpty:
+                # Pool is empty, create a new connection if under limit
+                self.metrics.pool_misses += 1
+                return await self._get_or_create_connection()
             
             # Check if connection is still healthy
             if not connection.is_healthy:
-                # Remove unhealthy connection and create new one
+                # Remove unhealthy connection and try the next one
                 await self._remove_connection(connection)
-                return await self._get_or_create_connection()
+                continue
             
             self.metrics.pool_hits += 1
             self.metrics.active_connections += 1
             return connection
-            
-        except asyncio.TimeoutError:
-            # Pool is empty, try to create new connection if under limit
-            self.metrics.pool_misses += 1
-            return await self._get_or_create_connection()
     
     async def _get_or_create_connection(self) -> LLMConnection:
         """Get connection or create new one if under limit"""
@@ -193,9 +224,12 @@ class LLMConnectionPool:
             logger.debug(f"Created new connection {connection_id} (pool size: {len(self.all_connections)})")
             return connection
         else:
-            # Wait for connection to become available
+            # Wait for connection to become available, but never indefinitely
             logger.warning("Connection pool at maximum capacity, waiting for available connection")
-            connection = await self.available_connections.get()
+            connection = await asyncio.wait_for(
+                self.available_connections.get(),
+                timeout=self.connection_timeout
+            )
             self.metrics.active_connections += 1
             return connection
     
@@ -238,9 +272,15 @@ class LLMConnectionPool:
         """Execute a request using a pooled connection"""
         start_time = time.time()
         connection = None
+        request_start = None
+        request_error = None
+        
+        if self.concurrency is not None:
+            await self.concurrency.acquire()
         
         try:
             connection = await self.get_connection()
+            request_start = time.time()
             response = await connection.execute_request(prompt, max_tokens)
             
             # Update metrics
@@ -254,12 +294,52 @@ class LLMConnectionPool:
             return response
             
         except Exception as e:
+            request_error = e
             self.metrics.error_count += 1
             logger.error(f"Request execution failed: {e}")
             raise
         finally:
             if connection:
                 await self.return_connection(connection)
+            if self.concurrency is not None:
+                # Queueing time is excluded so the reported latency is the provider's own
+                latency = time.time() - request_start if request_start else 0.0
+                await self.concurrency.release(latency, classify_outcome(request_error))
+    
+    async def stream_request(self, prompt: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """Stream a request through a pooled connection, held until the stream ends"""
+        start_time = time.time()
+        connection = None
+        request_start = None
+        request_error = None
+        
+        if self.concurrency is not None:
+            await self.concurrency.acquire()
+        
+        try:
+            connection = await self.get_connection()
+            request_start = time.time()
+            async for text in connection.stream_request(prompt, max_tokens):
+                yield text
+            
+            response_time = time.time() - start_time
+            self.metrics.total_requests += 1
+            self.metrics.avg_response_time = (
+                (self.metrics.avg_response_time * (self.metrics.total_requests - 1) + response_time) /
+                self.metrics.total_requests
+            )
+            
+        except Exception as e:
+            request_error = e
+            self.metrics.error_count += 1
+            logger.error(f"Streaming request failed: {e}")
+            raise
+        finally:
+            if connection:
+                await self.return_connection(connection)
+            if self.concurrency is not None:
+                latency = time.time() - request_start if request_start else 0.0
+                await self.concurrency.release(latency, classify_outcome(request_error))
     
     async def _health_monitor(self):
         """Background task to monitor connection health"""
@@ -304,7 +384,10 @@ class LLMConnectionPool:
                 self.metrics.error_count / self.metrics.total_requests
                 if self.metrics.total_requests > 0 else 0
             ),
-            'uptime_minutes': (datetime.now() - self.metrics.last_reset).total_seconds() / 60
+            'uptime_minutes': (datetime.now() - self.metrics.last_reset).total_seconds() / 60,
+            'concurrency_limit': self.concurrency.current_limit if self.concurrency else self.max_connections,
+            'queue_depth': self.concurrency.queue_depth if self.concurrency else 0,
+            'adaptive_concurrency': self.concurrency.get_stats() if self.concurrency else None
         }
     
     async def close(self):
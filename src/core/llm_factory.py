@@ -9,6 +9,16 @@ from langchain_openai import ChatOpenAI
 
 logger = logging.getLogger(__name__)
 
+def chunk_text(chunk: Any) -> str:
+    """Text of a streamed message chunk (content may be a string or a list of parts)"""
+    content = getattr(chunk, 'content', chunk)
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return ''.join(part if isinstance(part, str) else part.get('text', '') if isinstance(part, dict) else ''
+                       for part in content)
+    return str(content)
+
 class LLMFactory:
     """Factory for creating LLM instances based on provider"""
     
@@ -0,0 +1,322 @@
+"""
+Multi-Provider LLM Router
+Picks the provider for each request from live latency and error statistics
+and optionally hedges slow requests: when the chosen provider has not
+answered within its observed p95 latency, a duplicate is sent to the next
+best provider and whichever answers first wins; the other is cancelled.
+Hedges are capped to a fraction of traffic so tail-latency savings never
+double the bill. Streamed requests go to the best provider unhedged, since
+text already yielded cannot be switched to another provider.
+"""
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.core.adaptive_concurrency import is_overload_error
+
+logger = logging.getLogger(__name__)
+
+ProviderBackend = Callable[[str, Optional[int]], Awaitable[str]]
+StreamBackend = Callable[[str, Optional[int]], AsyncIterator[str]]
+
+
+class ProviderStats:
+    """Rolling latency / error statistics for one provider"""
+    
+    def __init__(self, window: int = 200, smoothing: float = 0.1):
+        self.latencies = deque(maxlen=window)
+        self.smoothing = smoothing
+        self.latency_ewma: Optional[float] = None
+        self.error_rate = 0.0
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.overloads = 0
+        self.cooldown_until = 0.0
+    
+    def record_success(self, latency: float):
+        self.requests += 1
+        self.latencies.append(latency)
+        self.latency_ewma = latency if self.latency_ewma is None else (
+            self.latency_ewma + self.smoothing * (latency - self.latency_ewma)
+        )
+        self.error_rate -= self.smoothing * self.error_rate
+    
+    def record_error(self, overloaded: bool, cooldown_seconds: float):
+        self.requests += 1
+        self.errors += 1
+        self.error_rate += self.smoothing * (1.0 - self.error_rate)
+        if overloaded:
+            self.overloads += 1
+            self.cooldown_until = time.monotonic() + cooldown_seconds
+    
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+        return ordered[index]
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'overloads': self.overloads,
+            'in_flight': self.in_flight,
+            'error_rate': round(self.error_rate, 3),
+            'latency_ewma': self.latency_ewma,
+            'latency_p50': self.percentile(0.5),
+            'latency_p95': self.percentile(0.95),
+            'cooling_down': self.cooldown_until > time.monotonic()
+        }
+
+
+class LLMRouter:
+    """Routes prompts across provider backends with optional hedged requests"""
+    
+    def __init__(self, backends: Dict[str, ProviderBackend], primary: Optional[str] = None,
+                 stream_backends: Optional[Dict[str, StreamBackend]] = None,
+                 hedging_enabled: bool = True, hedge_percentile: float = 0.95,
+                 hedge_min_delay_seconds: float = 2.0, hedge_min_samples: int = 20,
+                 max_hedge_ratio: float = 0.1, primary_bias: float = 0.8,
+                 error_penalty: float = 4.0, overload_cooldown_seconds: float = 30.0,
+                 explore_every: int = 0):
+        if not backends:
+            raise ValueError("LLMRouter needs at least one provider backend")
+        self.backends = backends
+        self.stream_backends = stream_backends or {}
+        self.primary = primary if primary in backends else next(iter(backends))
+        self.hedging_enabled = hedging_enabled
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay_seconds = hedge_min_delay_seconds
+        self.hedge_min_samples = hedge_min_samples
+        self.max_hedge_ratio = max_hedge_ratio
+        self.primary_bias = primary_bias
+        self.error_penalty = error_penalty
+        self.overload_cooldown_seconds = overload_cooldown_seconds
+        self.explore_every = explore_every
+        
+        self.stats: Dict[str, ProviderStats] = {name: ProviderStats() for name in backends}
+        self.metrics = {
+            'requests': 0,
+            'streams': 0,
+            'hedges_sent': 0,
+            'hedges_won': 0,
+            'hedges_skipped_budget': 0,
+            'cancelled_losers': 0,
+            'explorations': 0
+        }
+    
+    # ------------------------------------------------------------------ routing
+    
+    def _score(self, name: str, preferred: str) -> float:
+        """Expected cost of sending a request to ``name`` (lower is better)"""
+        stats = self.stats[name]
+        latency = stats.latency_ewma
+        if latency is None:
+            # Unmeasured providers are assumed as slow as the slowest measured one,
+            # so they only take traffic when the measured providers are failing
+            measured = [s.latency_ewma for s in self.stats.values() if s.latency_ewma is not None]
+            latency = max(measured, default=0.0)
+        score = latency * (1.0 + self.error_penalty * stats.error_rate) * (1.0 + 0.1 * stats.in_flight)
+        if stats.cooldown_until > time.monotonic():
+            score = score * 10 + 1e6
+        if name == preferred:
+            score *= self.primary_bias
+        return score
+    
+    def rank_providers(self, preferred: Optional[str] = None) -> List[str]:
+        preferred = preferred if preferred in self.backends else self.primary
+        return sorted(self.backends, key=lambda name: (self._score(name, preferred), name != preferred))
+    
+    def _hedge_delay(self, name: str) -> Optional[float]:
+        stats = self.stats[name]
+        if len(stats.latencies) < self.hedge_min_samples:
+            return None
+        return max(self.hedge_min_delay_seconds, stats.percentile(self.hedge_percentile))
+    
+    def _hedge_budget_available(self) -> bool:
+        return self.metrics['hedges_sent'] < self.max_hedge_ratio * max(1, self.metrics['requests'])
+    
+    # ---------------------------------------------------------------- execution
+    
+    async def _call(self, name: str, prompt: str, max_tokens: Optional[int]) -> Tuple[str, str]:
+        stats = self.stats[name]
+        stats.in_flight += 1
+        start = time.monotonic()
+        try:
+            response = await self.backends[name](prompt, max_tokens)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            stats.record_error(is_overload_error(e), self.overload_cooldown_seconds)
+            raise
+        finally:
+            stats.in_flight -= 1
+        stats.record_success(time.monotonic() - start)
+        return name, response
+    
+    async def generate(self, prompt: str, max_tokens: Optional[int] = None,
+                       preferred: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Send ``prompt`` to the best provider, hedging to the runner-up if it is
+        slow. Returns ``(provider, response)`` for the provider that answered.
+        """
+        self.metrics['requests'] += 1
+        ranked = self.rank_providers(preferred)
+        if self.explore_every and len(ranked) > 1 and self.metrics['requests'] % self.explore_every == 0:
+            # Periodically refresh the runner-up's stats so a provider that had a bad spell can win back traffic
+            ranked[0], ranked[1] = ranked[1], ranked[0]
+            self.metrics['explorations'] += 1
+        first = ranked[0]
+        
+        hedge_delay = self._hedge_delay(first) if self.hedging_enabled and len(ranked) > 1 else None
+        if hedge_delay is None:
+            return await self._call(first, prompt, max_tokens)
+        
+        tasks = {asyncio.ensure_future(self._call(first, prompt, max_tokens)): first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if not done:
+                if self._hedge_budget_available():
+                    hedge = ranked[1]
+                    self.metrics['hedges_sent'] += 1
+                    logger.debug(f"Hedging slow {first} request to {hedge} after {hedge_delay:.1f}s")
+                    tasks[asyncio.ensure_future(self._call(hedge, prompt, max_tokens))] = hedge
+                else:
+                    self.metrics['hedges_skipped_budget'] += 1
+            
+            # First successful answer wins; an error only counts once every attempt failed
+            last_error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+                    winner, response = task.result()
+                    if winner != first:
+                        self.metrics['hedges_won'] += 1
+                    return winner, response
+            raise last_error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                    self.metrics['cancelled_losers'] += 1
+    
+    def stream(self, prompt: str, max_tokens: Optional[int] = None,
+               preferred: Optional[str] = None) -> Tuple[str, AsyncIterator[str]]:
+        """Stream ``prompt`` from the best provider; returns ``(provider, chunks)``"""
+        name = self.rank_providers(preferred)[0]
+        if name not in self.stream_backends:
+            raise ValueError(f"LLM router: provider {name} has no streaming backend")
+        self.metrics['streams'] += 1
+        return name, self._stream_call(name, prompt, max_tokens)
+    
+    async def _stream_call(self, name: str, prompt: str, max_tokens: Optional[int]) -> AsyncIterator[str]:
+        stats = self.stats[name]
+        stats.in_flight += 1
+        start = time.monotonic()
+        try:
+            async for text in self.stream_backends[name](prompt, max_tokens):
+                yield text
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            stats.record_error(is_overload_error(e), self.overload_cooldown_seconds)
+            raise
+        finally:
+            stats.in_flight -= 1
+        stats.record_success(time.monotonic() - start)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'primary': self.primary,
+            'providers': {name: stats.as_dict() for name, stats in self.stats.items()},
+            **self.metrics
+        }
+
+
+def _build_backend(provider: str, config: Dict[str, Any]) -> Tuple[ProviderBackend, StreamBackend]:
+    """Request and streaming callables for a provider: its connection pool when pooling is on, else a direct client"""
+    from src.core.llm_factory import LLMFactory, chunk_text
+    
+    perf_config = config.get('performance_optimization', {})
+    if perf_config.get('llm_connection_pool_size', 0) > 0:
+        from src.core.llm_connection_pool import LLMConnectionPool
+        pool = LLMConnectionPool(provider, config)
+        # Construct one connection now so missing credentials surface here
+        LLMFactory.create_llm(provider, config)
+        return pool.execute_request, pool.stream_request
+    
+    llm = LLMFactory.create_llm(provider, config)
+    
+    async def invoke(prompt: str, max_tokens: Optional[int] = None) -> str:
+        response = await llm.ainvoke(prompt)
+        return response.content if hasattr(response, 'content') else str(response)
+    
+    async def stream(prompt: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        async for chunk in llm.astream(prompt):
+            text = chunk_text(chunk)
+            if text:
+                yield text
+    return invoke, stream
+
+
+_routers: Dict[Tuple[str, Tuple[str, ...]], Optional[LLMRouter]] = {}
+_routers_lock = threading.Lock()
+
+
+def get_shared_router(config: Dict[str, Any], primary: str) -> Optional[LLMRouter]:
+    """
+    Process-wide router for ``llm_settings.router``, or None when disabled or
+    fewer than two providers can be constructed (routing would be a no-op).
+    """
+    router_config = config.get('llm_settings', {}).get('router', {})
+    if not router_config.get('enabled', False):
+        return None
+    
+    providers = tuple(router_config.get('providers') or [primary])
+    if primary not in providers:
+        providers = (primary,) + providers
+    
+    key = (primary, providers)
+    with _routers_lock:
+        if key in _routers:
+            return _routers[key]
+        
+        backends: Dict[str, ProviderBackend] = {}
+        stream_backends: Dict[str, StreamBackend] = {}
+        for provider in providers:
+            try:
+                backends[provider], stream_backends[provider] = _build_backend(provider, config)
+            except Exception as e:
+                logger.warning(f"LLM router: provider {provider} unavailable: {e}")
+        
+        router = None
+        if len(backends) >= 2:
+            hedging = router_config.get('hedging', {})
+            router = LLMRouter(
+                backends,
+                primary=primary,
+                stream_backends=stream_backends,
+                hedging_enabled=hedging.get('enabled', True),
+                hedge_percentile=hedging.get('percentile', 0.95),
+                hedge_min_delay_seconds=hedging.get('min_delay_seconds', 2.0),
+                hedge_min_samples=hedging.get('min_samples', 20),
+                max_hedge_ratio=hedging.get('max_hedge_ratio', 0.1),
+                primary_bias=router_config.get('primary_bias', 0.8),
+                error_penalty=router_config.get('error_penalty', 4.0),
+                overload_cooldown_seconds=router_config.get('overload_cooldown_seconds', 30.0),
+                explore_every=router_config.get('explore_every', 0)
+            )
+            logger.info(f"LLM router active across {', '.join(backends)} (primary: {primary})")
+        _routers[key] = router
+        return router
@@ -0,0 +1,189 @@
+"""
+Near-Duplicate Text Index
+MinHash signatures over character shingles with LSH banding, so near-duplicate
+candidates are found in near-linear time and the exact (expensive) similarity
+is only computed for candidate pairs.
+"""
+
+import math
+import re
+import zlib
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+import numpy as np
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Pairs at a SequenceMatcher ratio of t have a 5-shingle Jaccard of at least
+# about t - 0.45 (1st percentile in word-substitution simulations)
+_JACCARD_MARGIN = 0.45
+_MAX_ROWS_PER_BAND = 8
+
+
+def sequence_similarity(a: str, b: str) -> float:
+    """Default exact similarity used to confirm LSH candidates"""
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def lsh_parameters(threshold: float, target_recall: float = 0.99,
+                   max_permutations: int = 128) -> Tuple[int, int]:
+    """
+    (bands, rows_per_band) under which pairs at ``threshold`` become
+    candidates with probability >= ``target_recall``, using the most rows per
+    band (fewest spurious candidates) that fits in ``max_permutations``.
+    """
+    jaccard_floor = min(0.99, max(0.05, threshold - _JACCARD_MARGIN))
+    for rows in range(_MAX_ROWS_PER_BAND, 0, -1):
+        # P(candidate) = 1 - (1 - J^r)^b
+        bands = math.ceil(math.log(1 - target_recall) / math.log(1 - jaccard_floor ** rows))
+        if bands * rows <= max_permutations:
+            return bands, rows
+    return max_permutations, 1
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH index of text keyed by caller-supplied keys.
+    
+    ``bands * rows_per_band`` MinHash permutations are computed per text; two
+    texts become candidates when any band of their signatures matches exactly.
+    Candidates are confirmed with ``similarity_fn`` against ``threshold``.
+    Unless given, the banding is derived from ``threshold`` (see
+    ``lsh_parameters``) so pairs at the threshold are not missed.
+    """
+    
+    def __init__(self, threshold: float = 0.85, bands: Optional[int] = None,
+                 rows_per_band: Optional[int] = None, shingle_size: int = 5, seed: int = 1,
+                 similarity_fn: Callable[[str, str], float] = sequence_similarity):
+        self.threshold = threshold
+        if bands is None or rows_per_band is None:
+            bands, rows_per_band = lsh_parameters(threshold)
+        self.bands = bands
+        self.rows_per_band = rows_per_band
+        self.num_perm = bands * rows_per_band
+        self.shingle_size = shingle_size
+        self.similarity_fn = similarity_fn
+        
+        rng = np.random.RandomState(seed)
+        self._perm_a = rng.randint(1, _MERSENNE_PRIME, size=(self.num_perm, 1)).astype(np.uint64)
+        self._perm_b = rng.randint(0, _MERSENNE_PRIME, size=(self.num_perm, 1)).astype(np.uint64)
+        
+        self._buckets: List[Dict[bytes, Set[Hashable]]] = [{} for _ in range(bands)]
+        self._entries: Dict[Hashable, Tuple[str, List[bytes]]] = {}
+        self._order: Dict[Hashable, int] = {}
+        self._counter = 0
+        
+        self.stats = {'candidate_pairs': 0, 'confirmed_duplicates': 0}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+    
+    @staticmethod
+    def normalize(text: str) -> str:
+        return _WHITESPACE_RE.sub(' ', (text or '').lower()).strip()
+    
+    def _shingle_hashes(self, normalized: str) -> np.ndarray:
+        k = self.shingle_size
+        if len(normalized) <= k:
+            shingles = {normalized}
+        else:
+            shingles = {normalized[i:i + k] for i in range(len(normalized) - k + 1)}
+        return np.fromiter(
+            (zlib.crc32(s.encode('utf-8')) % _MERSENNE_PRIME for s in shingles),
+            dtype=np.uint64, count=len(shingles)
+        )
+    
+    def _band_keys(self, normalized: str) -> List[bytes]:
+        hashes = self._shingle_hashes(normalized)
+        signature = ((self._perm_a * hashes + self._perm_b) % _MERSENNE_PRIME).min(axis=1)
+        signature = signature.astype(np.uint32)
+        r = self.rows_per_band
+        return [signature[band * r:(band + 1) * r].tobytes() for band in range(self.bands)]
+    
+    def _candidates(self, band_keys: List[bytes]) -> Set[Hashable]:
+        candidates: Set[Hashable] = set()
+        for band, band_key in enumerate(band_keys):
+            bucket = self._buckets[band].get(band_key)
+            if bucket:
+                candidates.update(bucket)
+        return candidates
+    
+    def query(self, text: str) -> List[Tuple[Hashable, float]]:
+        """Return (key, similarity) for indexed texts at or above the threshold, in insertion order"""
+        normalized = self.normalize(text)
+        matches = []
+        for key in self._candidates(self._band_keys(normalized)):
+            self.stats['candidate_pairs'] += 1
+            similarity = self.similarity_fn(normalized, self._entries[key][0])
+            if similarity >= self.threshold:
+                matches.append((key, similarity))
+        matches.sort(key=lambda match: self._order[match[0]])
+        if matches:
+            self.stats['confirmed_duplicates'] += 1
+        return matches
+    
+    def find_duplicate(self, text: str) -> Optional[Hashable]:
+        """Return the earliest indexed key that is a near-duplicate of ``text``, if any"""
+        matches = self.query(text)
+        return matches[0][0] if matches else None
+    
+    def add(self, key: Hashable, text: str):
+        """Index ``text`` under ``key`` (replacing any previous text for that key)"""
+        if key in self._entries:
+            self.remove(key)
+        normalized = self.normalize(text)
+        band_keys = self._band_keys(normalized)
+        for band, band_key in enumerate(band_keys):
+            self._buckets[band].setdefault(band_key, set()).add(key)
+        self._entries[key] = (normalized, band_keys)
+        self._order[key] = self._counter
+        self._counter += 1
+    
+    def remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        self._order.pop(key, None)
+        if entry is None:
+            return
+        for band, band_key in enumerate(entry[1]):
+            bucket = self._buckets[band].get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+
+
+def deduplicate_near_duplicates(items: List[Any], text_fn: Callable[[Any], str],
+                                score_fn: Optional[Callable[[Any], float]] = None,
+                                threshold: float = 0.85, **index_kwargs) -> Tuple[List[Any], int]:
+    """
+    Collapse near-duplicate items, keeping the higher-scoring one of each
+    duplicate pair (the earlier one when no ``score_fn`` is given).
+    Returns (unique_items, number_removed) preserving first-seen order.
+    """
+    index = NearDuplicateIndex(threshold=threshold, **index_kwargs)
+    kept: List[Any] = []
+    removed = 0
+    
+    for item in items:
+        text = text_fn(item) or ''
+        if not text.strip():
+            kept.append(item)
+            continue
+        
+        slot = index.find_duplicate(text)
+        if slot is None:
+            index.add(len(kept), text)
+            kept.append(item)
+            continue
+        
+        removed += 1
+        if score_fn is not None and score_fn(item) > score_fn(kept[slot]):
+            kept[slot] = item
+            index.add(slot, text)
+    
+    return kept, removed
@@ -1,16 +1,21 @@
 """
 Persistent LLM Cache System
-Implements Redis-based caching for LLM responses with TTL and memory management.
+Two-tier cache for LLM responses: a byte-bounded in-process LRU in front of a
+local SQLite store with compressed values and TTL, so reruns reuse earlier
+responses without Redis. Redis is consulted as an optional shared tier when
+the client library is installed and the server answers.
 """
 
 import asyncio
-import json
 import hashlib
 import logging
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
-import pickle
 import os
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
 
 try:
     import redis.asyncio as redis
@@ -20,8 +25,77 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_DISK_CACHE_DIR = os.path.join("cache", "llm_responses")
+
+
+class MemoryLRUCache:
+    """LRU of cached responses bounded by the bytes its entries occupy"""
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+    
+    @staticmethod
+    def _entry_size(key: str, value: str) -> int:
+        return sys.getsizeof(key) + sys.getsizeof(value)
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at, size = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.current_bytes -= size
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: str, expires_at: float):
+        size = self._entry_size(key, value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[2]
+            self._entries[key] = (value, expires_at, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+    
+    def remove_matching(self, pattern: Optional[str] = None):
+        with self._lock:
+            for key in [k for k in self._entries if pattern is None or pattern in k]:
+                self.current_bytes -= self._entries.pop(key)[2]
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_disk_stores: Dict[str, Any] = {}
+_disk_stores_lock = threading.Lock()
+
+
+def _get_disk_store(cache_dir: str):
+    """Process-wide SQLite store for ``cache_dir`` (shared by every cache instance)"""
+    from src.caching import ShardedKVStore
+    
+    key = os.path.abspath(cache_dir)
+    with _disk_stores_lock:
+        if key not in _disk_stores:
+            _disk_stores[key] = ShardedKVStore(directory=cache_dir, shard_count=4)
+        return _disk_stores[key]
+
+
 class PersistentLLMCache:
-    """Redis-based persistent cache for LLM responses"""
+    """Memory LRU + SQLite (+ optional Redis) cache for LLM responses"""
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
@@ -32,10 +106,23 @@ class PersistentLLMCache:
         self.max_memory_mb = perf_config.get('max_memory_cache_mb', 512)
         self.enable_compression = perf_config.get('enable_result_compression', True)
         
+        self.memory_cache = MemoryLRUCache(int(self.max_memory_mb * 1024 * 1024))
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'redis_hits': 0, 'misses': 0, 'writes': 0}
+        
+        # Local persistent tier
+        disk_config = perf_config.get('llm_disk_cache', {})
+        self.disk_store = None
+        if disk_config.get('enabled', True):
+            cache_dir = disk_config.get('cache_dir', DEFAULT_DISK_CACHE_DIR)
+            try:
+                self.disk_store = _get_disk_store(cache_dir)
+                logger.info(f"LLM response disk cache at {cache_dir}")
+            except Exception as e:
+                logger.warning(f"Could not open LLM disk cache at {cache_dir}: {e}. Using memory only.")
+        
         # Redis configuration
         redis_url = perf_config.get('redis_url', 'redis://localhost:6379/1')
         self.redis_client = None
-        self.fallback_cache = {}  # In-memory fallback
         
         # Initialize Redis if available
         if REDIS_AVAILABLE and perf_config.get('enable_persistent_cache', True):
@@ -43,123 +130,118 @@ class PersistentLLMCache:
                 self.redis_client = redis.from_url(redis_url, decode_responses=False)
                 logger.info(f"Initialized Redis cache at {redis_url}")
             except Exception as e:
-                logger.warning(f"Failed to initialize Redis: {e}. Using in-memory fallback.")
+                logger.warning(f"Failed to initialize Redis: {e}. Using local cache tiers.")
         else:
-            logger.info("Redis not available or disabled. Using in-memory cache.")
+            logger.info("Redis not available or disabled. Using local cache tiers.")
     
-    def _generate_cache_key(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+    def _generate_cache_key(self, prompt: str, max_tokens: Optional[int] = None, namespace: str = '') -> str:
         """Generate a consistent cache key for the prompt"""
-        cache_content = f"{prompt}_{max_tokens or 'default'}"
+        cache_content = f"{namespace}:{prompt}_{max_tokens or 'default'}"
         return f"llm_cache:{hashlib.sha256(cache_content.encode()).hexdigest()}"
     
     def _compress_data(self, data: str) -> bytes:
         """Compress data if compression is enabled"""
         if self.enable_compression:
-            import gzip
-            return gzip.compress(data.encode('utf-8'))
+            return zlib.compress(data.encode('utf-8'))
         return data.encode('utf-8')
     
     def _decompress_data(self, data: bytes) -> str:
         """Decompress data if compression was used"""
-        if self.enable_compression:
+        try:
+            return zlib.decompress(data).decode('utf-8')
+        except zlib.error:
+            pass
+        try:
+            # Entries written by earlier versions used gzip
             import gzip
-            try:
-                return gzip.decompress(data).decode('utf-8')
-            except:
-                # Fallback for uncompressed data
-                return data.decode('utf-8')
-        return data.decode('utf-8')
+            return gzip.decompress(data).decode('utf-8')
+        except OSError:
+            # Fallback for uncompressed data
+            return data.decode('utf-8')
     
-    async def get_cached_response(self, prompt: str, max_tokens: Optional[int] = None) -> Optional[str]:
+    def _disable_redis(self, error: Exception):
+        # An unreachable server should cost one failed call, not one per request
+        logger.warning(f"Redis cache unavailable ({error}); continuing with local cache tiers")
+        self.redis_client = None
+    
+    async def get_cached_response(self, prompt: str, max_tokens: Optional[int] = None,
+                                  namespace: str = '') -> Optional[str]:
         """Retrieve cached LLM response"""
-        cache_key = self._generate_cache_key(prompt, max_tokens)
+        cache_key = self._generate_cache_key(prompt, max_tokens, namespace)
+        
+        response = self.memory_cache.get(cache_key)
+        if response is not None:
+            self.stats['memory_hits'] += 1
+            return response
         
         try:
-            # Try Redis first
-            if self.redis_client:
-                cached_data = await self.redis_client.get(cache_key)
+            if self.disk_store is not None:
+                cached = await asyncio.to_thread(self.disk_store.get_many, [cache_key])
+                if cache_key in cached:
+                    response = self._decompress_data(cached[cache_key])
+                    self.stats['disk_hits'] += 1
+                    logger.debug(f"Disk cache hit for key: {cache_key[:16]}...")
+            
+            if response is None and self.redis_client:
+                try:
+                    cached_data = await self.redis_client.get(cache_key)
+                except Exception as e:
+                    self._disable_redis(e)
+                    cached_data = None
                 if cached_data:
                     response = self._decompress_data(cached_data)
+                    self.stats['redis_hits'] += 1
                     logger.debug(f"Redis cache hit for key: {cache_key[:16]}...")
-                    return response
-            
-            # Fallback to in-memory cache
-            if cache_key in self.fallback_cache:
-                cache_entry = self.fallback_cache[cache_key]
-                if cache_entry['expires'] > datetime.now():
-                    logger.debug(f"Memory cache hit for key: {cache_key[:16]}...")
-                    return cache_entry['data']
-                else:
-                    # Expired entry
-                    del self.fallback_cache[cache_key]
-            
-            return None
-            
         except Exception as e:
             logger.warning(f"Cache retrieval error: {e}")
+        
+        if response is None:
+            self.stats['misses'] += 1
             return None
+        
+        # Promote into the memory tier
+        self.memory_cache.set(cache_key, response, time.time() + self.ttl_seconds)
+        return response
     
-    async def cache_response(self, prompt: str, response: str, max_tokens: Optional[int] = None):
+    async def cache_response(self, prompt: str, response: str, max_tokens: Optional[int] = None,
+                             namespace: str = ''):
         """Cache LLM response with TTL"""
-        cache_key = self._generate_cache_key(prompt, max_tokens)
+        cache_key = self._generate_cache_key(prompt, max_tokens, namespace)
+        if self.memory_cache.get(cache_key) == response:
+            # Already stored by another caller sharing this cache
+            return
+        
+        self.memory_cache.set(cache_key, response, time.time() + self.ttl_seconds)
+        self.stats['writes'] += 1
         
         try:
-            # Cache in Redis
-            if self.redis_client:
-                compressed_data = self._compress_data(response)
-                await self.redis_client.setex(cache_key, self.ttl_seconds, compressed_data)
-                logger.debug(f"Cached response in Redis: {cache_key[:16]}...")
-            
-            # Also cache in memory as fallback
-            self.fallback_cache[cache_key] = {
-                'data': response,
-                'expires': datetime.now() + timedelta(seconds=self.ttl_seconds)
-            }
-            
-            # Manage memory cache size
-            await self._manage_memory_cache()
+            compressed_data = self._compress_data(response)
+            if self.disk_store is not None:
+                await asyncio.to_thread(self.disk_store.set_many, [(cache_key, compressed_data)], self.ttl_seconds)
             
+            if self.redis_client:
+                try:
+                    await self.redis_client.setex(cache_key, self.ttl_seconds, compressed_data)
+                    logger.debug(f"Cached response in Redis: {cache_key[:16]}...")
+                except Exception as e:
+                    self._disable_redis(e)
         except Exception as e:
             logger.warning(f"Cache storage error: {e}")
     
-    async def _manage_memory_cache(self):
-        """Manage in-memory cache size using LRU eviction"""
-        import sys
-        
-        # Estimate memory usage (rough approximation)
-        cache_size_mb = sys.getsizeof(self.fallback_cache) / (1024 * 1024)
-        
-        if cache_size_mb > self.max_memory_mb:
-            # Remove expired entries first
-            now = datetime.now()
-            expired_keys = [
-                key for key, entry in self.fallback_cache.items()
-                if entry['expires'] <= now
-            ]
-            
-            for key in expired_keys:
-                del self.fallback_cache[key]
-            
-            # If still over limit, remove oldest entries
-            if len(self.fallback_cache) > 1000:  # Arbitrary limit
-                # Sort by expiration time and remove oldest
-                sorted_items = sorted(
-                    self.fallback_cache.items(),
-                    key=lambda x: x[1]['expires']
-                )
-                
-                # Remove oldest 20%
-                remove_count = len(sorted_items) // 5
-                for key, _ in sorted_items[:remove_count]:
-                    del self.fallback_cache[key]
-    
     async def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache performance statistics"""
+        lookups = sum(self.stats[k] for k in ('memory_hits', 'disk_hits', 'redis_hits', 'misses'))
         stats = {
-            'memory_cache_size': len(self.fallback_cache),
+            'memory_cache_size': len(self.memory_cache),
+            'memory_cache_mb': round(self.memory_cache.current_bytes / (1024 * 1024), 2),
+            'memory_cache_limit_mb': self.max_memory_mb,
+            'memory_evictions': self.memory_cache.evictions,
+            'disk_cache_enabled': self.disk_store is not None,
             'redis_available': self.redis_client is not None,
             'compression_enabled': self.enable_compression,
-            'ttl_days': self.ttl_seconds / 86400
+            'ttl_days': self.ttl_seconds / 86400,
+            'hit_rate': (lookups - self.stats['misses']) / lookups if lookups else 0.0,
+            **self.stats
         }
         
         if self.redis_client:
@@ -183,23 +265,36 @@ class PersistentLLMCache:
                 else:
                     await self.redis_client.flushdb()
             
-            # Clear memory cache
-            if pattern:
-                keys_to_remove = [
-                    key for key in self.fallback_cache.keys()
-                    if pattern in key
-                ]
-                for key in keys_to_remove:
-                    del self.fallback_cache[key]
-            else:
-                self.fallback_cache.clear()
-                
-            logger.info(f"Cleared cache (pattern: {pattern or 'all'})")
+            if self.disk_store is not None:
+                await asyncio.to_thread(self.disk_store.delete_matching, pattern or '')
             
+            self.memory_cache.remove_matching(pattern)
+            logger.info(f"Cleared cache (pattern: {pattern or 'all'})")
+        
         except Exception as e:
             logger.warning(f"Cache clear error: {e}")
     
     async def close(self):
-        """Close Redis connection"""
+        """Close Redis connection (the disk store is process-wide and stays open)"""
         if self.redis_client:
-            await self.redis_client.close() 
\ No newline at end of file
+            await self.redis_client.close()
+
+
+_shared_caches: Dict[tuple, PersistentLLMCache] = {}
+_shared_caches_lock = threading.Lock()
+
+
+def get_shared_llm_cache(config: Dict[str, Any]) -> PersistentLLMCache:
+    """Process-wide cache so every generator and prompt processor shares one memory budget"""
+    perf_config = config.get('performance_optimization', {})
+    disk_config = perf_config.get('llm_disk_cache', {})
+    key = (
+        perf_config.get('max_memory_cache_mb', 512),
+        perf_config.get('cache_ttl_days', 7),
+        disk_config.get('enabled', True),
+        os.path.abspath(disk_config.get('cache_dir', DEFAULT_DISK_CACHE_DIR))
+    )
+    with _shared_caches_lock:
+        if key not in _shared_caches:
+            _shared_caches[key] = PersistentLLMCache(config)
+        return _shared_caches[key]
@@ -0,0 +1,155 @@
+"""
+Phase Dependency Scheduler
+Runs a workflow expressed as named phases with declared inputs. Each phase is
+started the moment every phase it depends on has finished, so independent
+branches overlap and total latency follows the critical path of the graph
+rather than the sum of its phases. Start/end times are recorded per phase.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A phase receives the results of the phases it depends on, keyed by name
+PhaseRunner = Callable[[Dict[str, Any]], Awaitable[Any]]
+PhaseCallback = Callable[[str], None]
+
+
+@dataclass
+class Phase:
+    """A node in the workflow graph"""
+    name: str
+    run: PhaseRunner
+    depends_on: Tuple[str, ...] = ()
+    # Store the exception as the phase result instead of failing the workflow
+    capture_errors: bool = False
+
+
+@dataclass
+class PhaseTiming:
+    """Wall-clock span of one phase"""
+    name: str
+    started_at: float
+    ended_at: Optional[float] = None
+    status: str = "running"
+    
+    @property
+    def duration(self) -> float:
+        return (self.ended_at or time.time()) - self.started_at
+    
+    def as_dict(self, origin: float) -> Dict[str, Any]:
+        ended_at = self.ended_at or time.time()
+        return {
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat(),
+            'ended_at': datetime.fromtimestamp(ended_at).isoformat(),
+            'start_offset_seconds': round(self.started_at - origin, 3),
+            'end_offset_seconds': round(ended_at - origin, 3),
+            'duration_seconds': round(ended_at - self.started_at, 3),
+            'status': self.status
+        }
+
+
+class PhaseScheduler:
+    """Dependency-driven async runner for a set of phases"""
+    
+    def __init__(self, on_phase_start: Optional[PhaseCallback] = None,
+                 on_phase_complete: Optional[Callable[[str, Any], None]] = None):
+        self.on_phase_start = on_phase_start
+        self.on_phase_complete = on_phase_complete
+        self.phases: Dict[str, Phase] = {}
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, PhaseTiming] = {}
+        self.started_at: Optional[float] = None
+        self.ended_at: Optional[float] = None
+    
+    @property
+    def phase_names(self) -> List[str]:
+        return list(self.phases)
+    
+    def add_phase(self, name: str, run: PhaseRunner, depends_on: Iterable[str] = (),
+                  capture_errors: bool = False) -> Phase:
+        """Register a phase; dependencies must already be registered"""
+        if name in self.phases:
+            raise ValueError(f"Phase '{name}' is already registered")
+        depends_on = tuple(depends_on)
+        missing = [dep for dep in depends_on if dep not in self.phases]
+        if missing:
+            raise ValueError(f"Phase '{name}' depends on unregistered phases: {missing}")
+        
+        # Registering dependencies first keeps the graph acyclic by construction
+        phase = Phase(name=name, run=run, depends_on=depends_on, capture_errors=capture_errors)
+        self.phases[name] = phase
+        return phase
+    
+    async def _run_phase(self, phase: Phase) -> Any:
+        inputs = {dep: self.results[dep] for dep in phase.depends_on}
+        timing = PhaseTiming(name=phase.name, started_at=time.time())
+        self.timings[phase.name] = timing
+        if self.on_phase_start:
+            self.on_phase_start(phase.name)
+        
+        try:
+            result = await phase.run(inputs)
+            timing.status = "completed"
+        except asyncio.CancelledError:
+            timing.status = "cancelled"
+            raise
+        except Exception as e:
+            timing.status = "failed"
+            if not phase.capture_errors:
+                raise
+            logger.warning(f"Phase {phase.name} failed: {e}")
+            result = e
+        finally:
+            timing.ended_at = time.time()
+        
+        return result
+    
+    async def run(self) -> Dict[str, Any]:
+        """
+        Execute every registered phase and return ``{name: result}``. A phase
+        that raises without ``capture_errors`` cancels the phases still running
+        and the exception propagates.
+        """
+        self.started_at = time.time()
+        pending = dict(self.phases)
+        running: Dict[asyncio.Task, str] = {}
+        
+        try:
+            while pending or running:
+                for name in [n for n, p in pending.items() if all(d in self.results for d in p.depends_on)]:
+                    phase = pending.pop(name)
+                    running[asyncio.ensure_future(self._run_phase(phase))] = name
+                
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    # Raises for phases that do not capture their errors
+                    self.results[name] = task.result()
+                    if self.on_phase_complete:
+                        self.on_phase_complete(name, self.results[name])
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            self.ended_at = time.time()
+        
+        return self.results
+    
+    def get_timing_metrics(self) -> Dict[str, Any]:
+        """Per-phase spans plus how much of the summed phase time overlapped"""
+        origin = self.started_at or time.time()
+        wall_time = (self.ended_at or time.time()) - origin
+        phase_time = sum(timing.duration for timing in self.timings.values())
+        return {
+            'phases': {name: timing.as_dict(origin) for name, timing in self.timings.items()},
+            'wall_time_seconds': round(wall_time, 3),
+            'sum_of_phase_seconds': round(phase_time, 3),
+            'parallel_speedup': round(phase_time / wall_time, 2) if wall_time > 0 else 1.0
+        }
@@ -0,0 +1,74 @@
+"""
+Token-Aware Prompt Packing
+Splits a list of items into as few LLM requests as fit a token budget. Each
+item is costed for both the prompt text it adds and the response text it is
+expected to produce, so a request is closed when either the context budget or
+the response budget would be exceeded rather than after a fixed item count.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+
+def estimate_tokens(text: str, chars_per_token: float = DEFAULT_CHARS_PER_TOKEN) -> int:
+    """Cheap token estimate; providers differ, so this only needs to be conservative"""
+    return int(math.ceil(len(text) / chars_per_token)) if text else 0
+
+
+@dataclass
+class PackedBatch:
+    """One request's worth of items with its estimated token usage"""
+    items: list
+    prompt_tokens: int
+    output_tokens: int
+
+
+class TokenBudgetPacker:
+    """
+    Incremental greedy packer. ``add`` returns the batch that had to be
+    closed to make room for the new item (if any); ``flush`` returns the
+    final partial batch. An item that alone exceeds a budget still gets a
+    batch of its own.
+    """
+    
+    def __init__(self, item_prompt_tokens: Callable[[Any], int], output_tokens_per_item: int,
+                 context_budget: int, output_budget: int, fixed_prompt_tokens: int = 0,
+                 fixed_output_tokens: int = 0, max_items: Optional[int] = None):
+        self.item_prompt_tokens = item_prompt_tokens
+        self.output_tokens_per_item = output_tokens_per_item
+        self.context_budget = context_budget
+        self.output_budget = output_budget
+        self.fixed_prompt_tokens = fixed_prompt_tokens
+        self.fixed_output_tokens = fixed_output_tokens
+        self.max_items = max_items
+        self._reset()
+    
+    def _reset(self):
+        self.items: list = []
+        self.prompt_tokens = self.fixed_prompt_tokens
+        self.output_tokens = self.fixed_output_tokens
+    
+    def _close(self) -> PackedBatch:
+        batch = PackedBatch(self.items, self.prompt_tokens, self.output_tokens)
+        self._reset()
+        return batch
+    
+    def add(self, item: Any) -> Optional[PackedBatch]:
+        cost = self.item_prompt_tokens(item)
+        full = (
+            self.prompt_tokens + cost > self.context_budget or
+            self.output_tokens + self.output_tokens_per_item > self.output_budget
+        )
+        closed = self._close() if self.items and full else None
+        self.items.append(item)
+        self.prompt_tokens += cost
+        self.output_tokens += self.output_tokens_per_item
+        if closed is None and self.max_items is not None and len(self.items) >= self.max_items:
+            return self._close()
+        return closed
+    
+    def flush(self) -> Optional[PackedBatch]:
+        return self._close() if self.items else None
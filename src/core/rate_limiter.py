@@ -0,0 +1,89 @@
+"""
+Async Token-Bucket Rate Limiter
+Shared limiter for external APIs: tokens refill continuously at a fixed rate
+and up to ``burst`` requests may start back-to-back.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+
+class AsyncTokenBucket:
+    """Token bucket usable from any coroutine in the process"""
+
+    def __init__(self, rate_per_second: float, burst: int = 1):
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+        self.rate_per_second = rate_per_second
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._state_lock = threading.Lock()
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: float, burst: int = 1) -> "AsyncTokenBucket":
+        return cls(requests_per_minute / 60.0, burst)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second)
+        self._updated_at = now
+
+    def _try_consume(self, tokens: float) -> float:
+        """Consume ``tokens`` if available; otherwise return the seconds to wait"""
+        with self._state_lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate_per_second
+
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until ``tokens`` are available and consume them"""
+        # A bucket shared process-wide may be awaited from more than one event loop
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+
+        # Waiters are served in FIFO order through the lock
+        async with self._lock:
+            while True:
+                wait_seconds = self._try_consume(tokens)
+                if wait_seconds <= 0:
+                    return
+                await asyncio.sleep(wait_seconds)
+
+    @property
+    def available_tokens(self) -> float:
+        with self._state_lock:
+            self._refill()
+            return self._tokens
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_shared_buckets: Dict[str, AsyncTokenBucket] = {}
+_shared_buckets_lock = threading.Lock()
+
+
+def get_shared_bucket(name: str, rate_per_second: float, burst: int = 1) -> AsyncTokenBucket:
+    """
+    Return the process-wide bucket registered under ``name``, creating it on
+    first use. Every caller limiting the same upstream quota should share one.
+    """
+    with _shared_buckets_lock:
+        bucket = _shared_buckets.get(name)
+        if bucket is None:
+            bucket = AsyncTokenBucket(rate_per_second, burst)
+            _shared_buckets[name] = bucket
+        return bucket
@@ -0,0 +1,145 @@
+"""
+Search Request Scheduler
+Runs search API queries under one global concurrency and rate budget, merges
+identical in-flight queries, and keeps results in the persistent cache so
+repeated validations never hit the API twice.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.caching import read_from_cache, write_to_cache
+from src.core.rate_limiter import AsyncTokenBucket
+
+logger = logging.getLogger(__name__)
+
+SearchFetcher = Callable[[str], Awaitable[Optional[List[Dict[str, Any]]]]]
+
+
+class SearchScheduler:
+    """Coalescing, rate-limited front end for a search fetch coroutine"""
+
+    def __init__(self, fetch_fn: SearchFetcher, max_concurrent: int = 5,
+                 requests_per_second: Optional[float] = None, burst: int = 1,
+                 cache_namespace: str = "search", cache_expiry_days: int = 7):
+        self.fetch_fn = fetch_fn
+        self.max_concurrent = max_concurrent
+        self.rate_limiter = AsyncTokenBucket(requests_per_second, burst) if requests_per_second else None
+        self.cache_namespace = cache_namespace
+        self.cache_expiry_days = cache_expiry_days
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._memory_cache: Dict[str, List[Dict[str, Any]]] = {}
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+
+        self.stats = {
+            'memory_hits': 0,
+            'persistent_hits': 0,
+            'coalesced': 0,
+            'api_calls': 0,
+            'cancelled_variants': 0
+        }
+
+    def _cache_key(self, query: str) -> list:
+        return [self.cache_namespace, query]
+
+    async def search(self, query: str) -> List[Dict[str, Any]]:
+        """Return results for ``query``, sharing any identical request already in flight"""
+        if query in self._memory_cache:
+            self.stats['memory_hits'] += 1
+            return self._memory_cache[query]
+
+        task = self._in_flight.get(query)
+        if task is None:
+            cached = read_from_cache(self._cache_key(query), self.cache_expiry_days)
+            if cached is not None:
+                self.stats['persistent_hits'] += 1
+                self._memory_cache[query] = cached
+                return cached
+
+            task = asyncio.ensure_future(self._fetch(query))
+            self._in_flight[query] = task
+            task.add_done_callback(lambda _t, q=query: self._in_flight.pop(q, None))
+        else:
+            self.stats['coalesced'] += 1
+
+        self._waiters[query] = self._waiters.get(query, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # Only abandon the shared request once nobody is waiting for it
+            if self._waiters.get(query, 0) <= 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            remaining = self._waiters.get(query, 1) - 1
+            if remaining > 0:
+                self._waiters[query] = remaining
+            else:
+                self._waiters.pop(query, None)
+
+    async def _fetch(self, query: str) -> List[Dict[str, Any]]:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        async with self._semaphore:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            self.stats['api_calls'] += 1
+            results = await self.fetch_fn(query)
+
+        # None signals a failed request that must not be cached
+        if results is None:
+            return []
+
+        self._memory_cache[query] = results
+        write_to_cache(self._cache_key(query), results, self.cache_expiry_days)
+        return results
+
+    async def first_with_results(self, queries: List[str], lookahead: int = 2) -> List[Dict[str, Any]]:
+        """
+        Try query variants in priority order, keeping up to ``lookahead`` of them
+        in flight. Returns the results of the highest-priority variant that has
+        any, cancelling the variants that are no longer needed.
+        """
+        if not queries:
+            return []
+
+        tasks: Dict[int, asyncio.Task] = {}
+        outcomes: Dict[int, List[Dict[str, Any]]] = {}
+        next_index = 0
+
+        def launch_more():
+            nonlocal next_index
+            while next_index < len(queries) and len(tasks) < max(1, lookahead):
+                tasks[next_index] = asyncio.ensure_future(self.search(queries[next_index]))
+                next_index += 1
+
+        launch_more()
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_COMPLETED)
+                for index in [i for i, t in tasks.items() if t in done]:
+                    task = tasks.pop(index)
+                    try:
+                        outcomes[index] = task.result()
+                    except Exception as e:
+                        logger.debug(f"Search variant failed for '{queries[index]}': {e}")
+                        outcomes[index] = []
+
+                # Accept the best variant once every higher-priority one has come back empty
+                for index in range(len(queries)):
+                    if index not in outcomes:
+                        break
+                    if outcomes[index]:
+                        return outcomes[index]
+
+                launch_more()
+            return []
+        finally:
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
+                    self.stats['cancelled_variants'] += 1
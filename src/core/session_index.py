@@ -0,0 +1,409 @@
+"""
+Session Output Index
+Persistent SQLite index of per-destination files under ``outputs/session_*``
+(destination, data type, path, mtime, size, quality score), so session
+discovery is an indexed query instead of a rescan that parses every JSON file.
+Writers record files as they save them; anything changed outside the pipeline
+is picked up by a directory/file mtime refresh that only re-reads changed files.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.json_fields import read_json_fields, read_sidecar, write_sidecar
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = ".session_index.sqlite"
+
+# Suffix -> data type, longest first so "_nuances_evidence" wins over "_evidence"
+_JSON_SUFFIXES = [
+    ("_nuances_evidence.json", "nuances_evidence"),
+    ("_enhanced.json", "themes"),
+    ("_nuances.json", "nuances"),
+    ("_evidence.json", "evidence"),
+]
+_SCORED_TYPES = {"themes", "nuances"}
+
+
+def quality_score_from_data(data: Any) -> float:
+    """Quality score of a loaded enhanced/nuance document"""
+    if not isinstance(data, dict):
+        return 0.0
+    quality_score = (
+        data.get('quality_score') or
+        (data.get('processing_metadata') or {}).get('quality_score') or
+        0.0
+    )
+    return float(quality_score)
+
+
+def build_file_metadata(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Small summary of a session document for its .meta.json sidecar"""
+    affinities = data.get('affinities')
+    return {
+        'destination_id': data.get('destination_id'),
+        'destination_name': data.get('destination_name') or data.get('destination'),
+        'quality_score': quality_score_from_data(data),
+        'overall_score': (data.get('quality_assessment') or {}).get('overall_score'),
+        'theme_count': len(affinities) if isinstance(affinities, list) else 0,
+        'hidden_gems_count': (data.get('intelligence_insights') or {}).get('hidden_gems_count', 0),
+        'evidence_file_reference': data.get('evidence_file_reference')
+    }
+
+
+def extract_quality_score(file_path: Path) -> float:
+    """Read the quality score from an enhanced/nuance JSON file"""
+    try:
+        metadata = read_sidecar(file_path)
+        if metadata is not None and 'quality_score' in metadata:
+            return float(metadata['quality_score'] or 0.0)
+        # Only the two top-level fields are decoded, never the evidence payload
+        return quality_score_from_data(read_json_fields(file_path, ['quality_score', 'processing_metadata']))
+    except Exception as e:
+        logger.warning(f"Failed to extract quality score from {file_path}: {e}")
+        return 0.0
+
+
+def classify_json_file(filename: str) -> Optional[Tuple[str, str]]:
+    """Return (destination key, data type) for a session JSON filename"""
+    for suffix, data_type in _JSON_SUFFIXES:
+        if filename.endswith(suffix):
+            return filename[:-len(suffix)], data_type
+    return None
+
+
+class SessionIndex:
+    """SQLite-backed index of destination files across session directories"""
+    
+    def __init__(self, outputs_dir: Path, refresh_interval_seconds: float = 30.0):
+        self.outputs_dir = Path(outputs_dir)
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+        
+        self.outputs_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.outputs_dir / INDEX_FILENAME
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                session_id TEXT PRIMARY KEY,
+                ctime REAL NOT NULL,
+                json_mtime REAL,
+                images_mtime REAL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                session_id TEXT NOT NULL,
+                rel_path TEXT NOT NULL,
+                dest_key TEXT NOT NULL,
+                data_type TEXT NOT NULL,
+                mtime REAL NOT NULL,
+                size INTEGER NOT NULL,
+                quality_score REAL,
+                PRIMARY KEY (session_id, rel_path)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS files_by_destination ON files (dest_key, data_type)")
+        self._conn.commit()
+        
+        self.stats = {'refreshes': 0, 'files_parsed': 0, 'files_recorded': 0}
+    
+    # ------------------------------------------------------------------ writers
+    
+    def record_file(self, file_path: Path, data: Any = None) -> bool:
+        """
+        Record a session JSON file just written by the pipeline. ``data`` is the
+        document that was saved, so the quality score is taken without re-reading.
+        Returns False when the path is not a session file under this index.
+        """
+        file_path = Path(file_path)
+        session_dir = file_path.parent.parent
+        if file_path.parent.name != "json" or not session_dir.name.startswith("session_"):
+            return False
+        if session_dir.parent.resolve() != self.outputs_dir.resolve():
+            return False
+        
+        classified = classify_json_file(file_path.name)
+        if classified is None:
+            return False
+        dest_key, data_type = classified
+        
+        st = file_path.stat()
+        quality_score = None
+        if data_type in _SCORED_TYPES:
+            quality_score = quality_score_from_data(data) if data is not None else extract_quality_score(file_path)
+        
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO sessions (session_id, ctime) VALUES (?, ?)",
+                (session_dir.name, session_dir.stat().st_ctime)
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (session_dir.name, f"json/{file_path.name}", dest_key, data_type,
+                 st.st_mtime, st.st_size, quality_score)
+            )
+            self._conn.commit()
+            self.stats['files_recorded'] += 1
+        return True
+    
+    # ------------------------------------------------------------------ refresh
+    
+    def refresh(self, force: bool = False, deep: bool = False):
+        """
+        Bring the index in line with the filesystem. Session directories whose
+        ``json``/``images`` directory mtimes are unchanged are skipped unless
+        ``deep`` is set; files whose mtime and size are unchanged are never re-read.
+        Throttled to once per ``refresh_interval_seconds`` unless ``force``.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not (force or deep) and now - self._last_refresh < self.refresh_interval_seconds:
+                return
+            self._last_refresh = now
+            
+            known = {
+                row[0]: row[1:]
+                for row in self._conn.execute("SELECT session_id, json_mtime, images_mtime FROM sessions")
+            }
+            present = set()
+            
+            if self.outputs_dir.exists():
+                for entry in os.scandir(self.outputs_dir):
+                    if not entry.name.startswith("session_") or not entry.is_dir():
+                        continue
+                    present.add(entry.name)
+                    self._refresh_session(Path(entry.path), known.get(entry.name), deep)
+            
+            for session_id in set(known) - present:
+                self._conn.execute("DELETE FROM files WHERE session_id = ?", (session_id,))
+                self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            
+            self._conn.commit()
+            self.stats['refreshes'] += 1
+    
+    @staticmethod
+    def _mtime(path: Path) -> Optional[float]:
+        try:
+            return path.stat().st_mtime
+        except OSError:
+            return None
+    
+    def _refresh_session(self, session_dir: Path, known: Optional[tuple], deep: bool):
+        session_id = session_dir.name
+        json_mtime = self._mtime(session_dir / "json")
+        images_mtime = self._mtime(session_dir / "images")
+        
+        if known is None:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, ctime) VALUES (?, ?)",
+                (session_id, session_dir.stat().st_ctime)
+            )
+            known = (None, None)
+        
+        if deep or json_mtime != known[0]:
+            self._scan_json_dir(session_id, session_dir / "json")
+        
+        # Adding an image only touches its destination sub-directory
+        images_changed = deep or images_mtime != known[1]
+        if not images_changed and images_mtime is not None:
+            for rel_path, mtime in self._conn.execute(
+                "SELECT rel_path, mtime FROM files WHERE session_id = ? AND data_type = 'images'", (session_id,)
+            ).fetchall():
+                if self._mtime(session_dir / rel_path) != mtime:
+                    images_changed = True
+                    break
+        if images_changed:
+            self._scan_images_dir(session_id, session_dir / "images")
+        
+        self._conn.execute(
+            "UPDATE sessions SET json_mtime = ?, images_mtime = ? WHERE session_id = ?",
+            (json_mtime, images_mtime, session_id)
+        )
+    
+    def _indexed_files(self, session_id: str, data_types: List[str]) -> Dict[str, tuple]:
+        placeholders = ",".join("?" * len(data_types))
+        return {
+            row[0]: row[1:]
+            for row in self._conn.execute(
+                f"SELECT rel_path, mtime, size FROM files WHERE session_id = ? AND data_type IN ({placeholders})",
+                (session_id, *data_types)
+            )
+        }
+    
+    def _scan_json_dir(self, session_id: str, json_dir: Path):
+        indexed = self._indexed_files(session_id, [data_type for _, data_type in _JSON_SUFFIXES])
+        seen = set()
+        
+        if json_dir.is_dir():
+            for entry in os.scandir(json_dir):
+                classified = classify_json_file(entry.name)
+                if classified is None or not entry.is_file():
+                    continue
+                rel_path = f"json/{entry.name}"
+                seen.add(rel_path)
+                st = entry.stat()
+                if indexed.get(rel_path) == (st.st_mtime, st.st_size):
+                    continue
+                
+                dest_key, data_type = classified
+                quality_score = None
+                if data_type in _SCORED_TYPES:
+                    quality_score = extract_quality_score(Path(entry.path))
+                    self.stats['files_parsed'] += 1
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (session_id, rel_path, dest_key, data_type, st.st_mtime, st.st_size, quality_score)
+                )
+        
+        for rel_path in set(indexed) - seen:
+            self._conn.execute("DELETE FROM files WHERE session_id = ? AND rel_path = ?", (session_id, rel_path))
+    
+    def _scan_images_dir(self, session_id: str, images_dir: Path):
+        self._conn.execute("DELETE FROM files WHERE session_id = ? AND data_type = 'images'", (session_id,))
+        if not images_dir.is_dir():
+            return
+        
+        for entry in os.scandir(images_dir):
+            if not entry.is_dir():
+                continue
+            with os.scandir(entry.path) as images:
+                jpg_count = sum(1 for image in images if image.name.endswith(".jpg"))
+            if jpg_count:
+                st = entry.stat()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, 'images', ?, ?, 1.0)",
+                    (session_id, f"images/{entry.name}", entry.name, st.st_mtime, jpg_count)
+                )
+    
+    # ------------------------------------------------------------------ queries
+    
+    def sessions_for_destination(self, dest_key: str, images_key: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Sessions holding themes, nuances or images for a destination, newest
+        first, as dicts with ``session_id``, ``session_path``, ``creation_date``
+        (ctime) and ``quality_scores`` (data type -> score).
+        """
+        images_key = images_key or dest_key
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT f.session_id, s.ctime, f.rel_path, f.data_type, f.mtime, f.size, f.quality_score
+                FROM files f JOIN sessions s ON s.session_id = f.session_id
+                WHERE (f.dest_key = ? AND f.data_type IN ('themes', 'nuances'))
+                   OR (f.dest_key = ? AND f.data_type = 'images')
+            """, (dest_key, images_key)).fetchall()
+            
+            sessions: Dict[str, Dict[str, Any]] = {}
+            for session_id, ctime, rel_path, data_type, mtime, size, quality_score in rows:
+                path = self.outputs_dir / session_id / rel_path
+                # Cheap per-hit validation catches in-place rewrites between refreshes
+                if data_type != 'images':
+                    try:
+                        st = path.stat()
+                    except OSError:
+                        self._conn.execute("DELETE FROM files WHERE session_id = ? AND rel_path = ?",
+                                           (session_id, rel_path))
+                        continue
+                    if (st.st_mtime, st.st_size) != (mtime, size):
+                        quality_score = extract_quality_score(path)
+                        self.stats['files_parsed'] += 1
+                        self._conn.execute(
+                            "UPDATE files SET mtime = ?, size = ?, quality_score = ? WHERE session_id = ? AND rel_path = ?",
+                            (st.st_mtime, st.st_size, quality_score, session_id, rel_path)
+                        )
+                
+                session = sessions.setdefault(session_id, {
+                    'session_id': session_id,
+                    'session_path': str(self.outputs_dir / session_id),
+                    'creation_date': ctime,
+                    'quality_scores': {}
+                })
+                session['quality_scores'][data_type] = quality_score or 0.0
+            self._conn.commit()
+        
+        return sorted(sessions.values(), key=lambda s: s['creation_date'], reverse=True)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'sessions': self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0],
+                'files': self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0],
+                **self.stats
+            }
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_indexes: Dict[str, SessionIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_session_index(outputs_dir: Path = Path("outputs"),
+                      config: Optional[Dict[str, Any]] = None) -> Optional[SessionIndex]:
+    """
+    Return the process-wide index for ``outputs_dir``, or None when it is
+    disabled in ``session_management.session_index``.
+    """
+    index_config = (config or {}).get('session_management', {}).get('session_index', {})
+    if not index_config.get('enabled', True):
+        return None
+    
+    key = os.path.abspath(outputs_dir)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            try:
+                index = SessionIndex(
+                    Path(outputs_dir),
+                    refresh_interval_seconds=index_config.get('refresh_interval_seconds', 30)
+                )
+            except Exception as e:
+                logger.warning(f"Could not open session index in {outputs_dir}: {e}")
+                return None
+            _indexes[key] = index
+        return index
+
+
+def record_session_file(file_path, data: Any = None, config: Optional[Dict[str, Any]] = None):
+    """Record a freshly written ``outputs/session_*/json/*.json`` file; never raises"""
+    file_path = Path(file_path)
+    if file_path.parent.name != "json" or not file_path.parent.parent.name.startswith("session_"):
+        return
+    try:
+        index = get_session_index(file_path.parent.parent.parent, config)
+        if index is not None:
+            index.record_file(file_path, data)
+    except Exception as e:
+        logger.debug(f"Session index update skipped for {file_path}: {e}")
+
+
+def write_session_json(file_path, data: Any, config: Optional[Dict[str, Any]] = None, **dump_kwargs) -> Path:
+    """
+    Write a session JSON document (``json.dump`` keyword arguments pass
+    through) and its .meta.json sidecar, so metadata scans never parse the
+    full file, then record it in the session index. Every pipeline writer of
+    session files goes through here.
+    """
+    file_path = Path(file_path)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, **dump_kwargs)
+    
+    if isinstance(data, dict):
+        try:
+            write_sidecar(file_path, build_file_metadata(data))
+        except Exception as e:
+            logger.warning(f"Could not write metadata sidecar for {file_path}: {e}")
+    record_session_file(file_path, data, config)
+    return file_path
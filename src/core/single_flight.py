@@ -0,0 +1,62 @@
+"""
+Single-Flight Request Coalescing
+Concurrent callers asking for the same key share one in-flight call instead
+of each issuing their own: the first caller starts the work, later callers
+await the same task until it finishes. The entry is dropped on completion,
+so this coalesces only overlapping calls and never serves stale results.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """In-flight call table keyed by request identity, one per event loop"""
+    
+    def __init__(self):
+        # Tasks belong to a loop, so each loop gets its own table
+        self._tables: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+    
+    def _table(self) -> Dict[Hashable, asyncio.Task]:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            table = self._tables.get(loop)
+            if table is None:
+                table = self._tables[loop] = {}
+            return table
+    
+    def start(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Tuple[asyncio.Task, bool]:
+        """
+        Return ``(task, shared)`` for the in-flight call under ``key``,
+        starting ``call`` if there is none. For callers that consume the
+        leader's progress before the result; await the task with
+        ``asyncio.shield`` so cancelling one caller leaves it running.
+        """
+        table = self._table()
+        task = table.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(call())
+            table[key] = task
+            task.add_done_callback(lambda done: table.pop(key) if table.get(key) is done else None)
+        return task, shared
+    
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Return ``(result, shared)`` where ``shared`` is True when the result
+        came from a call another caller had already started. Cancelling one
+        caller does not cancel the shared call for the others.
+        """
+        task, shared = self.start(key, call)
+        return await asyncio.shield(task), shared
+    
+    def in_flight(self) -> int:
+        try:
+            return len(self._table())
+        except RuntimeError:
+            return 0
@@ -2,8 +2,6 @@ import asyncio
 import aiohttp
 import logging
 from typing import Dict, List, Optional, Any
-from retry import retry
-from bs4 import BeautifulSoup
 from tqdm import tqdm # For synchronous loops
 from tqdm.asyncio import tqdm as asyncio_tqdm # For asyncio.gather
 import backoff
@@ -18,6 +16,8 @@ from nltk import sent_tokenize
 import os
 
 # Adjusted import path for caching module
+from src.core.html_extraction import extract_page_async
+from src.core.http_client import get_http_client
 from src.caching import read_from_cache, write_to_cache, PAGE_CONTENT_CACHE_EXPIRY_DAYS, BRAVE_SEARCH_CACHE_EXPIRY_DAYS
 
 class WebDiscoveryLogic:
@@ -41,13 +41,12 @@ class WebDiscoveryLogic:
         self._load_external_configs()
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        # Shared keep-alive client; it outlives this context and is not closed here
+        self.http = get_http_client(self.config)
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.session.close()
+        pass
 
     def _load_external_configs(self):
         """Loads JSON configs for domains and keywords."""
@@ -67,7 +66,6 @@ class WebDiscoveryLogic:
             self.authority_domains = {}
             self.tourist_gateway_keywords = {}
 
-    @retry(tries=3, delay=2, backoff=2, jitter=(1,3))
     async def _fetch_brave_search(self, query: str) -> List[Dict]:
         """Performs a single Brave search query with caching."""
         cache_key = ["brave_search", query]
@@ -81,7 +79,7 @@ class WebDiscoveryLogic:
         headers = {"X-Subscription-Token": self.api_key, "Accept": "application/json"}
         params = {"q": query, **self.search_params}
         
-        async with self.session.get(search_url, headers=headers, params=params, timeout=20) as resp:
+        async with self.http.get(search_url, headers=headers, params=params, timeout=20) as resp:
             resp.raise_for_status()
             data = await resp.json()
             results = data.get("web", {}).get("results", [])
@@ -90,10 +88,9 @@ class WebDiscoveryLogic:
                 "url": r.get("url"), "title": r.get("title"), "description": r.get("description")
             } for r in results]
             
-            write_to_cache(cache_key, formatted_results)
+            write_to_cache(cache_key, formatted_results, BRAVE_SEARCH_CACHE_EXPIRY_DAYS)
             return formatted_results
 
-    @retry(tries=3, delay=2, backoff=2)
     async def _fetch_page_content(self, url: str, destination_name: Optional[str] = None) -> Optional[str]:
         """Fetches page content using aiohttp, with robust error handling and timeout."""
         cache_key = ["raw_html_content", url]
@@ -104,25 +101,21 @@ class WebDiscoveryLogic:
 
         self.logger.info(f"CACHE MISS: Fetching live content for {url}")
         try:
-            async with self.session.get(url, timeout=30) as resp:
+            async with self.http.get(url, timeout=30) as resp:
                 if resp.status != 200:
                     self.logger.warning(f"Failed to fetch {url}. Status: {resp.status}")
                     return None
                 html = await resp.text()
-                
-                # Basic parsing with BeautifulSoup
-                soup = BeautifulSoup(html, "html.parser")
-                for element in self.noisy_elements:
-                    for s in soup.select(element):
-                        s.decompose()
-                
-                text_content = soup.get_text(separator=' ', strip=True)
-                if len(text_content) > self.min_content_length:
-                    write_to_cache(cache_key, text_content)
-                    return text_content
-                else:
-                    self.logger.info(f"Content for {url} too short after cleaning ({len(text_content)} chars). Discarding.")
-                    return None
+            
+            # Parse off the event loop so other fetches keep streaming
+            page = await extract_page_async(html, self.noisy_elements, self.config)
+            text_content = page.text
+            if len(text_content) > self.min_content_length:
+                write_to_cache(cache_key, text_content, PAGE_CONTENT_CACHE_EXPIRY_DAYS)
+                return text_content
+            else:
+                self.logger.info(f"Content for {url} too short after cleaning ({len(text_content)} chars). Discarding.")
+                return None
         except Exception as e:
             self.logger.error(f"Error fetching or parsing {url}: {e}", exc_info=True)
             return None
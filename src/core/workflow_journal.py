@@ -0,0 +1,166 @@
+"""
+Workflow Checkpoint Journal
+Append-only log of completed workflow phases and finished destinations for
+an agent session. Every record is flushed and fsynced as it is written, so a
+batch run that dies part-way can be resumed from the same session directory,
+re-running only destinations and phases that had not completed.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import pickle
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Set, Union
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILENAME = "workflow_journal.jsonl"
+CHECKPOINT_DIRNAME = "checkpoints"
+
+
+class WorkflowJournal:
+    """
+    Durable per-session checkpoint log.
+    
+    Each line is a JSON record (``batch``, ``phase`` or ``workflow``). Phase
+    records carry the pickled phase result, so restored results keep the
+    dataclass types the orchestrator integrates; ``workflow`` records are
+    completion markers only. Just the byte offset of each checkpoint is kept
+    in memory and payloads are read back from disk when a destination is
+    resumed. Later records for the same destination and phase supersede
+    earlier ones. Writes run on a worker thread so pickling and fsync never
+    block the event loop.
+    """
+    
+    def __init__(self, session_dir: Union[str, Path]):
+        self.session_dir = Path(session_dir)
+        self.journal_file = self.session_dir / CHECKPOINT_DIRNAME / JOURNAL_FILENAME
+        self._lock = threading.Lock()
+        
+        self._phase_offsets: Dict[str, Dict[str, int]] = {}
+        self._completed: Set[str] = set()
+        self.destinations: List[str] = []
+        self.stats = {'records_loaded': 0, 'records_written': 0, 'unserializable': 0}
+        
+        self._load()
+    
+    @staticmethod
+    def destination_key(destination: str) -> str:
+        return (destination or '').strip().lower()
+    
+    def _load(self):
+        if not self.journal_file.exists():
+            return
+        
+        with open(self.journal_file, 'rb') as f:
+            offset = 0
+            for line in f:
+                line_offset, offset = offset, offset + len(line)
+                try:
+                    record = json.loads(line)
+                except Exception:
+                    # Torn trailing write from the interrupted run
+                    continue
+                
+                record_type = record.get('type')
+                key = self.destination_key(record.get('destination', ''))
+                if record_type == 'batch':
+                    self.destinations = record.get('destinations', [])
+                elif record_type == 'phase' and 'payload' in record:
+                    self._phase_offsets.setdefault(key, {})[record['phase']] = line_offset
+                elif record_type == 'workflow':
+                    self._completed.add(key)
+                self.stats['records_loaded'] += 1
+        
+        if self.stats['records_loaded']:
+            logger.info(f"Loaded workflow journal {self.journal_file}: "
+                        f"{len(self._completed)} destinations complete, "
+                        f"{sum(len(p) for p in self._phase_offsets.values())} phase checkpoints")
+    
+    def _append(self, record: Dict[str, Any], payload: Any = None) -> int:
+        """Write one record; returns its byte offset, or -1 if the payload cannot be pickled"""
+        if payload is not None:
+            try:
+                record['payload'] = base64.b64encode(
+                    pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+                ).decode('ascii')
+            except Exception as e:
+                # Not fatal: the phase simply runs again on resume
+                logger.debug(f"Could not checkpoint {record.get('type')} for {record.get('destination')}: {e}")
+                with self._lock:
+                    self.stats['unserializable'] += 1
+                return -1
+        record['recorded_at'] = datetime.now().isoformat()
+        line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+        
+        with self._lock:
+            self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.journal_file, 'ab') as f:
+                offset = f.tell()
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self.stats['records_written'] += 1
+        return offset
+    
+    def _read_payloads(self, offsets: Dict[str, int]) -> Dict[str, Any]:
+        payloads = {}
+        with self._lock, open(self.journal_file, 'rb') as f:
+            for phase, offset in offsets.items():
+                f.seek(offset)
+                try:
+                    record = json.loads(f.readline())
+                    payloads[phase] = pickle.loads(base64.b64decode(record['payload']))
+                except Exception as e:
+                    # The phase simply runs again
+                    logger.debug(f"Could not restore checkpoint {phase} at offset {offset}: {e}")
+        return payloads
+    
+    async def record_batch(self, destinations: List[str]):
+        """Record the destination list a run was started with"""
+        self.destinations = list(destinations)
+        await asyncio.to_thread(self._append, {'type': 'batch', 'destinations': self.destinations})
+    
+    async def record_phase(self, destination: str, phase: str, result: Any):
+        """Checkpoint a completed phase result"""
+        offset = await asyncio.to_thread(
+            self._append, {'type': 'phase', 'destination': destination, 'phase': phase}, result
+        )
+        if offset >= 0:
+            self._phase_offsets.setdefault(self.destination_key(destination), {})[phase] = offset
+    
+    async def record_workflow(self, destination: str, workflow_id: str):
+        """Mark a destination as finished; its result is rebuilt from the phase checkpoints"""
+        await asyncio.to_thread(
+            self._append, {'type': 'workflow', 'destination': destination, 'workflow_id': workflow_id}
+        )
+        self._completed.add(self.destination_key(destination))
+    
+    async def completed_phases(self, destination: str) -> Dict[str, Any]:
+        """Load the checkpointed phase results of ``destination`` from disk"""
+        offsets = dict(self._phase_offsets.get(self.destination_key(destination), {}))
+        if not offsets:
+            return {}
+        return await asyncio.to_thread(self._read_payloads, offsets)
+    
+    def is_complete(self, destination: str) -> bool:
+        return self.destination_key(destination) in self._completed
+    
+    def __len__(self) -> int:
+        return len(self._completed)
+
+
+def resolve_session_dir(session: str, outputs_dir: Union[str, Path] = "outputs") -> Path:
+    """Resolve a ``--resume`` argument given as a session name or a path"""
+    candidate = Path(session)
+    if candidate.is_dir():
+        return candidate
+    candidate = Path(outputs_dir) / session
+    if candidate.is_dir():
+        return candidate
+    raise FileNotFoundError(f"Session not found: {session}")
@@ -4,7 +4,9 @@ Enhanced Data Processor - Adds intelligence layers to affinities and manages JSO
 
 import json
 import logging
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from pathlib import Path
@@ -14,6 +16,8 @@ from src.scorer import AffinityQualityScorer
 from src.evidence_validator import EvidenceValidator
 from src.content_intelligence_processor import ContentIntelligenceProcessor
 from src.schemas import PageContent
+from src.core.json_fields import read_sidecar
+from src.core.session_index import build_file_metadata, write_session_json
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +39,10 @@ class EnhancedDataProcessor:
         self.base_output_dir = "outputs"
         self.session_output_dir = os.path.join(self.base_output_dir, f"session_{self.session_timestamp}")
         
+        # Per-theme progress bars and step messages (silenced inside pool workers)
+        self.show_progress = True
+        self.pool_config = self.config.get('performance_optimization', {}).get('destination_process_pool', {})
+        
         # Intelligence enhancement mappings
         self.emotional_keywords = {
             'peaceful': ['quiet', 'serene', 'calm', 'tranquil', 'meditation', 'zen', 'peaceful'],
@@ -59,7 +67,8 @@ class EnhancedDataProcessor:
 
     def process_destinations_with_progress(self, destinations_data: Dict[str, Any], 
                                          generate_dashboard: bool = True,
-                                         web_data: Dict[str, Any] = None) -> Dict[str, str]:
+                                         web_data: Dict[str, Any] = None,
+                                         use_process_pool: Optional[bool] = None) -> Dict[str, str]:
         """
         Process multiple destinations with progress tracking and organized output.
         
@@ -67,6 +76,8 @@ class EnhancedDataProcessor:
             destinations_data: Dictionary of destination name -> destination data
             generate_dashboard: Whether to generate HTML dashboard
             web_data: Web discovery data for evidence collection
+            use_process_pool: Process destinations in worker processes (defaults to
+                performance_optimization.destination_process_pool.enabled)
             
         Returns:
             Dictionary of destination name -> output file path
@@ -85,94 +96,35 @@ class EnhancedDataProcessor:
         
         # Track processed files for dashboard generation
         processed_files = {}
-        dashboard_json_files = []
-        
-        # Create progress bar for destinations
-        dest_progress = tqdm(destinations_data.items(), 
-                           desc="Processing destinations",
-                           unit="dest",
-                           colour="blue")
         
-        for destination_name, destination_data in dest_progress:
-            dest_progress.set_description(f"Processing {destination_name}")
+        max_workers = self._resolve_pool_workers(len(destinations_data), use_process_pool)
+        if max_workers > 1:
+            processed_files = self._process_destinations_in_pool(destinations_data, web_data, max_workers)
+        else:
+            # Create progress bar for destinations
+            dest_progress = tqdm(destinations_data.items(), 
+                               desc="Processing destinations",
+                               unit="dest",
+                               colour="blue")
             
-            try:
-                # Get web data for this destination
-                dest_web_data = web_data.get(destination_name, {}) if web_data else {}
-                
-                # Process single destination with progress and web data
-                enhanced_data = self._process_single_destination_with_progress(
-                    destination_data, destination_name, dest_web_data
-                )
-                
-                # Save enhanced JSON
-                json_filename = f"{self._sanitize_filename(destination_name)}_enhanced.json"
-                json_filepath = os.path.join(self.session_output_dir, "json", json_filename)
+            for destination_name, destination_data in dest_progress:
+                dest_progress.set_description(f"Processing {destination_name}")
                 
-                # Save evidence separately
-                evidence_filename = f"{self._sanitize_filename(destination_name)}_evidence.json"
-                evidence_filepath = os.path.join(self.session_output_dir, "json", evidence_filename)
-                
-                # Extract evidence data for separate file
-                evidence_data = {
-                    'destination_id': enhanced_data.get('destination_id', ''),
-                    'destination_name': destination_name,
-                    'evidence_metadata': {
-                        'generation_timestamp': datetime.now().isoformat(),
-                        'total_themes_with_evidence': 0,
-                        'total_evidence_pieces': 0,
-                        'evidence_summary': {}
-                    },
-                    'theme_evidence': {}
-                }
-                
-                # Extract evidence from each theme
-                for affinity in enhanced_data.get('affinities', []):
-                    theme_name = affinity.get('theme', 'Unknown')
-                    comprehensive_evidence = affinity.get('comprehensive_attribute_evidence', {})
+                try:
+                    # Get web data for this destination
+                    dest_web_data = web_data.get(destination_name, {}) if web_data else {}
+                    processed_files[destination_name] = self._process_and_save_destination(
+                        destination_name, destination_data, dest_web_data
+                    )
                     
-                    if comprehensive_evidence:
-                        # Convert to JSON-serializable format properly
-                        try:
-                            serializable_evidence = self.evidence_validator.to_json_serializable(comprehensive_evidence)
-                            evidence_data['theme_evidence'][theme_name] = serializable_evidence
-                            evidence_data['evidence_metadata']['total_themes_with_evidence'] += 1
-                            
-                            # Count evidence pieces from serialized data
-                            for attr_evidence in serializable_evidence.values():
-                                if isinstance(attr_evidence, dict) and 'evidence_pieces' in attr_evidence:
-                                    evidence_data['evidence_metadata']['total_evidence_pieces'] += len(attr_evidence['evidence_pieces'])
-                        except Exception as e:
-                            logger.error(f"Error serializing evidence for theme {theme_name}: {e}")
-                            # Store as string representation as fallback
-                            evidence_data['theme_evidence'][theme_name] = str(comprehensive_evidence)
-                
-                # Save evidence file without default=str to avoid string conversion
-                with open(evidence_filepath, 'w', encoding='utf-8') as f:
-                    json.dump(evidence_data, f, indent=2)
-                
-                # Remove comprehensive evidence from main JSON and add reference
-                for affinity in enhanced_data.get('affinities', []):
-                    if 'comprehensive_attribute_evidence' in affinity:
-                        del affinity['comprehensive_attribute_evidence']
-                
-                # Add evidence file reference to main data
-                enhanced_data['evidence_file_reference'] = evidence_filename
-                
-                with open(json_filepath, 'w', encoding='utf-8') as f:
-                    json.dump(enhanced_data, f, indent=2, default=str)
-                
-                processed_files[destination_name] = json_filepath
-                dashboard_json_files.append(json_filepath)
-                
-                logger.info(f"Enhanced data saved: {json_filepath}")
-                
-            except Exception as e:
-                logger.error(f"Error processing {destination_name}: {e}")
-                dest_progress.set_description(f"Error: {destination_name}")
-                continue
+                except Exception as e:
+                    logger.error(f"Error processing {destination_name}: {e}")
+                    dest_progress.set_description(f"Error: {destination_name}")
+                    continue
+            
+            dest_progress.close()
         
-        dest_progress.close()
+        dashboard_json_files = list(processed_files.values())
         
         # Generate dashboard if requested
         if generate_dashboard and dashboard_json_files:
@@ -204,6 +156,125 @@ class EnhancedDataProcessor:
         
         return processed_files
 
+    def _resolve_pool_workers(self, destination_count: int, use_process_pool: Optional[bool]) -> int:
+        """Number of worker processes to use (1 means process in this process)."""
+        if use_process_pool is None:
+            use_process_pool = self.pool_config.get('enabled', False)
+        if not use_process_pool or destination_count < self.pool_config.get('min_destinations', 2):
+            return 1
+        max_workers = self.pool_config.get('max_workers') or os.cpu_count() or 1
+        return max(1, min(max_workers, destination_count))
+
+    def _process_destinations_in_pool(self, destinations_data: Dict[str, Any],
+                                      web_data: Optional[Dict[str, Any]], max_workers: int) -> Dict[str, str]:
+        """Process destinations end-to-end in worker processes; the parent only tracks progress."""
+        processed_files = {}
+        start_method = self.pool_config.get('start_method', 'spawn')
+        
+        print(f"⚙️  Process pool: {max_workers} workers ({start_method})")
+        
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_destination_worker,
+            initargs=(self.config, self.session_timestamp, self.session_output_dir)
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _process_destination_in_worker,
+                    destination_name,
+                    destination_data,
+                    web_data.get(destination_name, {}) if web_data else {}
+                ): destination_name
+                for destination_name, destination_data in destinations_data.items()
+            }
+            
+            dest_progress = tqdm(total=len(futures), desc="Processing destinations", unit="dest", colour="blue")
+            for future in as_completed(futures):
+                destination_name = futures[future]
+                try:
+                    processed_files[destination_name] = future.result()
+                    dest_progress.set_description(f"Processed {destination_name}")
+                except Exception as e:
+                    logger.error(f"Error processing {destination_name}: {e}")
+                    dest_progress.set_description(f"Error: {destination_name}")
+                dest_progress.update(1)
+            dest_progress.close()
+        
+        # Keep the caller's destination order
+        return {name: processed_files[name] for name in destinations_data if name in processed_files}
+
+    def _progress_message(self, message: str):
+        if self.show_progress:
+            print(message)
+
+    def _process_and_save_destination(self, destination_name: str, destination_data: Dict[str, Any],
+                                      dest_web_data: Dict[str, Any]) -> str:
+        """Enhance one destination and write its enhanced and evidence JSON files. Returns the enhanced file path."""
+        
+        # Process single destination with progress and web data
+        enhanced_data = self._process_single_destination_with_progress(
+            destination_data, destination_name, dest_web_data
+        )
+        
+        # Save enhanced JSON
+        json_filename = f"{self._sanitize_filename(destination_name)}_enhanced.json"
+        json_filepath = os.path.join(self.session_output_dir, "json", json_filename)
+        
+        # Save evidence separately
+        evidence_filename = f"{self._sanitize_filename(destination_name)}_evidence.json"
+        evidence_filepath = os.path.join(self.session_output_dir, "json", evidence_filename)
+        
+        # Extract evidence data for separate file
+        evidence_data = {
+            'destination_id': enhanced_data.get('destination_id', ''),
+            'destination_name': destination_name,
+            'evidence_metadata': {
+                'generation_timestamp': datetime.now().isoformat(),
+                'total_themes_with_evidence': 0,
+                'total_evidence_pieces': 0,
+                'evidence_summary': {}
+            },
+            'theme_evidence': {}
+        }
+        
+        # Extract evidence from each theme
+        for affinity in enhanced_data.get('affinities', []):
+            theme_name = affinity.get('theme', 'Unknown')
+            comprehensive_evidence = affinity.get('comprehensive_attribute_evidence', {})
+            
+            if comprehensive_evidence:
+                # Convert to JSON-serializable format properly
+                try:
+                    serializable_evidence = self.evidence_validator.to_json_serializable(comprehensive_evidence)
+                    evidence_data['theme_evidence'][theme_name] = serializable_evidence
+                    evidence_data['evidence_metadata']['total_themes_with_evidence'] += 1
+                    
+                    # Count evidence pieces from serialized data
+                    for attr_evidence in serializable_evidence.values():
+                        if isinstance(attr_evidence, dict) and 'evidence_pieces' in attr_evidence:
+                            evidence_data['evidence_metadata']['total_evidence_pieces'] += len(attr_evidence['evidence_pieces'])
+                except Exception as e:
+                    logger.error(f"Error serializing evidence for theme {theme_name}: {e}")
+                    # Store as string representation as fallback
+                    evidence_data['theme_evidence'][theme_name] = str(comprehensive_evidence)
+        
+        # Save evidence file without default=str to avoid string conversion
+        write_session_json(evidence_filepath, evidence_data, self.config, indent=2)
+        
+        # Remove comprehensive evidence from main JSON and add reference
+        for affinity in enhanced_data.get('affinities', []):
+            if 'comprehensive_attribute_evidence' in affinity:
+                del affinity['comprehensive_attribute_evidence']
+        
+        # Add evidence file reference to main data
+        enhanced_data['evidence_file_reference'] = evidence_filename
+        
+        write_session_json(json_filepath, enhanced_data, self.config, indent=2, default=str)
+        
+        logger.info(f"Enhanced data saved: {json_filepath}")
+        return json_filepath
+
     def _process_single_destination_with_progress(self, destination_data: Dict[str, Any], 
                                                 destination_name: str,
                                                 web_data: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -218,7 +289,8 @@ class EnhancedDataProcessor:
                                desc=f"Enhancing {destination_name} themes",
                                unit="theme",
                                leave=False,
-                               colour="green")
+                               colour="green",
+                               disable=not self.show_progress)
         
         enhanced_affinities = []
         
@@ -245,21 +317,21 @@ class EnhancedDataProcessor:
         enhanced_destination_data['destination_name'] = destination_name
         
         # Generate intelligence insights with progress
-        print(f"  🧠 Generating intelligence insights for {destination_name}...")
+        self._progress_message(f"  🧠 Generating intelligence insights for {destination_name}...")
         enhanced_destination_data['intelligence_insights'] = self._generate_intelligence_insights(enhanced_affinities)
         
         # Generate composition analysis
-        print(f"  🎨 Analyzing composition for {destination_name}...")
+        self._progress_message(f"  🎨 Analyzing composition for {destination_name}...")
         enhanced_destination_data['composition_analysis'] = self._analyze_composition(enhanced_affinities)
         
         # Enhanced quality assessment with progress
-        print(f"  📊 Calculating quality metrics for {destination_name}...")
+        self._progress_message(f"  📊 Calculating quality metrics for {destination_name}...")
         enhanced_destination_data['quality_assessment'] = self.scorer.score_affinity_set(
             enhanced_destination_data, destination_name
         )
         
         # QA workflow generation
-        print(f"  🔒 Processing QA workflow for {destination_name}...")
+        self._progress_message(f"  🔒 Processing QA workflow for {destination_name}...")
         enhanced_destination_data['qa_workflow'] = self._generate_qa_workflow(enhanced_destination_data['quality_assessment'])
         
         # Add processing metadata
@@ -385,12 +457,14 @@ class EnhancedDataProcessor:
         
         for dest_name, file_path in processed_files.items():
             try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
+                metadata = read_sidecar(file_path)
+                if metadata is None:
+                    with open(file_path, 'r') as f:
+                        metadata = build_file_metadata(json.load(f))
                 
-                theme_count = len(data.get('affinities', []))
-                quality_score = data.get('quality_assessment', {}).get('overall_score', 0)
-                hidden_gems = data.get('intelligence_insights', {}).get('hidden_gems_count', 0)
+                theme_count = metadata.get('theme_count') or 0
+                quality_score = metadata.get('overall_score') or 0
+                hidden_gems = metadata.get('hidden_gems_count') or 0
                 
                 summary['processed_destinations'][dest_name] = {
                     'file_path': file_path,
@@ -1520,11 +1594,28 @@ class EnhancedDataProcessor:
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            write_session_json(output_path, data, self.config, indent=2, ensure_ascii=False)
             
             logger.info(f"Enhanced data saved to {output_path}")
             
         except Exception as e:
             logger.error(f"Error saving enhanced data to {output_path}: {e}")
-            raise 
\ No newline at end of file
+            raise 
+
+
+# Process-pool workers: one EnhancedDataProcessor per worker process, so the
+# embedding model and validators load once per worker rather than once per task
+_worker_processor: Optional[EnhancedDataProcessor] = None
+
+
+def _init_destination_worker(config: Dict[str, Any], session_timestamp: str, session_output_dir: str):
+    global _worker_processor
+    _worker_processor = EnhancedDataProcessor(config)
+    _worker_processor.session_timestamp = session_timestamp
+    _worker_processor.session_output_dir = session_output_dir
+    _worker_processor.show_progress = False
+
+
+def _process_destination_in_worker(destination_name: str, destination_data: Dict[str, Any],
+                                   dest_web_data: Dict[str, Any]) -> str:
+    return _worker_processor._process_and_save_destination(destination_name, destination_data, dest_web_data)
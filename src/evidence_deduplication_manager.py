@@ -1,13 +1,206 @@
 import os
 import json
 import hashlib
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+import re
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, is_dataclass
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime, timedelta
 import logging
 from pathlib import Path
 
+from src.core.near_duplicate_index import deduplicate_near_duplicates
+
+try:
+    import fcntl
+    FILE_LOCK_AVAILABLE = True
+except ImportError:
+    FILE_LOCK_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class EvidenceRegistry:
+    """
+    Append-only, indexed on-disk registry of evidence seen across sessions.
+    
+    Records are appended as JSON lines and indexed in memory by URL, content
+    fingerprint and phrase, so "already seen for this destination" lookups are
+    O(1). The log is rewritten (compacted) once superseded or expired lines
+    outnumber live records.
+    
+    Several processes may share the log (concurrent runs, destination pool
+    workers), so appends and compaction hold an exclusive lock on a sidecar
+    ``.lock`` file and compaction rebuilds from the log on disk rather than
+    from this instance's view of it. Where file locks are unavailable,
+    compaction is skipped if the log grew past what this instance has seen.
+    """
+    
+    def __init__(self, registry_file: Path, ttl_days: int = 30,
+                 compaction_ratio: float = 2.0, min_compaction_lines: int = 1000):
+        self.registry_file = registry_file
+        self.lock_file = registry_file.with_suffix(registry_file.suffix + '.lock')
+        self.ttl = timedelta(days=ttl_days)
+        self.compaction_ratio = compaction_ratio
+        self.min_compaction_lines = min_compaction_lines
+        self._lock = threading.Lock()
+        
+        self._records: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._by_url: Dict[Tuple[str, str], set] = {}
+        self._by_fingerprint: Dict[Tuple[str, str], Tuple[str, str, str]] = {}
+        self._by_phrase: Dict[Tuple[str, str, str], List[Tuple[str, str, str]]] = {}
+        self._log_lines = 0
+        self._seen_offset = 0
+        
+        self._load()
+    
+    @staticmethod
+    def destination_key(destination: str) -> str:
+        return (destination or '').strip().lower()
+    
+    @staticmethod
+    def fingerprint(text: str) -> str:
+        """Content fingerprint insensitive to case and whitespace"""
+        normalized = _WHITESPACE_RE.sub(' ', (text or '').lower()).strip()
+        return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+    
+    def _load(self):
+        if not self.registry_file.exists():
+            return
+        
+        live, self._log_lines, self._seen_offset = self._read_log()
+        for record in live:
+            self._index(record)
+    
+    def _read_log(self) -> Tuple[List[Dict[str, Any]], int, int]:
+        """Unexpired records in log order, the line count and the byte offset read up to"""
+        cutoff = (datetime.now() - self.ttl).isoformat()
+        live = []
+        lines = 0
+        with open(self.registry_file, 'rb') as f:
+            for raw in f:
+                lines += 1
+                try:
+                    record = json.loads(raw)
+                except json.JSONDecodeError:
+                    # Torn trailing write from an interrupted run
+                    continue
+                if record.get('registered_at', '') < cutoff:
+                    continue
+                live.append(record)
+            offset = f.tell()
+        return live, lines, offset
+    
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock shared with other processes writing the same log"""
+        if not FILE_LOCK_AVAILABLE:
+            yield False
+            return
+        self.lock_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_file, 'a') as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+    
+    def _index(self, record: Dict[str, Any]):
+        key = (record['destination'], record['url'], record['fingerprint'])
+        is_new = key not in self._records
+        self._records[key] = record
+        if not is_new:
+            return
+        
+        self._by_url.setdefault((key[0], key[1]), set()).add(key)
+        self._by_fingerprint[(key[0], key[2])] = key
+        phrase_key = (key[0], record.get('category', ''), (record.get('phrase') or '').lower())
+        self._by_phrase.setdefault(phrase_key, []).append(key)
+    
+    def has_url(self, destination: str, url: str) -> bool:
+        return (self.destination_key(destination), url) in self._by_url
+    
+    def has_content(self, destination: str, text: str) -> bool:
+        return (self.destination_key(destination), self.fingerprint(text)) in self._by_fingerprint
+    
+    def contains(self, destination: str, url: str, text: str) -> bool:
+        return (self.destination_key(destination), url, self.fingerprint(text)) in self._records
+    
+    def evidence_for_phrase(self, destination: str, category: str, phrase: str) -> List[Dict[str, Any]]:
+        """Previously registered evidence payloads for a phrase, oldest first"""
+        keys = self._by_phrase.get((self.destination_key(destination), category, (phrase or '').lower()), [])
+        return [self._records[key]['evidence'] for key in keys]
+    
+    def append(self, records: List[Dict[str, Any]]) -> int:
+        """Append new records to the log and index them. Returns number written."""
+        if not records:
+            return 0
+        
+        with self._lock:
+            self.registry_file.parent.mkdir(parents=True, exist_ok=True)
+            with self._file_lock() as locked:
+                start = self.registry_file.stat().st_size if self.registry_file.exists() else 0
+                with open(self.registry_file, 'a', encoding='utf-8') as f:
+                    for record in records:
+                        f.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+                end = self.registry_file.stat().st_size
+                self._log_lines += len(records)
+                for record in records:
+                    self._index(record)
+                # Our own lines are seen; lines other writers added before them are not
+                if start == self._seen_offset:
+                    self._seen_offset = end
+                
+                if (self._log_lines >= self.min_compaction_lines and
+                        self._log_lines > self.compaction_ratio * len(self._records)):
+                    self._compact_locked(locked)
+        
+        return len(records)
+    
+    def compact(self):
+        """Rewrite the log keeping only live, unexpired records"""
+        with self._lock:
+            with self._file_lock() as locked:
+                self._compact_locked(locked)
+    
+    def _compact_locked(self, file_locked: bool):
+        if not self.registry_file.exists():
+            return
+        if not file_locked and self.registry_file.stat().st_size != self._seen_offset:
+            # Another process appended since we last read; rewriting would drop its lines
+            logger.debug("Skipping evidence registry compaction: log changed on disk")
+            return
+        
+        # Rebuild from disk so records other processes appended survive
+        records, lines, _ = self._read_log()
+        live: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        for record in records:
+            live[(record['destination'], record['url'], record['fingerprint'])] = record
+        
+        tmp_file = self.registry_file.with_suffix(self.registry_file.suffix + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            for record in live.values():
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+        offset = tmp_file.stat().st_size
+        os.replace(tmp_file, self.registry_file)
+        
+        logger.info(f"Compacted evidence registry: {lines} lines -> {len(live)} records")
+        self._records.clear()
+        self._by_url.clear()
+        self._by_fingerprint.clear()
+        self._by_phrase.clear()
+        for record in live.values():
+            self._index(record)
+        self._log_lines = len(live)
+        self._seen_offset = offset
+    
+    def __len__(self) -> int:
+        return len(self._records)
+
+
 class EvidenceDeduplicationManager:
     """Manages evidence deduplication across sessions and destinations"""
     
@@ -17,38 +210,112 @@ class EvidenceDeduplicationManager:
         
         self.enable_deduplication = evidence_config.get('enable_evidence_deduplication', True)
         self.similarity_threshold = evidence_config.get('evidence_similarity_threshold', 0.85)
+        self.reuse_existing_evidence = evidence_config.get('reuse_existing_evidence', True)
         
-        # Evidence registry file
-        self.registry_file = Path("cache") / "evidence_registry.json"
+        # Evidence registry log (JSON lines, appended incrementally)
+        self.registry_file = Path("cache") / "evidence_registry.jsonl"
         self.registry_file.parent.mkdir(exist_ok=True)
         
         # Load existing registry
-        self.evidence_registry = self._load_evidence_registry()
+        self.evidence_registry = self._load_evidence_registry(evidence_config)
     
-    def _load_evidence_registry(self) -> Dict[str, Any]:
+    def _load_evidence_registry(self, evidence_config: Dict[str, Any]) -> Optional[EvidenceRegistry]:
         """Load the evidence registry from cache"""
-        if self.registry_file.exists():
-            try:
-                with open(self.registry_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.warning(f"Failed to load evidence registry: {e}")
-        
-        return {
-            'version': '1.0',
-            'created_at': datetime.now().isoformat(),
-            'evidence_by_phrase': {},
-            'evidence_by_url': {},
-            'last_updated': datetime.now().isoformat()
-        }
+        try:
+            return EvidenceRegistry(
+                self.registry_file,
+                ttl_days=evidence_config.get('evidence_registry_ttl_days', 30),
+                compaction_ratio=evidence_config.get('evidence_registry_compaction_ratio', 2.0)
+            )
+        except Exception as e:
+            logger.warning(f"Failed to load evidence registry: {e}")
+            return None
+    
+    def is_known_evidence(self, destination: str, url: str, text: str = None) -> bool:
+        """Whether this URL (and content, if given) was already validated for the destination"""
+        if not self.evidence_registry:
+            return False
+        if text is None:
+            return self.evidence_registry.has_url(destination, url)
+        return self.evidence_registry.contains(destination, url, text)
+    
+    def get_known_evidence(self, destination: str, category: str, phrase: str) -> List[Dict[str, Any]]:
+        """Evidence validated for this phrase in a previous session, if reuse is enabled"""
+        if not (self.reuse_existing_evidence and self.evidence_registry):
+            return []
+        return self.evidence_registry.evidence_for_phrase(destination, category, phrase)
     
     def register_evidence_batch(self, destination: str, evidence_list: List[Any]):
         """Register a batch of evidence for deduplication"""
         if not self.enable_deduplication:
             return evidence_list
         
-        # For now, just pass through evidence without deduplication
-        # but ensure we don't break the evidence collection process
         logger.debug(f"Processing {len(evidence_list)} evidence items for {destination}")
-        return evidence_list
- 
\ No newline at end of file
+        
+        # Near-duplicate snippets only compete with evidence for the same phrase
+        groups: Dict[tuple, List[Any]] = {}
+        for evidence in evidence_list:
+            group_key = (self._field(evidence, 'category'), self._field(evidence, 'phrase'))
+            groups.setdefault(group_key, []).append(evidence)
+        
+        deduplicated = []
+        removed_total = 0
+        for group in groups.values():
+            unique, removed = deduplicate_near_duplicates(
+                group,
+                text_fn=self._evidence_text,
+                score_fn=lambda e: (self._field(e, 'relevance_score') or 0) + (self._field(e, 'authority_score') or 0),
+                threshold=self.similarity_threshold
+            )
+            deduplicated.extend(unique)
+            removed_total += removed
+        
+        if removed_total:
+            logger.info(f"Removed {removed_total} near-duplicate evidence items for {destination}")
+        
+        # Persist only what the registry has not seen for this destination
+        if self.evidence_registry is not None:
+            registered_at = datetime.now().isoformat()
+            destination_key = EvidenceRegistry.destination_key(destination)
+            new_records = []
+            for evidence in deduplicated:
+                url = self._field(evidence, 'source_url') or ''
+                text = self._evidence_text(evidence)
+                if self.evidence_registry.contains(destination, url, text):
+                    continue
+                new_records.append({
+                    'destination': destination_key,
+                    'url': url,
+                    'fingerprint': EvidenceRegistry.fingerprint(text),
+                    'phrase': self._field(evidence, 'phrase') or '',
+                    'category': self._field(evidence, 'category') or '',
+                    'registered_at': registered_at,
+                    'evidence': self._to_dict(evidence)
+                })
+            
+            try:
+                written = self.evidence_registry.append(new_records)
+                logger.debug(f"Registered {written} new evidence items for {destination} "
+                             f"({len(deduplicated) - written} already known)")
+            except Exception as e:
+                logger.warning(f"Failed to update evidence registry: {e}")
+        
+        return deduplicated
+    
+    def _evidence_text(self, evidence: Any) -> str:
+        return self._field(evidence, 'content_snippet') or self._field(evidence, 'text_content') or ''
+    
+    @staticmethod
+    def _to_dict(evidence: Any) -> Dict[str, Any]:
+        if isinstance(evidence, dict):
+            return dict(evidence)
+        if is_dataclass(evidence):
+            return asdict(evidence)
+        return dict(vars(evidence))
+    
+    @staticmethod
+    def _field(evidence: Any, name: str) -> Any:
+        """Read a field from either a dict or an evidence dataclass"""
+        if isinstance(evidence, dict):
+            return evidence.get(name)
+        return getattr(evidence, name, None)
@@ -171,6 +171,9 @@ class EvidenceValidationConfig(BaseModel):
     require_destination_mention: bool = Field(default=False, description="Evidence must mention the destination")
     enable_semantic_validation: bool = Field(default=False, description="Use semantic similarity for validation")
     semantic_similarity_threshold: float = Field(ge=0, le=1, default=0.5, description="Minimum semantic similarity")
+    embedding_batch_size: int = Field(ge=1, default=64, description="Sentences encoded per model forward pass")
+    embedding_cache_size: int = Field(ge=0, default=50000, description="Sentence embeddings kept in memory")
+    sentence_split_cache_size: int = Field(ge=1, default=512, description="Tokenized pages kept in memory")
     
     @validator('max_evidence_pieces')
     def max_must_be_greater_than_min(cls, v, values):
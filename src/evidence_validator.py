@@ -6,9 +6,11 @@ Implements comprehensive evidence validation with storage, attribution, and qual
 import logging
 import re
 import hashlib
+from collections import OrderedDict
 from typing import Dict, List, Optional, Tuple, Any
 from urllib.parse import urlparse
 from datetime import datetime
+import numpy as np
 from sentence_transformers import SentenceTransformer, util
 import nltk
 from nltk.tokenize import word_tokenize, sent_tokenize
@@ -18,6 +20,7 @@ from src.evidence_schema import (
     EvidenceQuality, ValidationStatus, EvidenceValidationConfig
 )
 from src.schemas import PageContent
+from src.core.embedding_store import get_embedding_store
 
 # Download required NLTK data
 try:
@@ -39,12 +42,22 @@ class EvidenceValidator:
         self.logger = logging.getLogger("app.evidence_validator")
         
         # Initialize semantic model for similarity validation
+        self.semantic_model_name = 'all-MiniLM-L6-v2'
         try:
-            self.semantic_model = SentenceTransformer('all-MiniLM-L6-v2')
+            self.semantic_model = SentenceTransformer(self.semantic_model_name)
         except Exception as e:
             self.logger.warning(f"Could not load semantic model: {e}")
             self.semantic_model = None
         
+        # Persistent embedding store shared with other components using the same model
+        self.embedding_store = get_embedding_store(self.semantic_model_name, self.config)
+        
+        # Bounded caches so pages and themes shared across validations are
+        # tokenized and embedded only once
+        self._sentence_split_cache: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._sentence_embedding_cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._theme_embedding_cache: Dict[str, Any] = {}
+        
         # Source classification patterns
         self.source_patterns = {
             EvidenceSourceType.GOVERNMENT: [
@@ -109,6 +122,10 @@ class EvidenceValidator:
                 r'in.*depth', r'specialized', r'expert', r'master', r'advanced', r'complex'
             ]
         }
+        self._compiled_evidence_patterns = {
+            evidence_type: [re.compile(pattern) for pattern in patterns]
+            for evidence_type, patterns in self.evidence_patterns.items()
+        }
 
     def classify_source_type(self, url: str, title: str = "") -> EvidenceSourceType:
         """Classify the source type based on URL and title patterns."""
@@ -144,27 +161,87 @@ class EvidenceValidator:
         
         return max(0.0, min(1.0, base_score))
     
-    def extract_evidence_from_content(self, content: str, theme: str, 
-                                    destination: str, source_url: str, 
-                                    source_title: str) -> List[EvidencePiece]:
-        """Extract relevant evidence pieces from web content."""
-        evidence_pieces = []
+    def _split_sentences(self, content: str) -> List[str]:
+        """Tokenize content into sentences, reusing results for pages seen by earlier themes."""
+        cached = self._sentence_split_cache.get(content)
+        if cached is not None:
+            self._sentence_split_cache.move_to_end(content)
+            return cached
         
-        # Tokenize content into sentences
         try:
             sentences = sent_tokenize(content)
         except:
             # Fallback if NLTK fails
             sentences = content.split('.')
         
-        theme_lower = theme.lower()
-        destination_lower = destination.lower()
-        
-        # Keywords to look for
-        theme_keywords = [theme_lower] + theme_lower.split()
-        destination_keywords = [destination_lower] + destination_lower.split(',')
+        self._sentence_split_cache[content] = sentences
+        if len(self._sentence_split_cache) > self.validation_config.sentence_split_cache_size:
+            self._sentence_split_cache.popitem(last=False)
+        return sentences
+    
+    def _embed(self, texts: List[str]):
+        """Encode texts in one batch, going through the persistent embedding store when available."""
+        if self.embedding_store is not None:
+            return self.embedding_store.encode(
+                self.semantic_model, texts, batch_size=self.validation_config.embedding_batch_size
+            )
+        return self.semantic_model.encode(
+            texts, batch_size=self.validation_config.embedding_batch_size, convert_to_numpy=True
+        )
+    
+    def _get_theme_embedding(self, theme: str):
+        """Return the (cached) embedding for a theme string."""
+        embedding = self._theme_embedding_cache.get(theme)
+        if embedding is None:
+            embedding = self._embed([theme])
+            self._theme_embedding_cache[theme] = embedding
+        return embedding
+    
+    def _encode_sentences(self, sentences: List[str]):
+        """Encode sentences in one batched forward pass, skipping ones already cached."""
+        cache = self._sentence_embedding_cache
+        missing = list(dict.fromkeys(s for s in sentences if s not in cache))
         
+        # Refresh this batch's hits first so eviction below never drops them
         for sentence in sentences:
+            if sentence in cache:
+                cache.move_to_end(sentence)
+        
+        if missing:
+            vectors = self._embed(missing)
+            for sentence, vector in zip(missing, vectors):
+                cache[sentence] = vector
+        
+        # Collect before evicting: a batch larger than the cache is still returned whole
+        embeddings = [cache[s] for s in sentences]
+        while len(cache) > self.validation_config.embedding_cache_size:
+            cache.popitem(last=False)
+        
+        return embeddings
+    
+    def _batch_semantic_similarity(self, theme: str, sentences: List[str]) -> Optional[List[float]]:
+        """
+        Score all sentences against a theme with a single encode call and one
+        matrix product. Returns None when semantic validation is unavailable.
+        """
+        if not sentences or self.semantic_model is None:
+            return None
+        
+        try:
+            theme_embedding = self._get_theme_embedding(theme)
+            sentence_embeddings = np.stack(self._encode_sentences(sentences))
+            
+            return util.cos_sim(theme_embedding, sentence_embeddings)[0].tolist()
+        except Exception as e:
+            self.logger.debug(f"Batched semantic similarity failed for theme '{theme}': {e}")
+            return None
+    
+    def _select_theme_candidates(self, content: str, theme: str, theme_keywords: List[str],
+                                 destination_keywords: List[str]) -> List[Tuple[str, float]]:
+        """Apply the cheap keyword/relevance filters and return (sentence, relevance) candidates."""
+        candidates = []
+        
+        for sentence in self._split_sentences(content):
             sentence_clean = sentence.strip()
             if len(sentence_clean) < self.validation_config.min_content_length:
                 continue
@@ -191,29 +268,75 @@ class EvidenceValidator:
             if relevance_score < self.validation_config.min_relevance_score:
                 continue
             
-            # Calculate semantic similarity
-            semantic_similarity = None
-            if self.validation_config.enable_semantic_validation:
-                try:
-                    theme_embedding = self.semantic_model.encode([theme])
-                    sentence_embedding = self.semantic_model.encode([sentence_clean])
-                    semantic_similarity = float(util.cos_sim(theme_embedding, sentence_embedding)[0][0])
-                    
-                    if semantic_similarity < self.validation_config.semantic_similarity_threshold:
-                        continue
-                except:
-                    semantic_similarity = None
-            
-            # Classify source
-            source_type = self.classify_source_type(source_url, source_title)
-            authority_score = self.calculate_authority_score(source_type, source_url)
-            
-            if authority_score < self.validation_config.min_authority_score:
-                continue
+            candidates.append((sentence_clean, relevance_score))
+        
+        return candidates
+    
+    def _theme_and_destination_keywords(self, theme: str, destination: str) -> Tuple[List[str], List[str]]:
+        """Build the keyword lists used for theme/destination matching."""
+        theme_lower = theme.lower()
+        destination_lower = destination.lower()
+        theme_keywords = [theme_lower] + theme_lower.split()
+        destination_keywords = [destination_lower] + destination_lower.split(',')
+        return theme_keywords, destination_keywords
+    
+    def prime_semantic_embeddings(self, theme: str, web_pages: List[PageContent],
+                                  destination: str, enhanced: bool = False) -> None:
+        """
+        Encode every candidate sentence across all pages of a destination in one
+        batch so the per-page extraction below only hits the embedding cache.
+        """
+        if not self.validation_config.enable_semantic_validation or self.semantic_model is None:
+            return
+        
+        theme_keywords, destination_keywords = self._theme_and_destination_keywords(theme, destination)
+        select_candidates = (
+            self._select_enhanced_theme_candidates if enhanced else self._select_theme_candidates
+        )
+        sentences = []
+        for page in web_pages:
+            if page.content:
+                sentences.extend(
+                    sentence for sentence, _ in
+                    select_candidates(page.content, theme, theme_keywords, destination_keywords)
+                )
+        
+        if sentences:
+            try:
+                self._get_theme_embedding(theme)
+                self._encode_sentences(sentences)
+            except Exception as e:
+                self.logger.debug(f"Could not prime embeddings for theme '{theme}': {e}")
+    
+    def extract_evidence_from_content(self, content: str, theme: str, 
+                                    destination: str, source_url: str, 
+                                    source_title: str) -> List[EvidencePiece]:
+        """Extract relevant evidence pieces from web content."""
+        evidence_pieces = []
+        
+        theme_keywords, destination_keywords = self._theme_and_destination_keywords(theme, destination)
+        candidates = self._select_theme_candidates(content, theme, theme_keywords, destination_keywords)
+        if not candidates:
+            return evidence_pieces
+        
+        # Calculate semantic similarity for all candidates at once
+        similarities = None
+        if self.validation_config.enable_semantic_validation:
+            similarities = self._batch_semantic_similarity(theme, [c[0] for c in candidates])
+        
+        # Classify source once per page
+        source_type = self.classify_source_type(source_url, source_title)
+        authority_score = self.calculate_authority_score(source_type, source_url)
+        
+        if authority_score < self.validation_config.min_authority_score:
+            return evidence_pieces
+        
+        for index, (sentence_clean, relevance_score) in enumerate(candidates):
+            if similarities is not None:
+                if similarities[index] < self.validation_config.semantic_similarity_threshold:
+                    continue
             
             # Create evidence piece
-            evidence_id = hashlib.md5(f"{source_url}_{sentence_clean}".encode()).hexdigest()[:12]
-            
             evidence_piece = EvidencePiece(
                 text_content=sentence_clean[:1000],  # Limit to 1000 chars
                 source_url=source_url,
@@ -240,17 +363,12 @@ class EvidenceValidator:
         evidence_pieces = []
         
         # Get patterns for this evidence type
-        patterns = self.evidence_patterns.get(evidence_type, [])
-        
-        try:
-            sentences = sent_tokenize(content)
-        except:
-            sentences = content.split('.')
+        patterns = self._compiled_evidence_patterns.get(evidence_type, [])
         
         destination_lower = destination.lower()
         destination_keywords = [destination_lower] + destination_lower.split(',')
         
-        for sentence in sentences:
+        for sentence in self._split_sentences(content):
             sentence_clean = sentence.strip()
             if len(sentence_clean) < self.validation_config.min_content_length:
                 continue
@@ -263,10 +381,7 @@ class EvidenceValidator:
                 continue
             
             # Check for evidence type patterns
-            pattern_matches = []
-            for pattern in patterns:
-                if re.search(pattern, sentence_lower):
-                    pattern_matches.append(pattern)
+            pattern_matches = [pattern.pattern for pattern in patterns if pattern.search(sentence_lower)]
             
             # Check for target keywords
             keyword_matches = [kw for kw in target_keywords if kw.lower() in sentence_lower]
@@ -533,6 +648,9 @@ class EvidenceValidator:
         all_evidence = []
         source_counts = {}
         
+        # Embed candidate sentences from every page in one batch
+        self.prime_semantic_embeddings(theme, web_pages, destination)
+        
         # Extract evidence from each web page
         for page in web_pages:
             if not page.content:
@@ -1023,6 +1141,9 @@ class EvidenceValidator:
         source_counts = {}
         source_urls = []
         
+        # Embed candidate sentences from every page in one batch
+        self.prime_semantic_embeddings(theme, web_pages, destination, enhanced=True)
+        
         # Extract evidence from each web page with enhanced tracking
         for page in web_pages:
             if not page.content:
@@ -1249,18 +1370,13 @@ class EvidenceValidator:
         evidence_pieces = []
         
         # Get enhanced patterns for this evidence type
-        patterns = self.evidence_patterns.get(evidence_type, [])
-        
-        try:
-            sentences = sent_tokenize(content)
-        except:
-            sentences = content.split('.')
+        patterns = self._compiled_evidence_patterns.get(evidence_type, [])
         
         destination_lower = destination.lower()
         destination_keywords = [destination_lower] + destination_lower.split(',')
         target_keywords_lower = [kw.lower() for kw in target_keywords]
         
-        for sentence in sentences:
+        for sentence in self._split_sentences(content):
             sentence_lower = sentence.lower().strip()
             
             if len(sentence_lower) < 20:  # Skip very short sentences
@@ -1276,10 +1392,8 @@ class EvidenceValidator:
             
             # Check for pattern matches with enhanced scoring
             pattern_match_score = 0.0
-            for pattern in patterns:
-                if re.search(pattern, sentence_lower):
-                    pattern_match_score = 0.3
-                    break
+            if any(pattern.search(sentence_lower) for pattern in patterns):
+                pattern_match_score = 0.3
             
             # Enhanced quality rating
             quality_rating = self._determine_enhanced_quality_rating(
@@ -1520,26 +1634,12 @@ class EvidenceValidator:
             evidence_gaps=evidence_gaps
         )
 
-    def extract_evidence_from_content_enhanced(self, content: str, theme: str, 
-                                             destination: str, source_url: str, 
-                                             source_title: str) -> List[EvidencePiece]:
-        """Enhanced evidence extraction with improved scoring and URL tracking."""
-        evidence_pieces = []
+    def _select_enhanced_theme_candidates(self, content: str, theme: str, theme_keywords: List[str],
+                                          destination_keywords: List[str]) -> List[Tuple[str, float]]:
+        """Enhanced relevance filter returning (sentence, relevance) candidates."""
+        candidates = []
         
-        # Tokenize content into sentences
-        try:
-            sentences = sent_tokenize(content)
-        except:
-            sentences = content.split('.')
-        
-        theme_lower = theme.lower()
-        destination_lower = destination.lower()
-        
-        # Enhanced keywords
-        theme_keywords = [theme_lower] + theme_lower.split()
-        destination_keywords = [destination_lower] + destination_lower.split(',')
-        
-        for sentence in sentences:
+        for sentence in self._split_sentences(content):
             sentence_lower = sentence.lower().strip()
             
             if len(sentence_lower) < 25:  # Skip very short sentences
@@ -1553,6 +1653,38 @@ class EvidenceValidator:
             if relevance_score < 0.4:  # Higher threshold for main themes
                 continue
             
+            candidates.append((sentence.strip(), relevance_score))
+        
+        return candidates
+
+    def extract_evidence_from_content_enhanced(self, content: str, theme: str, 
+                                             destination: str, source_url: str, 
+                                             source_title: str) -> List[EvidencePiece]:
+        """Enhanced evidence extraction with improved scoring and URL tracking."""
+        evidence_pieces = []
+        
+        # Enhanced keywords
+        theme_keywords, destination_keywords = self._theme_and_destination_keywords(theme, destination)
+        candidates = self._select_enhanced_theme_candidates(
+            content, theme, theme_keywords, destination_keywords
+        )
+        if not candidates:
+            return evidence_pieces
+        
+        # Semantic similarity for all candidates in one batch
+        similarities = None
+        if self.validation_config.enable_semantic_validation:
+            similarities = self._batch_semantic_similarity(theme, [c[0] for c in candidates])
+        
+        # Enhanced authority score (constant for the page)
+        source_type = self.classify_source_type(source_url, source_title)
+        authority_score = self.calculate_enhanced_authority_score(source_type, source_url, source_title)
+        
+        for index, (sentence, relevance_score) in enumerate(candidates):
+            if similarities is not None:
+                if similarities[index] < self.validation_config.semantic_similarity_threshold:
+                    continue
+            
             # Enhanced quality rating
             quality_rating = self._determine_enhanced_quality_rating(
                 sentence, relevance_score, 0.0, source_url, source_title
@@ -1561,12 +1693,8 @@ class EvidenceValidator:
             if quality_rating == 'rejected':
                 continue
             
-            # Enhanced authority score
-            source_type = self.classify_source_type(source_url, source_title)
-            authority_score = self.calculate_enhanced_authority_score(source_type, source_url, source_title)
-            
             evidence_piece = EvidencePiece(
-                text_content=sentence.strip(),
+                text_content=sentence,
                 source_url=source_url,
                 source_title=source_title,
                 source_type=source_type,
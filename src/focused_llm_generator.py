@@ -6,13 +6,14 @@ Enhanced wrapper for LLM calls with connection pooling and persistent caching.
 import logging
 import asyncio
 import time
-from typing import Dict, Any, Optional
-from src.core.llm_factory import LLMFactory
+from typing import Dict, Any, Callable, List, Optional, AsyncIterator, Tuple
+from src.core.llm_factory import LLMFactory, chunk_text
+from src.core.single_flight import SingleFlight
 from src.utils.grpc_cleanup import register_grpc_cleanup
 
 # Import new performance optimizations
 try:
-    from src.core.persistent_llm_cache import PersistentLLMCache
+    from src.core.persistent_llm_cache import get_shared_llm_cache
     PERSISTENT_CACHE_AVAILABLE = True
 except ImportError:
     PERSISTENT_CACHE_AVAILABLE = False
@@ -23,8 +24,17 @@ try:
 except ImportError:
     CONNECTION_POOL_AVAILABLE = False
 
+try:
+    from src.core.llm_router import get_shared_router
+    ROUTER_AVAILABLE = True
+except ImportError:
+    ROUTER_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Shared by every generator so identical prompts from parallel destinations coalesce
+_in_flight_requests = SingleFlight()
+
 class FocusedLLMGenerator:
     """Enhanced LLM generator with connection pooling and persistent caching"""
     
@@ -37,8 +47,16 @@ class FocusedLLMGenerator:
         use_connection_pool = perf_config.get('llm_connection_pool_size', 0) > 0
         use_persistent_cache = perf_config.get('enable_persistent_cache', False)
         
+        # Shared multi-provider router (llm_settings.router); owns its own backends
+        self.router = get_shared_router(config, provider) if ROUTER_AVAILABLE else None
+        
         # Initialize connection pool if available and enabled
-        if CONNECTION_POOL_AVAILABLE and use_connection_pool:
+        if self.router is not None:
+            self.llm = None
+            self.connection_pool = None
+            self.use_connection_pool = False
+            logger.info(f"Using LLM router for {provider}")
+        elif CONNECTION_POOL_AVAILABLE and use_connection_pool:
             self.connection_pool = LLMConnectionPool(provider, config)
             self.use_connection_pool = True
             logger.info(f"Initialized LLM connection pool for {provider}")
@@ -50,9 +68,9 @@ class FocusedLLMGenerator:
         
         # Initialize persistent cache if available and enabled
         if PERSISTENT_CACHE_AVAILABLE and use_persistent_cache:
-            self.persistent_cache = PersistentLLMCache(config)
+            self.persistent_cache = get_shared_llm_cache(config)
             self.use_persistent_cache = True
-            logger.info("Initialized persistent LLM cache")
+            logger.info("Using shared persistent LLM cache")
         else:
             self.persistent_cache = None
             self.use_persistent_cache = False
@@ -72,6 +90,9 @@ class FocusedLLMGenerator:
             legacy_config.get('retry_max_delay', 30.0)
         )
         
+        # Concurrent identical prompts share one provider call
+        self.coalesce_requests = perf_config.get('enable_request_coalescing', True)
+        
         # Performance metrics
         self.metrics = {
             'total_requests': 0,
@@ -79,7 +100,10 @@ class FocusedLLMGenerator:
             'cache_misses': 0,
             'avg_response_time': 0.0,
             'connection_pool_usage': 0,
-            'error_count': 0
+            'error_count': 0,
+            'inflight_leaders': 0,
+            'inflight_merged': 0,
+            'streamed_requests': 0
         }
         
         # Register cleanup for gRPC resources
@@ -92,29 +116,21 @@ class FocusedLLMGenerator:
         
         try:
             # Check persistent cache first
-            if self.use_persistent_cache:
-                cached_response = await self.persistent_cache.get_cached_response(prompt, max_tokens)
-                if cached_response:
-                    self.metrics['cache_hits'] += 1
-                    logger.debug("Persistent cache hit for LLM request")
-                    return cached_response
-                else:
-                    self.metrics['cache_misses'] += 1
-            
-            # Generate response with retry logic
-            response = await self._generate_with_retries(prompt, max_tokens)
+            cached_response = await self._get_cached_response(prompt, max_tokens)
+            if cached_response:
+                return cached_response
             
-            # Cache the response
-            if self.use_persistent_cache and response:
-                await self.persistent_cache.cache_response(prompt, response, max_tokens)
-            
-            # Update performance metrics
-            response_time = time.time() - start_time
-            self.metrics['avg_response_time'] = (
-                (self.metrics['avg_response_time'] * (self.metrics['total_requests'] - 1) + response_time) /
-                self.metrics['total_requests']
-            )
+            # Generate response with retry logic; identical prompts already in flight are awaited, not re-sent
+            if self.coalesce_requests:
+                response, merged = await _in_flight_requests.do(
+                    (self.provider, prompt, max_tokens),
+                    lambda: self._generate_and_cache(prompt, max_tokens)
+                )
+                self.metrics['inflight_merged' if merged else 'inflight_leaders'] += 1
+            else:
+                response = await self._generate_and_cache(prompt, max_tokens)
             
+            self._record_response_time(start_time)
             return response
             
         except Exception as e:
@@ -122,13 +138,136 @@ class FocusedLLMGenerator:
             logger.error(f"LLM generation failed: {e}")
             return ""
     
-    async def _generate_with_retries(self, prompt: str, max_tokens: Optional[int] = None) -> str:
-        """Generate response with intelligent retry logic"""
+    async def stream_response(self, prompt: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """
+        Yield the response as the provider produces it. Cached responses, and
+        prompts already in flight for another caller, are yielded whole; a
+        stream that fails before any text arrived falls back to the retrying
+        non-streaming path.
+        """
+        start_time = time.time()
+        self.metrics['total_requests'] += 1
+        
+        try:
+            cached_response = await self._get_cached_response(prompt, max_tokens)
+            if cached_response:
+                yield cached_response
+                return
+            
+            chunks: asyncio.Queue = asyncio.Queue()
+            if self.coalesce_requests:
+                task, merged = _in_flight_requests.start(
+                    (self.provider, prompt, max_tokens),
+                    lambda: self._stream_and_cache(prompt, max_tokens, chunks.put_nowait)
+                )
+                self.metrics['inflight_merged' if merged else 'inflight_leaders'] += 1
+            else:
+                task, merged = asyncio.ensure_future(self._stream_and_cache(prompt, max_tokens, chunks.put_nowait)), False
+            
+            if merged:
+                response = await asyncio.shield(task)
+                if response:
+                    yield response
+            else:
+                while True:
+                    text = await chunks.get()
+                    if text is None:
+                        break
+                    yield text
+                await asyncio.shield(task)
+            
+            self._record_response_time(start_time)
+            
+        except Exception as e:
+            self.metrics['error_count'] += 1
+            logger.error(f"LLM generation failed: {e}")
+    
+    async def _stream_and_cache(self, prompt: str, max_tokens: Optional[int],
+                                emit: Callable[[Optional[str]], None]) -> str:
+        """Stream the response through ``emit`` (``None`` marks the end) and return it whole"""
+        chunks = []
+        provider = self.provider
+        try:
+            try:
+                if self.router is not None:
+                    provider, source = self.router.stream(prompt, max_tokens, preferred=self.provider)
+                elif self.use_connection_pool:
+                    source = self.connection_pool.stream_request(prompt, max_tokens)
+                else:
+                    source = self._stream_direct(prompt)
+                async for text in source:
+                    chunks.append(text)
+                    emit(text)
+                self.metrics['streamed_requests'] += 1
+            except Exception as e:
+                if chunks:
+                    # Already-emitted text cannot be retracted, so no retry here
+                    raise
+                logger.warning(f"LLM stream failed, retrying without streaming: {e}")
+                provider, response = await self._generate_with_retries(prompt, max_tokens)
+                if response:
+                    chunks.append(response)
+                    emit(response)
+            
+            response = ''.join(chunks)
+            await self._cache_response(provider, prompt, response, max_tokens)
+            return response
+        finally:
+            emit(None)
+    
+    async def _stream_direct(self, prompt: str) -> AsyncIterator[str]:
+        async for chunk in self.llm.astream(prompt):
+            text = chunk_text(chunk)
+            if text:
+                yield text
+    
+    def _cache_namespaces(self) -> List[str]:
+        """Providers whose cached answers serve this generator, its own first"""
+        if self.router is None:
+            return [self.provider]
+        return [self.provider] + [name for name in self.router.backends if name != self.provider]
+    
+    async def _get_cached_response(self, prompt: str, max_tokens: Optional[int] = None) -> Optional[str]:
+        """Persistent cache lookup, counted as a hit or miss"""
+        if not self.use_persistent_cache:
+            return None
+        # Responses are cached under the provider that produced them; with the
+        # router on, any of its providers may have answered this prompt
+        for namespace in self._cache_namespaces():
+            cached_response = await self.persistent_cache.get_cached_response(prompt, max_tokens, namespace=namespace)
+            if cached_response:
+                self.metrics['cache_hits'] += 1
+                logger.debug("Persistent cache hit for LLM request")
+                return cached_response
+        self.metrics['cache_misses'] += 1
+        return None
+    
+    async def _cache_response(self, provider: str, prompt: str, response: str, max_tokens: Optional[int] = None):
+        if self.use_persistent_cache and response:
+            await self.persistent_cache.cache_response(prompt, response, max_tokens, namespace=provider)
+    
+    def _record_response_time(self, start_time: float):
+        response_time = time.time() - start_time
+        self.metrics['avg_response_time'] = (
+            (self.metrics['avg_response_time'] * (self.metrics['total_requests'] - 1) + response_time) /
+            self.metrics['total_requests']
+        )
+    
+    async def _generate_and_cache(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        provider, response = await self._generate_with_retries(prompt, max_tokens)
+        await self._cache_response(provider, prompt, response, max_tokens)
+        return response
+    
+    async def _generate_with_retries(self, prompt: str, max_tokens: Optional[int] = None) -> Tuple[str, str]:
+        """Generate response with intelligent retry logic; returns ``(provider, response)``"""
         last_exception = None
         
         for attempt in range(self.max_retries + 1):
             try:
-                if self.use_connection_pool:
+                if self.router is not None:
+                    # Provider chosen per request, hedged to the runner-up when slow
+                    return await self.router.generate(prompt, max_tokens, preferred=self.provider)
+                elif self.use_connection_pool:
                     # Use connection pool
                     response = await self.connection_pool.execute_request(prompt, max_tokens)
                     self.metrics['connection_pool_usage'] += 1
@@ -140,7 +279,7 @@ class FocusedLLMGenerator:
                     else:
                         response = str(response)
                 
-                return response
+                return self.provider, response
                     
             except Exception as e:
                 last_exception = e
@@ -157,7 +296,7 @@ class FocusedLLMGenerator:
                     logger.error(f"LLM generation failed after {self.max_retries + 1} attempts: {e}")
         
         # If all retries failed, return empty string
-        return ""
+        return self.provider, ""
     
     async def get_performance_stats(self) -> Dict[str, Any]:
         """Get comprehensive performance statistics"""
@@ -173,10 +312,14 @@ class FocusedLLMGenerator:
             ),
             'features_enabled': {
                 'connection_pool': self.use_connection_pool,
-                'persistent_cache': self.use_persistent_cache
+                'persistent_cache': self.use_persistent_cache,
+                'router': self.router is not None
             }
         }
         
+        if self.router is not None:
+            stats['router_stats'] = self.router.get_stats()
+        
         # Add connection pool stats if available
         if self.use_connection_pool and self.connection_pool:
             try:
@@ -6,12 +6,20 @@ Implements decomposed prompt strategy for better LLM responses and reduced trunc
 import asyncio
 import json
 import logging
-import hashlib
-from typing import Dict, List, Any, Optional, Tuple
+from typing import AsyncIterator, Callable, Dict, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor
 import time
 
+from src.core.json_fields import JSONArrayStreamParser
+from src.core.prompt_packing import TokenBudgetPacker, estimate_tokens
+
+try:
+    from src.core.persistent_llm_cache import get_shared_llm_cache
+    PERSISTENT_CACHE_AVAILABLE = True
+except ImportError:
+    PERSISTENT_CACHE_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -46,6 +54,69 @@ class QualityAssessment:
     overlap_analysis: Dict[str, Any]
     overall_quality: Dict[str, Any]
 
+PRICING_CATEGORIES = ('budget', 'mid', 'luxury')
+
+def _is_str_list(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+def _is_month_plan(value: Any) -> bool:
+    # At least one of peak/avoid must name a month, otherwise the theme falls back
+    return (isinstance(value, dict) and all(_is_str_list(value.get(k, [])) for k in ('peak', 'avoid'))
+            and bool(value.get('peak') or value.get('avoid')))
+
+def _is_score(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and 0.0 <= value <= 1.0
+
+def _is_text(value: Any) -> bool:
+    return isinstance(value, str) and bool(value.strip())
+
+def _is_pricing_category(value: Any) -> bool:
+    return value in PRICING_CATEGORIES
+
+@dataclass
+class AnalysisQuestion:
+    """One per-theme question asked inside a merged structured-JSON request"""
+    key: str
+    instruction: str
+    example: str
+    output_tokens_per_theme: int
+    is_valid: Any
+
+ANALYSIS_QUESTIONS = {
+    'seasonality': AnalysisQuestion(
+        'seasonality',
+        'peak months (best time to experience it) and avoid months (weather, crowds, closures); full month names',
+        '{"peak": ["June", "July"], "avoid": ["January"]}', 40, _is_month_plan),
+    'traveler_types': AnalysisQuestion(
+        'traveler_types',
+        '1-3 most suitable traveler types from: solo, couple, family, group, business, luxury, budget, adventure, cultural, relaxation',
+        '["couple", "cultural"]', 15, _is_str_list),
+    'pricing': AnalysisQuestion(
+        'pricing',
+        'one pricing category: budget (under $50/day per person), mid ($50-150/day), luxury (over $150/day)',
+        '"mid"', 6, _is_pricing_category),
+    'confidence': AnalysisQuestion(
+        'confidence',
+        'how well the theme fits the destination, 0.0 (poor fit) to 1.0 (perfect fit)',
+        '0.85', 6, _is_score),
+    'sub_themes': AnalysisQuestion(
+        'sub_themes',
+        '3-4 specific, actionable sub-themes (sub-activities or aspects)',
+        '["sub_theme1", "sub_theme2", "sub_theme3"]', 50, _is_str_list),
+    'nano_themes': AnalysisQuestion(
+        'nano_themes',
+        '3-4 ultra-specific nano-experiences unique to the destination: named places, vendors, local insider spots',
+        '["nano_theme1", "nano_theme2", "nano_theme3"]', 70, _is_str_list),
+    'rationales': AnalysisQuestion(
+        'rationales',
+        'a compelling 2-3 sentence rationale for why this experience is special here',
+        '"compelling rationale text"', 75, _is_text),
+    'unique_selling_points': AnalysisQuestion(
+        'unique_selling_points',
+        '3-4 distinctive, memorable selling points',
+        '["selling_point1", "selling_point2", "selling_point3"]', 60, _is_str_list),
+}
+
 class FocusedPromptProcessor:
     """Processes destinations using focused, decomposed prompts"""
     
@@ -81,8 +152,31 @@ class FocusedPromptProcessor:
         self.enable_streaming = perf_config.get('enable_streaming_results', False)
         self.progressive_feedback_interval = perf_config.get('progressive_feedback_interval', 2.0)
         
-        # Initialize in-memory cache (fallback for when persistent cache is not available)
-        self._response_cache = {} if self.enable_response_caching else None
+        # Token-aware packing of per-theme questions into merged requests
+        packing_config = perf_config.get('prompt_packing', {})
+        self.enable_prompt_packing = packing_config.get('enabled', True)
+        self.context_budget_tokens = packing_config.get('context_budget_tokens', 6000)
+        self.max_output_tokens = packing_config.get('max_output_tokens', 4096)
+        self.chars_per_token = packing_config.get('chars_per_token', 4.0)
+        
+        # Stream phase 1 discovery so phase 2 can start on the first themes
+        self.enable_streaming_discovery = (
+            perf_config.get('enable_streaming_discovery', True) and hasattr(llm_generator, 'stream_response')
+        )
+        
+        # Shared memory + disk response cache (same instance as the LLM generator's).
+        # A generator that caches, or routes across providers, owns caching: only it
+        # knows which provider answered, and that provider is the cache namespace.
+        generator_owns_cache = (
+            getattr(llm_generator, 'use_persistent_cache', False) or
+            getattr(llm_generator, 'router', None) is not None
+        )
+        self._response_cache = (
+            get_shared_llm_cache(config)
+            if self.enable_response_caching and PERSISTENT_CACHE_AVAILABLE and not generator_owns_cache else None
+        )
+        self.enable_response_caching = self._response_cache is not None
+        self._cache_namespace = getattr(llm_generator, 'provider', '') or ''
         
         # Performance monitoring (enhanced)
         self.performance_metrics = {
@@ -94,7 +188,9 @@ class FocusedPromptProcessor:
             'theme_counts': [],
             'work_stealing_operations': 0,
             'streaming_chunks_sent': 0,
-            'memory_usage_mb': 0
+            'memory_usage_mb': 0,
+            'packed_requests': 0,
+            'packed_fallback_calls': 0
         }
         
     async def process_destination(self, destination: str, web_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -104,13 +200,18 @@ class FocusedPromptProcessor:
         start_time = time.time()
         
         try:
-            # Phase 1: Theme Discovery (Parallel)
-            logger.info(f"📋 Phase 1: Theme Discovery for {destination}")
-            discovery = await self._phase1_theme_discovery(destination, web_data)
-            
-            # Phase 2: Theme Analysis (Sequential)
-            logger.info(f"🔍 Phase 2: Theme Analysis for {destination}")
-            analysis = await self._phase2_theme_analysis(destination, discovery)
+            if self.enable_streaming_discovery and self.enable_prompt_packing:
+                # Phases 1 + 2 overlapped: analysis batches start while discovery is still streaming
+                logger.info(f"📋 Phases 1-2: Streaming Theme Discovery + Analysis for {destination}")
+                discovery, analysis = await self._streaming_discovery_and_analysis(destination, web_data)
+            else:
+                # Phase 1: Theme Discovery (Parallel)
+                logger.info(f"📋 Phase 1: Theme Discovery for {destination}")
+                discovery = await self._phase1_theme_discovery(destination, web_data)
+                
+                # Phase 2: Theme Analysis (Sequential)
+                logger.info(f"🔍 Phase 2: Theme Analysis for {destination}")
+                analysis = await self._phase2_theme_analysis(destination, discovery)
             
             # Phase 3: Content Enhancement (Parallel)
             logger.info(f"✨ Phase 3: Content Enhancement for {destination}")
@@ -142,7 +243,8 @@ class FocusedPromptProcessor:
             logger.error(f"❌ Failed to process {destination}: {e}")
             raise
     
-    async def _phase1_theme_discovery(self, destination: str, web_data: Optional[Dict[str, Any]] = None) -> ThemeDiscovery:
+    async def _phase1_theme_discovery(self, destination: str, web_data: Optional[Dict[str, Any]] = None,
+                                      on_theme: Optional[Callable[[str], None]] = None) -> ThemeDiscovery:
         """Phase 1: Discover themes across different categories (Parallel)"""
         
         # Prepare web context if available
@@ -162,7 +264,10 @@ class FocusedPromptProcessor:
         # Execute prompts in parallel
         tasks = []
         for category, prompt in prompts.items():
-            task = self._execute_discovery_prompt(category, prompt)
+            if self.enable_streaming_discovery:
+                task = self._stream_discovery_prompt(category, prompt, on_theme)
+            else:
+                task = self._execute_discovery_prompt(category, prompt)
             tasks.append(task)
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -178,6 +283,77 @@ class FocusedPromptProcessor:
         
         return ThemeDiscovery(**discovery_data)
     
+    async def _streaming_discovery_and_analysis(self, destination: str, web_data: Optional[Dict[str, Any]] = None
+                                                ) -> Tuple[ThemeDiscovery, ThemeAnalysis]:
+        """Run phase 1 and feed each theme to phase 2 the moment its JSON object closes"""
+        theme_queue: asyncio.Queue = asyncio.Queue()
+        
+        async def discover() -> ThemeDiscovery:
+            try:
+                return await self._phase1_theme_discovery(destination, web_data, on_theme=theme_queue.put_nowait)
+            finally:
+                theme_queue.put_nowait(None)
+        
+        async def discovered_themes():
+            while True:
+                theme = await theme_queue.get()
+                if theme is None:
+                    return
+                yield theme
+        
+        discovery_task = asyncio.ensure_future(discover())
+        try:
+            results = await self._run_packed_questions(destination, discovered_themes(), {
+                'seasonality': self._analyze_seasonality,
+                'traveler_types': self._analyze_traveler_types,
+                'pricing': self._analyze_pricing,
+                'confidence': self._analyze_confidence
+            })
+        except BaseException:
+            discovery_task.cancel()
+            raise
+        return await discovery_task, ThemeAnalysis(**results)
+    
+    def _normalize_discovered_theme(self, theme: Any) -> Optional[Dict[str, Any]]:
+        """Validate one discovered theme object and clean its citations"""
+        if not isinstance(theme, dict) or not theme.get('theme'):
+            return None
+        citations = theme.get('citations')
+        theme['citations'] = self._validate_citation_urls(citations) if isinstance(citations, list) else []
+        return theme
+    
+    async def _stream_discovery_prompt(self, category: str, prompt: str,
+                                       on_theme: Optional[Callable[[str], None]] = None) -> List[Dict[str, str]]:
+        """Streaming variant of ``_execute_discovery_prompt``: themes are emitted as each JSON object closes"""
+        parser = JSONArrayStreamParser()
+        themes: List[Dict[str, str]] = []
+        chunks: List[str] = []
+        
+        def accept(candidates):
+            for candidate in candidates:
+                theme = self._normalize_discovered_theme(candidate)
+                if theme is not None:
+                    themes.append(theme)
+                    if on_theme is not None:
+                        on_theme(theme['theme'])
+        
+        try:
+            async for text in self.llm_generator.stream_response(prompt, max_tokens=600):
+                chunks.append(text)
+                accept(parser.feed(text))
+            
+            if not themes:
+                # Not a streamable array (e.g. wrapped in an object): parse the whole response
+                accept(self._parse_json_list_response(''.join(chunks)) or [])
+            
+            self.performance_metrics['streaming_chunks_sent'] += len(chunks)
+            logger.info(f"✅ Discovered {len(themes)} {category} themes")
+            return themes
+            
+        except Exception as e:
+            logger.error(f"Failed to stream {category} discovery: {e}")
+            return themes
+    
     def _create_web_context(self, web_data: Dict[str, Any]) -> str:
         """Create web context from discovered content"""
         if not web_data.get('content'):
@@ -200,6 +376,15 @@ class FocusedPromptProcessor:
         # Collect all themes
         all_themes = self._collect_all_themes(discovery)
         
+        if self.enable_prompt_packing:
+            results = await self._run_packed_questions(destination, all_themes, {
+                'seasonality': self._analyze_seasonality,
+                'traveler_types': self._analyze_traveler_types,
+                'pricing': self._analyze_pricing,
+                'confidence': self._analyze_confidence
+            })
+            return ThemeAnalysis(**results)
+        
         # Sequential analysis prompts
         seasonality = await self._analyze_seasonality(destination, all_themes)
         traveler_types = await self._analyze_traveler_types(destination, all_themes)
@@ -219,6 +404,20 @@ class FocusedPromptProcessor:
         
         all_themes = self._collect_all_themes(discovery)
         
+        if self.enable_prompt_packing:
+            results = await self._run_packed_questions(destination, all_themes, {
+                'sub_themes': self._generate_sub_themes,
+                'nano_themes': self._generate_nano_themes,
+                'rationales': lambda d, t: self._generate_rationales(d, t, analysis),
+                'unique_selling_points': lambda d, t: self._generate_unique_selling_points(d, t, analysis)
+            })
+            return ThemeEnhancement(
+                sub_themes=results['sub_themes'],
+                nano_themes=results['nano_themes'],
+                rationales=results['rationales'],
+                unique_selling_points=results['unique_selling_points']
+            )
+        
         # Parallel enhancement tasks
         tasks = [
             self._generate_sub_themes(destination, all_themes),
@@ -920,33 +1119,141 @@ Return as JSON object:
         
         return all_results 
 
-    def _get_cache_key(self, prompt: str, max_tokens: int = None) -> str:
-        """Generate cache key for prompt"""
-        cache_content = f"{prompt}_{max_tokens or 'default'}"
-        return hashlib.md5(cache_content.encode()).hexdigest()
+    def _build_packed_prompt(self, destination: str, themes: List[str], questions: List[AnalysisQuestion]) -> str:
+        """One structured-JSON request asking every question for every theme"""
+        question_lines = "\n".join(f'- "{q.key}": {q.instruction}' for q in questions)
+        example_fields = ", ".join(f'"{q.key}": {q.example}' for q in questions)
+        theme_lines = "\n".join(f"- {theme}" for theme in themes)
+        return f"""Analyze each of these themes for {destination}.
+
+Themes:
+{theme_lines}
+
+For every theme, answer each field:
+{question_lines}
+
+Return one JSON object keyed by the exact theme name:
+{{
+  "theme_name": {{{example_fields}}}
+}}
+
+Include every theme listed above. Be specific to {destination}."""
+    
+    async def _run_packed_questions(self, destination: str, themes: Union[List[str], AsyncIterator[str]],
+                                    fallbacks: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Ask several per-theme questions in as few requests as the token budget
+        allows. ``themes`` may be an async iterator of themes still being
+        discovered, in which case a request is sent as soon as ``batch_size``
+        themes are waiting. Answers that are missing or malformed for a theme
+        are retried with that question's single-purpose prompt, for just those
+        themes. Returns ``{question_key: {theme: answer}}``.
+        """
+        questions = [ANALYSIS_QUESTIONS[key] for key in fallbacks]
+        results: Dict[str, Dict[str, Any]] = {q.key: {} for q in questions}
+        streaming = not isinstance(themes, list)
+        
+        fixed_prompt = self._build_packed_prompt(destination, [], questions)
+        packer = TokenBudgetPacker(
+            lambda theme: estimate_tokens(theme, self.chars_per_token) + 2,
+            output_tokens_per_item=sum(q.output_tokens_per_theme for q in questions) + 10 * len(questions),
+            context_budget=self.context_budget_tokens,
+            output_budget=self.max_output_tokens,
+            fixed_prompt_tokens=estimate_tokens(fixed_prompt, self.chars_per_token),
+            max_items=self.batch_size if streaming else None
+        )
+        
+        semaphore = asyncio.Semaphore(self.max_parallel_requests)
+        
+        async def run_batch(batch):
+            async with semaphore:
+                prompt = self._build_packed_prompt(destination, batch.items, questions)
+                # Headroom over the estimate, since the estimate is only approximate
+                max_tokens = min(self.max_output_tokens, int(batch.output_tokens * 1.3) + 100)
+                self.performance_metrics['packed_requests'] += 1
+                return batch.items, self._parse_json_response(await self._cached_llm_call(prompt, max_tokens))
+        
+        batch_tasks = []
+        seen_themes: List[str] = []
+        
+        def dispatch(batch):
+            if batch is not None:
+                batch_tasks.append(asyncio.ensure_future(run_batch(batch)))
+        
+        try:
+            if streaming:
+                async for theme in themes:
+                    seen_themes.append(theme)
+                    dispatch(packer.add(theme))
+            else:
+                seen_themes = list(themes)
+                for theme in seen_themes:
+                    dispatch(packer.add(theme))
+            dispatch(packer.flush())
+            batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
+        except BaseException:
+            for task in batch_tasks:
+                task.cancel()
+            raise
+        
+        themes = seen_themes
+        self.performance_metrics['batch_count'] += len(batch_tasks)
+        logger.info(f"Packed {len(themes)} themes x {len(questions)} questions into {len(batch_tasks)} request(s)")
+        
+        for result in batch_results:
+            if isinstance(result, Exception):
+                logger.warning(f"Packed analysis request failed: {result}")
+                continue
+            batch_themes, parsed = result
+            answers_by_name = {str(k).strip().lower(): v for k, v in parsed.items()} if isinstance(parsed, dict) else {}
+            for theme in batch_themes:
+                answers = answers_by_name.get(theme.strip().lower())
+                for question in questions:
+                    value = answers.get(question.key) if isinstance(answers, dict) else None
+                    if question.is_valid(value):
+                        results[question.key][theme] = value
+        
+        # Per-item fallback: re-ask only the questions that came back unusable
+        missing = {q.key: [t for t in themes if t not in results[q.key]] for q in questions}
+        fallback_keys = [key for key, missed in missing.items() if missed]
+        if fallback_keys:
+            logger.info(f"Packed analysis fallback for {', '.join(fallback_keys)}")
+            self.performance_metrics['packed_fallback_calls'] += len(fallback_keys)
+            fallback_results = await asyncio.gather(
+                *(fallbacks[key](destination, missing[key]) for key in fallback_keys), return_exceptions=True
+            )
+            for key, fallback in zip(fallback_keys, fallback_results):
+                if isinstance(fallback, dict):
+                    for theme in missing[key]:
+                        if theme in fallback:
+                            results[key][theme] = fallback[theme]
+        
+        return results
     
     async def _cached_llm_call(self, prompt: str, max_tokens: Optional[int] = None) -> str:
-        """Make LLM call with caching"""
+        """Make LLM call with caching (left to the generator when it caches or routes)"""
         if not self.enable_response_caching:
             self.performance_metrics['total_llm_calls'] += 1
             return await self.llm_generator.generate_response(prompt, max_tokens)
         
-        cache_key = self._get_cache_key(prompt, max_tokens)
-        
         # Check cache first
-        if cache_key in self._response_cache:
+        cached_response = await self._response_cache.get_cached_response(
+            prompt, max_tokens, namespace=self._cache_namespace
+        )
+        if cached_response is not None:
             self.performance_metrics['cache_hits'] += 1
             logger.debug("Cache hit for LLM response")
-            return self._response_cache[cache_key]
+            return cached_response
         
         # Make LLM call and cache result
         self.performance_metrics['total_llm_calls'] += 1
         self.performance_metrics['cache_misses'] += 1
         
         response = await self.llm_generator.generate_response(prompt, max_tokens)
-        self._response_cache[cache_key] = response
+        if response:
+            await self._response_cache.cache_response(prompt, response, max_tokens, namespace=self._cache_namespace)
         
-        logger.debug(f"Cached LLM response (cache size: {len(self._response_cache)})")
+        logger.debug(f"Cached LLM response (memory cache size: {len(self._response_cache.memory_cache)})")
         return response 
 
     def _log_performance_metrics(self, destination: str, processing_time: float):
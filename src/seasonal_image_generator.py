@@ -5,15 +5,16 @@ AI-powered seasonal image generation for travel destinations using DALL-E
 """
 
 import os
-import requests
 import logging
-import time
 import asyncio
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from PIL import Image
 from dotenv import load_dotenv
 
+from src.core.http_client import close_http_client, get_http_client
+from src.core.rate_limiter import get_shared_bucket
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -38,12 +39,21 @@ class SeasonalImageGenerator:
         self.image_size = self.seasonal_config.get('image_size', '1024x1024')
         self.quality = self.seasonal_config.get('quality', 'standard')
         self.timeout = self.seasonal_config.get('timeout_seconds', 60)
+        self.create_collage = self.seasonal_config.get('create_collage', False)
         
-        # Rate limiting settings for DALL-E 3
+        # Rate limiting settings for DALL-E 3, shared by every image path in the process
         self.rate_limit_enabled = self.seasonal_config.get('rate_limit_enabled', True)
         self.rate_limit_images_per_minute = self.seasonal_config.get('rate_limit_images_per_minute', 5)  # Conservative Tier 1 limit
-        self.rate_limit_delay = 60 / self.rate_limit_images_per_minute  # 12 seconds between images
-        self.last_generation_time = 0  # Track last generation time for rate limiting
+        self.rate_limit_burst = self.seasonal_config.get('rate_limit_burst', 1)
+        self.rate_limiter = get_shared_bucket(
+            f"images:{self.model}",
+            self.rate_limit_images_per_minute / 60.0,
+            self.rate_limit_burst
+        ) if self.rate_limit_enabled else None
+        
+        # DALL-E calls and downloads go through the shared keep-alive HTTP client,
+        # whose per-host caps bound how many run at once
+        self.http = get_http_client(self.config)
         
         # Seasonal prompts
         self.season_prompts = self.seasonal_config.get('season_prompts', {
@@ -61,12 +71,30 @@ class SeasonalImageGenerator:
         
         logger.info(f"🎨 Seasonal Image Generator initialized - Model: {self.model}, Size: {self.image_size}")
         if self.rate_limit_enabled:
-            logger.info(f"   ⚡ Rate limiting: {self.rate_limit_images_per_minute} images/minute ({self.rate_limit_delay:.1f}s delay)")
+            logger.info(f"   ⚡ Rate limiting: {self.rate_limit_images_per_minute} images/minute (burst {self.rate_limit_burst})")
     
     def generate_seasonal_images(self, destination: str, output_dir: Path) -> Dict[str, Dict]:
+        """
+        Generate seasonal images for a destination (blocking wrapper around
+        ``generate_seasonal_images_async`` for callers without an event loop)
+        """
+        async def run():
+            try:
+                return await self.generate_seasonal_images_async(destination, output_dir)
+            finally:
+                # This loop ends here, so its pooled connections must be closed with it
+                await close_http_client()
+        
+        return asyncio.run(run())
+    
+    async def generate_seasonal_images_async(self, destination: str, output_dir: Path) -> Dict[str, Dict]:
         """
         Generate seasonal images for a destination
         
+        Seasons run as concurrent pipelines (generate -> download) gated by the
+        shared images-per-minute limiter; with ``create_collage`` the collage is
+        composed off the event loop, overlapping other destinations' generation.
+        
         Args:
             destination: Destination name (e.g., "Tokyo, Japan")
             output_dir: Directory to save images
@@ -85,72 +113,89 @@ class SeasonalImageGenerator:
         dest_dir = output_dir / self._sanitize_destination_name(destination)
         dest_dir.mkdir(parents=True, exist_ok=True)
         
+        seasons = list(self.season_prompts.keys())
+        season_results = await asyncio.gather(*[
+            self.generate_season_image(destination, season, dest_dir / f"{season}.jpg")
+            for season in seasons
+        ])
+        
         seasonal_results = {}
         seasonal_image_paths = []
+        for season, result in zip(seasons, season_results):
+            if 'error' not in result:
+                image_path = Path(result.pop('path'))
+                seasonal_image_paths.append(image_path)
+                result['local_path'] = str(image_path.relative_to(output_dir.parent))
+            seasonal_results[season] = result
         
-        # Generate images for each season with rate limiting
-        for i, (season, details) in enumerate(self.season_prompts.items()):
+        if self.create_collage and seasonal_image_paths:
+            collage_path = dest_dir / "seasonal_collage.jpg"
             try:
-                # Apply rate limiting delay (except for first image)
-                if self.rate_limit_enabled and i > 0:
-                    self._apply_rate_limit()
-                
-                logger.info(f"🌸 Generating {season} image for {destination}")
-                
-                # Create prompt
-                prompt = self.prompt_template.format(
-                    destination=destination,
-                    season=season,
-                    details=details
-                )
-                
-                # Generate image
-                image_url = self._generate_image_with_dalle(prompt)
-                
-                # Download and save image
-                image_path = dest_dir / f"{season}.jpg"
-                downloaded_path = self._download_image(image_url, image_path)
-                seasonal_image_paths.append(downloaded_path)
-                
-                # Store metadata
-                seasonal_results[season] = {
-                    'url': str(image_url),
-                    'local_path': str(downloaded_path.relative_to(output_dir.parent)),
-                    'prompt': prompt,
-                    'size': self.image_size,
-                    'model': self.model
+                await asyncio.to_thread(self._create_collage, seasonal_image_paths, collage_path)
+                seasonal_results['collage'] = {
+                    'local_path': str(collage_path.relative_to(output_dir.parent)),
+                    'images': len(seasonal_image_paths)
                 }
-                
-                logger.info(f"✅ {season.capitalize()} image saved: {downloaded_path}")
-                
-                # Update last generation time for rate limiting
-                if self.rate_limit_enabled:
-                    self.last_generation_time = time.time()
-                
+                logger.info(f"🖼️  Seasonal collage saved: {collage_path}")
             except Exception as e:
-                logger.error(f"❌ Failed to generate {season} image for {destination}: {e}")
-                seasonal_results[season] = {
-                    'error': str(e),
-                    'prompt': prompt if 'prompt' in locals() else None
-                }
+                logger.error(f"❌ Failed to create seasonal collage for {destination}: {e}")
+                seasonal_results['collage'] = {'error': str(e)}
         
         logger.info(f"🎨 Seasonal image generation complete for {destination}: {len(seasonal_results)} items")
         return seasonal_results
     
-    def _apply_rate_limit(self):
-        """Apply rate limiting delay if needed"""
-        if not self.rate_limit_enabled:
-            return
+    async def generate_season_image(self, destination: str, season: str, image_path: Path) -> Dict:
+        """
+        Generate and download a single seasonal image to ``image_path``.
+        Returns its metadata, or a dict with an ``error`` key on failure.
+        """
+        prompt = self.prompt_template.format(
+            destination=destination,
+            season=season,
+            details=self.season_prompts.get(season, "")
+        )
+        try:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            
+            logger.info(f"🌸 Generating {season} image for {destination}")
+            image_url = await self._generate_image_with_dalle(prompt)
             
-        current_time = time.time()
-        time_since_last = current_time - self.last_generation_time
+            # The download overlaps with the next generation waiting on the limiter
+            image_path.parent.mkdir(parents=True, exist_ok=True)
+            downloaded_path = await self._download_image(image_url, image_path)
+            
+            logger.info(f"✅ {season.capitalize()} image saved: {downloaded_path}")
+            return {
+                'url': str(image_url),
+                'path': str(downloaded_path),
+                'prompt': prompt,
+                'size': self.image_size,
+                'model': self.model
+            }
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to generate {season} image for {destination}: {e}")
+            return {
+                'error': str(e),
+                'prompt': prompt
+            }
+    
+    def _create_collage(self, image_paths: List[Path], collage_path: Path, tile_size: int = 512) -> Path:
+        """Tile the seasonal images into a 2-column grid"""
+        columns = 2
+        rows = (len(image_paths) + columns - 1) // columns
+        collage = Image.new('RGB', (columns * tile_size, rows * tile_size), 'white')
+        
+        for i, image_path in enumerate(image_paths):
+            with Image.open(image_path) as image:
+                tile = image.convert('RGB').resize((tile_size, tile_size))
+            collage.paste(tile, ((i % columns) * tile_size, (i // columns) * tile_size))
         
-        if time_since_last < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last
-            logger.info(f"⏳ Rate limiting: waiting {sleep_time:.1f}s...")
-            time.sleep(sleep_time)
+        collage.save(collage_path, 'JPEG', quality=90)
+        return collage_path
     
-    def _generate_image_with_dalle(self, prompt: str) -> str:
+    async def _generate_image_with_dalle(self, prompt: str) -> str:
         """Generate image using DALL-E API"""
         
         headers = {
@@ -168,31 +213,32 @@ class SeasonalImageGenerator:
         
         logger.debug(f"🎨 DALL-E request: {prompt[:100]}...")
         
-        response = requests.post(
+        async with self.http.post(
             "https://api.openai.com/v1/images/generations",
             headers=headers,
             json=payload,
-            timeout=self.timeout
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            image_url = result['data'][0]['url']
-            logger.debug(f"✅ DALL-E image generated: {image_url[:50]}...")
-            return image_url
-        else:
-            error_msg = f"DALL-E API failed: {response.status_code} - {response.text}"
-            logger.error(error_msg)
-            raise Exception(error_msg)
+            timeout=self.timeout,
+            retries=0  # a generation that reached the API may already be billed
+        ) as response:
+            if response.status == 200:
+                result = await response.json()
+                image_url = result['data'][0]['url']
+                logger.debug(f"✅ DALL-E image generated: {image_url[:50]}...")
+                return image_url
+            else:
+                error_msg = f"DALL-E API failed: {response.status} - {await response.text()}"
+                logger.error(error_msg)
+                raise Exception(error_msg)
     
-    def _download_image(self, url: str, save_path: Path) -> Path:
+    async def _download_image(self, url: str, save_path: Path) -> Path:
         """Download image from URL and save locally"""
         
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
+            async with self.http.get(url, timeout=30) as response:
+                response.raise_for_status()
+                content = await response.read()
             
-            save_path.write_bytes(response.content)
+            save_path.write_bytes(content)
             logger.debug(f"📥 Image downloaded: {save_path}")
             return save_path
             
@@ -273,9 +273,9 @@ def list_available_dashboards(base_output_dir: str = "outputs") -> list:
                 # Try to load summary info
                 if dashboard_info['has_summary']:
                     try:
-                        import json
-                        with open(summary_file, 'r') as f:
-                            summary = json.load(f)
+                        from src.core.json_fields import read_json_fields
+                        # session_info is the first member; the per-destination detail is never read
+                        summary = read_json_fields(summary_file, ['session_info'])
                         dashboard_info['summary'] = summary['session_info']
                         dashboard_info['destination_count'] = summary['session_info']['destinations_processed']
                     except Exception as e:
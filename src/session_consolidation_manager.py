@@ -12,6 +12,9 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from dataclasses import dataclass, asdict
 
+from src.core.near_duplicate_index import deduplicate_near_duplicates
+from src.core.session_index import extract_quality_score, get_session_index
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -42,6 +45,7 @@ class SessionConsolidationManager:
         self.config = config
         self.consolidation_config = config.get('session_management', {})
         self.outputs_dir = Path("outputs")
+        self.session_index = get_session_index(self.outputs_dir, config)
         
     async def consolidate_destination_data(self, destination: str) -> ConsolidatedData:
         """Main consolidation method for a destination"""
@@ -85,6 +89,36 @@ class SessionConsolidationManager:
         if not self.outputs_dir.exists():
             return sessions
         
+        if self.session_index is None:
+            sessions = await self._scan_sessions_for_destination(destination, dest_filename)
+        else:
+            # Indexed lookup; the refresh only re-reads files changed since the last one
+            self.session_index.refresh()
+            for entry in self.session_index.sessions_for_destination(dest_filename, dest_filename.replace('__', '_')):
+                quality_scores = entry['quality_scores']
+                sessions.append(SessionData(
+                    session_id=entry['session_id'],
+                    session_path=entry['session_path'],
+                    creation_date=datetime.fromtimestamp(entry['creation_date']),
+                    destinations=[destination],
+                    data_types=[t for t in ('themes', 'nuances', 'images') if t in quality_scores],
+                    quality_scores=quality_scores
+                ))
+        
+        # Sort by creation date (newest first)
+        sessions.sort(key=lambda s: s.creation_date, reverse=True)
+        
+        # Limit number of sessions to consider
+        max_sessions = self.consolidation_config.get('max_sessions_to_consider', 10)
+        sessions = sessions[:max_sessions]
+        
+        logger.info(f"Found {len(sessions)} sessions with data for {destination}")
+        return sessions
+    
+    async def _scan_sessions_for_destination(self, destination: str, dest_filename: str) -> List[SessionData]:
+        """Full directory scan, used when the session index is disabled"""
+        sessions = []
+        
         # Scan all session directories
         for session_dir in self.outputs_dir.glob("session_*"):
             if not session_dir.is_dir():
@@ -125,34 +159,11 @@ class SessionConsolidationManager:
                     quality_scores=quality_scores
                 ))
         
-        # Sort by creation date (newest first)
-        sessions.sort(key=lambda s: s.creation_date, reverse=True)
-        
-        # Limit number of sessions to consider
-        max_sessions = self.consolidation_config.get('max_sessions_to_consider', 10)
-        sessions = sessions[:max_sessions]
-        
-        logger.info(f"Found {len(sessions)} sessions with data for {destination}")
         return sessions
     
     async def _extract_quality_score(self, file_path: Path) -> float:
         """Extract quality score from a data file"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Try different locations for quality score
-            quality_score = (
-                data.get('quality_score') or
-                data.get('processing_metadata', {}).get('quality_score') or
-                0.0
-            )
-            
-            return float(quality_score)
-            
-        except Exception as e:
-            logger.warning(f"Failed to extract quality score from {file_path}: {e}")
-            return 0.0
+        return extract_quality_score(file_path)
     
     async def _load_session_data(self, destination: str, sessions: List[SessionData]) -> Dict[str, Dict]:
         """Load data from all relevant sessions"""
@@ -367,8 +378,25 @@ class SessionConsolidationManager:
                 unique_evidence.append(item)
                 seen_sources.add(unique_key)
         
+        # Collapse near-identical content carried over from different sessions/URLs
+        unique_evidence, _ = deduplicate_near_duplicates(
+            unique_evidence,
+            text_fn=self._evidence_text,
+            score_fn=lambda item: item.get('authority_score', 0) + item.get('relevance_score', 0),
+            threshold=self.consolidation_config.get('evidence_similarity_threshold', 0.85)
+        )
+        
         return unique_evidence
     
+    @staticmethod
+    def _evidence_text(item: Dict) -> str:
+        """Text body of an evidence item across the theme and nuance evidence formats"""
+        for field_name in ('content_snippet', 'text_content', 'text', 'snippet'):
+            value = item.get(field_name)
+            if isinstance(value, str) and value:
+                return value
+        return ''
+    
     async def _load_image_data(self, images_dir: Path) -> Dict[str, str]:
         """Load image paths from images directory"""
         image_data = {}
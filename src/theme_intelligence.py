@@ -7,6 +7,7 @@ import random
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import logging
+from src.core.keyword_scanner import KeywordHits, KeywordScanner
 from src.schemas import (
     EnhancedAffinity, ThemeDepthLevel, ExperienceIntensity, EmotionalResonance,
     AuthenticityLevel, CulturalSensitivity, MicroClimate, ThemeInterconnection,
@@ -91,6 +92,17 @@ class ThemeIntelligenceEngine:
                 'festival': ExperienceIntensity.EXTREME
             }
         }
+        
+        self.emerging_keywords = ['new', 'emerging', 'up-and-coming', 'recently opened', 'trending']
+        self.off_peak_keywords = ['avoid', 'off-season', 'quiet']
+        
+        # Every keyword map above, matched in one pass per affinity
+        self.keyword_scanner = KeywordScanner.from_keyword_maps(
+            self.emotional_keywords, self.authenticity_indicators, self.cultural_sensitivity_keywords,
+            self.experience_keywords, self.accessibility_keywords,
+            *(list(activities) for activities in self.intensity_mapping.values()),
+            self.emerging_keywords, self.off_peak_keywords
+        )
 
     def enhance_affinity(self, basic_affinity: Dict[str, Any], destination: str) -> EnhancedAffinity:
         """Transform a basic affinity into an enhanced one with all intelligence layers"""
@@ -102,6 +114,11 @@ class ThemeIntelligenceEngine:
         confidence = basic_affinity.get('confidence', 0.5)
         rationale = basic_affinity.get('rationale', '')
         
+        # One keyword scan serves every analyzer; prefixes cover the theme/rationale-only checks
+        hits = self.keyword_scanner.scan(f"{theme} {rationale} {' '.join(sub_themes)}")
+        rationale_hits = hits.prefix(len(f"{theme} {rationale}".lower()))
+        theme_hits = hits.prefix(len(theme.lower()))
+        
         # Generate nano themes
         nano_themes = self._generate_nano_themes(theme, sub_themes, rationale)
         
@@ -109,28 +126,28 @@ class ThemeIntelligenceEngine:
         depth_level = self._determine_depth_level(theme, sub_themes, nano_themes)
         
         # Assess authenticity
-        authenticity_level, authenticity_score = self._assess_authenticity(theme, rationale, destination)
+        authenticity_level, authenticity_score = self._assess_authenticity(theme, rationale, destination, rationale_hits)
         
         # Analyze emotional resonance
-        emotional_resonance = self._analyze_emotional_resonance(theme, rationale, sub_themes)
+        emotional_resonance = self._analyze_emotional_resonance(theme, rationale, sub_themes, hits)
         
         # Calculate experience intensity
-        experience_intensity = self._calculate_experience_intensity(theme, rationale, category)
+        experience_intensity = self._calculate_experience_intensity(theme, rationale, category, rationale_hits)
         
         # Analyze micro-climate factors
         micro_climate = self._analyze_micro_climate(theme, destination, basic_affinity.get('seasonality', {}))
         
         # Assess cultural sensitivity
-        cultural_sensitivity = self._assess_cultural_sensitivity(theme, rationale, destination)
+        cultural_sensitivity = self._assess_cultural_sensitivity(theme, rationale, destination, rationale_hits)
         
         # Generate experience context
-        experience_context = self._generate_experience_context(theme, basic_affinity.get('traveler_types', []))
+        experience_context = self._generate_experience_context(theme, basic_affinity.get('traveler_types', []), theme_hits)
         
         # Analyze theme interconnections
         theme_interconnections = self._analyze_theme_interconnections(theme, category, sub_themes)
         
         # Calculate hidden gem score
-        hidden_gem_score = self._calculate_hidden_gem_score(theme, rationale, authenticity_level)
+        hidden_gem_score = self._calculate_hidden_gem_score(theme, rationale, authenticity_level, rationale_hits)
         
         return EnhancedAffinity(
             theme=theme,
@@ -198,14 +215,16 @@ class ThemeIntelligenceEngine:
         else:
             return ThemeDepthLevel.MACRO
 
-    def _assess_authenticity(self, theme: str, rationale: str, destination: str) -> Tuple[AuthenticityLevel, float]:
+    def _assess_authenticity(self, theme: str, rationale: str, destination: str,
+                             hits: Optional[KeywordHits] = None) -> Tuple[AuthenticityLevel, float]:
         """Assess the authenticity level and score of the theme"""
-        text = f"{theme} {rationale}".lower()
+        if hits is None:
+            hits = self.keyword_scanner.scan(f"{theme} {rationale}")
         
-        local_score = sum(1 for marker in self.authenticity_indicators['local_markers'] if marker in text)
-        tourist_score = sum(1 for marker in self.authenticity_indicators['tourist_markers'] if marker in text)
-        insider_score = sum(1 for marker in self.authenticity_indicators['insider_markers'] if marker in text)
-        commercial_score = sum(1 for marker in self.authenticity_indicators['commercial_markers'] if marker in text)
+        local_score = hits.count_of(self.authenticity_indicators['local_markers'])
+        tourist_score = hits.count_of(self.authenticity_indicators['tourist_markers'])
+        insider_score = hits.count_of(self.authenticity_indicators['insider_markers'])
+        commercial_score = hits.count_of(self.authenticity_indicators['commercial_markers'])
         
         # Calculate authenticity score
         positive_signals = local_score + insider_score
@@ -222,13 +241,15 @@ class ThemeIntelligenceEngine:
         else:
             return AuthenticityLevel.BALANCED, 0.5
 
-    def _analyze_emotional_resonance(self, theme: str, rationale: str, sub_themes: List[str]) -> List[EmotionalResonance]:
+    def _analyze_emotional_resonance(self, theme: str, rationale: str, sub_themes: List[str],
+                                     hits: Optional[KeywordHits] = None) -> List[EmotionalResonance]:
         """Analyze the emotional resonance of the theme"""
-        text = f"{theme} {rationale} {' '.join(sub_themes)}".lower()
+        if hits is None:
+            hits = self.keyword_scanner.scan(f"{theme} {rationale} {' '.join(sub_themes)}")
         resonances = []
         
         for emotion, keywords in self.emotional_keywords.items():
-            if any(keyword in text for keyword in keywords):
+            if hits.any_of(keywords):
                 resonances.append(emotion)
         
         # Default resonances based on theme category
@@ -247,14 +268,16 @@ class ThemeIntelligenceEngine:
         
         return resonances[:3]  # Limit to top 3
 
-    def _calculate_experience_intensity(self, theme: str, rationale: str, category: str) -> Dict[str, ExperienceIntensity]:
+    def _calculate_experience_intensity(self, theme: str, rationale: str, category: str,
+                                        hits: Optional[KeywordHits] = None) -> Dict[str, ExperienceIntensity]:
         """Calculate experience intensity across different dimensions"""
-        text = f"{theme} {rationale}".lower()
+        if hits is None:
+            hits = self.keyword_scanner.scan(f"{theme} {rationale}")
         intensity = {}
         
         # Physical intensity
         for activity, level in self.intensity_mapping['physical'].items():
-            if activity in text:
+            if activity in hits:
                 intensity['physical'] = level
                 break
         else:
@@ -262,7 +285,7 @@ class ThemeIntelligenceEngine:
         
         # Cultural intensity
         for activity, level in self.intensity_mapping['cultural'].items():
-            if activity in text:
+            if activity in hits:
                 intensity['cultural'] = level
                 break
         else:
@@ -270,7 +293,7 @@ class ThemeIntelligenceEngine:
         
         # Social intensity
         for activity, level in self.intensity_mapping['social'].items():
-            if activity in text:
+            if activity in hits:
                 intensity['social'] = level
                 break
         else:
@@ -332,29 +355,31 @@ class ThemeIntelligenceEngine:
                 return "Fall foliage season"
         return None
 
-    def _assess_cultural_sensitivity(self, theme: str, rationale: str, destination: str) -> CulturalSensitivity:
+    def _assess_cultural_sensitivity(self, theme: str, rationale: str, destination: str,
+                                     hits: Optional[KeywordHits] = None) -> CulturalSensitivity:
         """Assess cultural sensitivity requirements"""
-        text = f"{theme} {rationale}".lower()
+        if hits is None:
+            hits = self.keyword_scanner.scan(f"{theme} {rationale}")
         considerations = []
         
         # Check for religious considerations
         religious_aware = True
-        if any(keyword in text for keyword in self.cultural_sensitivity_keywords['religious']):
+        if hits.any_of(self.cultural_sensitivity_keywords['religious']):
             considerations.append("Respect religious customs and dress codes")
             religious_aware = True
         
         # Check for dress code requirements
-        if any(keyword in text for keyword in self.cultural_sensitivity_keywords['dress_code']):
+        if hits.any_of(self.cultural_sensitivity_keywords['dress_code']):
             considerations.append("Modest dress required")
         
         # Check for custom awareness
         customs_respected = True
-        if any(keyword in text for keyword in self.cultural_sensitivity_keywords['customs']):
+        if hits.any_of(self.cultural_sensitivity_keywords['customs']):
             considerations.append("Learn local customs and etiquette")
         
         # Language requirements
         language_req = None
-        if any(keyword in text for keyword in self.cultural_sensitivity_keywords['language']):
+        if hits.any_of(self.cultural_sensitivity_keywords['language']):
             language_req = "Basic local language helpful"
         
         return CulturalSensitivity(
@@ -365,9 +390,12 @@ class ThemeIntelligenceEngine:
             language_requirements=language_req
         )
 
-    def _generate_experience_context(self, theme: str, traveler_types: List[str]) -> ExperienceContext:
+    def _generate_experience_context(self, theme: str, traveler_types: List[str],
+                                     hits: Optional[KeywordHits] = None) -> ExperienceContext:
         """Generate experience context information"""
         theme_lower = theme.lower()
+        if hits is None:
+            hits = self.keyword_scanner.scan(theme)
         
         # Demographic suitability
         demographics = []
@@ -386,14 +414,14 @@ class ThemeIntelligenceEngine:
         # Experience level
         experience_level = "beginner"
         for level, keywords in self.experience_keywords.items():
-            if any(keyword in theme_lower for keyword in keywords):
+            if hits.any_of(keywords):
                 experience_level = level
                 break
         
         # Accessibility
         accessibility = "accessible"
         for level, keywords in self.accessibility_keywords.items():
-            if any(keyword in theme_lower for keyword in keywords):
+            if hits.any_of(keywords):
                 accessibility = level
                 break
         
@@ -443,25 +471,26 @@ class ThemeIntelligenceEngine:
             energy_flow=energy_flow
         )
 
-    def _calculate_hidden_gem_score(self, theme: str, rationale: str, authenticity_level: AuthenticityLevel) -> HiddenGemScore:
+    def _calculate_hidden_gem_score(self, theme: str, rationale: str, authenticity_level: AuthenticityLevel,
+                                    hits: Optional[KeywordHits] = None) -> HiddenGemScore:
         """Calculate hidden gem potential score"""
-        text = f"{theme} {rationale}".lower()
+        if hits is None:
+            hits = self.keyword_scanner.scan(f"{theme} {rationale}")
         
         # Local frequency ratio (inverse of tourist mentions)
-        tourist_mentions = sum(1 for marker in self.authenticity_indicators['tourist_markers'] if marker in text)
-        local_mentions = sum(1 for marker in self.authenticity_indicators['local_markers'] if marker in text)
+        tourist_mentions = hits.count_of(self.authenticity_indicators['tourist_markers'])
+        local_mentions = hits.count_of(self.authenticity_indicators['local_markers'])
         
         local_ratio = max(0.1, (local_mentions + 1) / (tourist_mentions + local_mentions + 2))
         
         # Insider knowledge required
-        insider_required = any(marker in text for marker in self.authenticity_indicators['insider_markers'])
+        insider_required = hits.any_of(self.authenticity_indicators['insider_markers'])
         
         # Emerging scene indicator
-        emerging_keywords = ['new', 'emerging', 'up-and-coming', 'recently opened', 'trending']
-        emerging = any(keyword in text for keyword in emerging_keywords)
+        emerging = hits.any_of(self.emerging_keywords)
         
         # Off-peak excellence
-        off_peak = 'avoid' in text or 'off-season' in text or 'quiet' in text
+        off_peak = hits.any_of(self.off_peak_keywords)
         
         # Overall uniqueness score
         uniqueness = 0.3  # Base score
@@ -6,6 +6,7 @@ from sentence_transformers import SentenceTransformer, util
 from tools.vectorize_processing_tool import ProcessContentWithVectorizeTool
 from src.evidence_validator import EvidenceValidator
 from src.evidence_schema import ValidationStatus
+from src.core.embedding_store import get_embedding_store
 
 class AffinityValidator:
     """
@@ -15,7 +16,9 @@ class AffinityValidator:
     def __init__(self, config: dict, vectorizer: ProcessContentWithVectorizeTool):
         self.config = config
         self.vectorizer = vectorizer
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+        self.model_name = 'all-MiniLM-L6-v2'
+        self.model = SentenceTransformer(self.model_name)
+        self.embedding_store = get_embedding_store(self.model_name, config)
         
         # Initialize comprehensive evidence validator
         self.evidence_validator = EvidenceValidator(config)
@@ -226,7 +229,10 @@ class AffinityValidator:
         themes = [affinity['theme'] for affinity in affinities]
         self.logger.info(f"Clustering themes: {themes}")
 
-        embeddings = self.model.encode(themes, convert_to_tensor=True)
+        if self.embedding_store is not None:
+            embeddings = self.embedding_store.encode(self.model, themes)
+        else:
+            embeddings = self.model.encode(themes, convert_to_tensor=True)
         similarity_matrix = util.pytorch_cos_sim(embeddings, embeddings)
         
         clusters = []
@@ -1,12 +1,13 @@
 from urllib.parse import urlparse
 import asyncio
 import logging
-import aiohttp
 from typing import Type, Dict, Any, Optional
 
 from langchain.tools import StructuredTool
 from pydantic import BaseModel, Field
 
+from src.core.http_client import get_http_client
+
 # from src.schemas import FetchPageInput # Not strictly needed if using JinaReaderToolInput directly
 
 logger = logging.getLogger(__name__)
@@ -48,21 +49,21 @@ class JinaReaderTool(StructuredTool):
         }
 
         try:
-            async with aiohttp.ClientSession() as session: # Create session inside or ensure it's passed if used heavily
-                async with session.get(request_url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as resp:
-                    logger.debug(f"[JinaReaderTool] Response status for {url}: {resp.status}")
-                    if resp.status == 200:
-                        # Jina Reader (r.jina.ai/URL) typically returns raw text/markdown directly
-                        text_content = await resp.text(encoding='utf-8', errors='ignore')
-                        logger.info(f"[JinaReaderTool] Successfully fetched content for {url} (length: {len(text_content)}).")
-                        if not text_content.strip():
-                            logger.warning(f"[JinaReaderTool] Content for {url} is empty after fetching.")
-                            return f"Error: Jina Reader returned empty content for {url}."
-                        return text_content
-                    else:
-                        error_text = await resp.text()
-                        logger.error(f"[JinaReaderTool] Error fetching {url}. Status: {resp.status}, Response: {error_text[:500]}")
-                        return f"Error: Jina Reader failed for {url}. Status: {resp.status}. Details: {error_text[:200]}"
+            # Shared keep-alive client: repeated reads reuse the same r.jina.ai connections
+            async with get_http_client().get(request_url, headers=headers, timeout=30) as resp:
+                logger.debug(f"[JinaReaderTool] Response status for {url}: {resp.status}")
+                if resp.status == 200:
+                    # Jina Reader (r.jina.ai/URL) typically returns raw text/markdown directly
+                    text_content = await resp.text(encoding='utf-8', errors='ignore')
+                    logger.info(f"[JinaReaderTool] Successfully fetched content for {url} (length: {len(text_content)}).")
+                    if not text_content.strip():
+                        logger.warning(f"[JinaReaderTool] Content for {url} is empty after fetching.")
+                        return f"Error: Jina Reader returned empty content for {url}."
+                    return text_content
+                else:
+                    error_text = await resp.text()
+                    logger.error(f"[JinaReaderTool] Error fetching {url}. Status: {resp.status}, Response: {error_text[:500]}")
+                    return f"Error: Jina Reader failed for {url}. Status: {resp.status}. Details: {error_text[:200]}"
         except asyncio.TimeoutError:
             logger.warning(f"[JinaReaderTool] Timeout fetching {url}.")
             return f"Error: Timeout while Jina Reader was fetching {url}."
@@ -4,6 +4,8 @@ import re
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+from src.core.keyword_scanner import KeywordHits, KeywordScanner
+
 class PriorityDataExtractor:
     """
     Extracts structured priority data about safety, accessibility, visa requirements,
@@ -57,6 +59,15 @@ class PriorityDataExtractor:
             'water': ['water safety', 'bottled water', 'tap water', 'water quality'],
             'food': ['food safety', 'street food', 'foodborne illness']
         }
+        
+        self.transport_keywords = ['airport', 'train', 'bus', 'taxi', 'metro', 'subway', 'transport', 'getting around']
+        self.emergency_keywords = ['emergency', 'police', 'hospital', 'embassy', 'consulate', 'help']
+        
+        # Every keyword above, matched in one pass per document
+        self.keyword_scanner = KeywordScanner.from_keyword_maps(
+            self.safety_patterns, self.accessibility_indicators, self.visa_keywords,
+            self.health_patterns, self.transport_keywords, self.emergency_keywords
+        )
 
     def extract_all_priority_data(self, content: str, url: str, destination: str = "") -> dict:
         """
@@ -76,13 +87,16 @@ class PriorityDataExtractor:
             self.logger.warning(f"Content too short for meaningful extraction: {len(content)} chars")
             return self._empty_extraction(url)
         
+        # One keyword scan shared by every extractor
+        hits = self.keyword_scanner.scan(content)
+        
         # Extract different types of priority data
-        safety_data = self._extract_safety_concerns(content, url)
-        visa_data = self._extract_visa_requirements(content, destination)
-        health_data = self._extract_health_advisories(content)
-        accessibility_data = self._extract_accessibility_features(content)
-        transport_data = self._extract_transportation_info(content)
-        emergency_data = self._extract_emergency_contacts(content)
+        safety_data = self._extract_safety_concerns(content, url, hits)
+        visa_data = self._extract_visa_requirements(content, destination, hits)
+        health_data = self._extract_health_advisories(content, hits)
+        accessibility_data = self._extract_accessibility_features(content, hits)
+        transport_data = self._extract_transportation_info(content, hits)
+        emergency_data = self._extract_emergency_contacts(content, hits)
         
         # Calculate overall confidence and completeness
         extraction_confidence = self._calculate_extraction_confidence([
@@ -137,9 +151,10 @@ class PriorityDataExtractor:
         self.logger.info(f"Extraction complete. Confidence: {extraction_confidence:.3f}, Completeness: {data_completeness:.3f}")
         return result
     
-    def _extract_safety_concerns(self, content: str, url: str) -> dict:
+    def _extract_safety_concerns(self, content: str, url: str, hits: Optional[KeywordHits] = None) -> dict:
         """Extract safety-related information from content."""
-        content_lower = content.lower()
+        if hits is None:
+            hits = self.keyword_scanner.scan(content)
         safety_items = []
         confidence_scores = []
         
@@ -147,9 +162,9 @@ class PriorityDataExtractor:
         for category, keywords in self.safety_patterns.items():
             found_items = []
             for keyword in keywords:
-                if keyword in content_lower:
+                if keyword in hits:
                     # Extract surrounding context
-                    context = self._extract_context(content, keyword, 100)
+                    context = self._extract_context(content, keyword, 100, hits.first(keyword))
                     if context and len(context.strip()) > 20:
                         found_items.append({
                             'category': category,
@@ -175,17 +190,20 @@ class PriorityDataExtractor:
             'source_credibility': source_credibility
         }
     
-    def _extract_visa_requirements(self, content: str, destination: str) -> dict:
+    def _extract_visa_requirements(self, content: str, destination: str,
+                                   hits: Optional[KeywordHits] = None) -> dict:
         """Extract visa requirement information."""
         content_lower = content.lower()
+        if hits is None:
+            hits = self.keyword_scanner.scan(content)
         visa_info = "No information found."
         confidence = 0.0
         
         # Look for visa-related information
         for category, keywords in self.visa_keywords.items():
             for keyword in keywords:
-                if keyword in content_lower:
-                    context = self._extract_context(content, keyword, 200)
+                if keyword in hits:
+                    context = self._extract_context(content, keyword, 200, hits.first(keyword))
                     if context:
                         visa_info = context.strip()
                         confidence = 0.8
@@ -216,17 +234,18 @@ class PriorityDataExtractor:
             'confidence': confidence
         }
     
-    def _extract_health_advisories(self, content: str) -> dict:
+    def _extract_health_advisories(self, content: str, hits: Optional[KeywordHits] = None) -> dict:
         """Extract health and medical advisory information."""
-        content_lower = content.lower()
+        if hits is None:
+            hits = self.keyword_scanner.scan(content)
         health_items = []
         confidence_scores = []
         
         for category, keywords in self.health_patterns.items():
             found_items = []
             for keyword in keywords:
-                if keyword in content_lower:
-                    context = self._extract_context(content, keyword, 120)
+                if keyword in hits:
+                    context = self._extract_context(content, keyword, 120, hits.first(keyword))
                     if context and len(context.strip()) > 15:
                         found_items.append({
                             'category': category,
@@ -245,17 +264,18 @@ class PriorityDataExtractor:
             'confidence': overall_confidence
         }
     
-    def _extract_accessibility_features(self, content: str) -> dict:
+    def _extract_accessibility_features(self, content: str, hits: Optional[KeywordHits] = None) -> dict:
         """Extract accessibility-related information."""
-        content_lower = content.lower()
+        if hits is None:
+            hits = self.keyword_scanner.scan(content)
         accessibility_items = []
         confidence_scores = []
         
         for category, keywords in self.accessibility_indicators.items():
             found_items = []
             for keyword in keywords:
-                if keyword in content_lower:
-                    context = self._extract_context(content, keyword, 100)
+                if keyword in hits:
+                    context = self._extract_context(content, keyword, 100, hits.first(keyword))
                     if context:
                         found_items.append({
                             'category': category,
@@ -274,15 +294,15 @@ class PriorityDataExtractor:
             'confidence': overall_confidence
         }
     
-    def _extract_transportation_info(self, content: str) -> dict:
+    def _extract_transportation_info(self, content: str, hits: Optional[KeywordHits] = None) -> dict:
         """Extract transportation-related information."""
-        transport_keywords = ['airport', 'train', 'bus', 'taxi', 'metro', 'subway', 'transport', 'getting around']
-        content_lower = content.lower()
+        if hits is None:
+            hits = self.keyword_scanner.scan(content)
         transport_items = []
         
-        for keyword in transport_keywords:
-            if keyword in content_lower:
-                context = self._extract_context(content, keyword, 150)
+        for keyword in self.transport_keywords:
+            if keyword in hits:
+                context = self._extract_context(content, keyword, 150, hits.first(keyword))
                 if context and len(context.strip()) > 20:
                     transport_items.append({
                         'type': keyword,
@@ -296,18 +316,18 @@ class PriorityDataExtractor:
             'confidence': confidence
         }
     
-    def _extract_emergency_contacts(self, content: str) -> dict:
+    def _extract_emergency_contacts(self, content: str, hits: Optional[KeywordHits] = None) -> dict:
         """Extract emergency contact information."""
         # Look for phone numbers and emergency-related text
         phone_pattern = r'(\+?\d{1,4}[-.\s]?\(?\d{1,4}\)?[-.\s]?\d{1,4}[-.\s]?\d{1,9})'
-        emergency_keywords = ['emergency', 'police', 'hospital', 'embassy', 'consulate', 'help']
         
-        content_lower = content.lower()
+        if hits is None:
+            hits = self.keyword_scanner.scan(content)
         emergency_items = []
         
-        for keyword in emergency_keywords:
-            if keyword in content_lower:
-                context = self._extract_context(content, keyword, 100)
+        for keyword in self.emergency_keywords:
+            if keyword in hits:
+                context = self._extract_context(content, keyword, 100, hits.first(keyword))
                 if context:
                     # Look for phone numbers in the context
                     phones = re.findall(phone_pattern, context)
@@ -325,12 +345,13 @@ class PriorityDataExtractor:
             'confidence': confidence
         }
     
-    def _extract_context(self, content: str, keyword: str, context_length: int = 100) -> str:
-        """Extract surrounding context for a keyword."""
-        content_lower = content.lower()
+    def _extract_context(self, content: str, keyword: str, context_length: int = 100,
+                         start_pos: Optional[int] = None) -> str:
+        """Extract surrounding context for a keyword (at ``start_pos`` when already known)."""
         keyword_lower = keyword.lower()
         
-        start_pos = content_lower.find(keyword_lower)
+        if start_pos is None:
+            start_pos = content.lower().find(keyword_lower)
         if start_pos == -1:
             return ""
         
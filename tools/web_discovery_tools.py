@@ -7,13 +7,18 @@ import asyncio
 import logging
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
-import aiohttp
 import json
 from urllib.parse import quote_plus
 import os
 
+from src.core.html_extraction import extract_page, extract_page_async
+from src.core.http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
+# Page chrome dropped before scraping text
+TEXT_NOISY_ELEMENTS = ("script", "style", "nav", "header", "footer")
+
 @dataclass
 class WebDiscoveryResult:
     """Container for web discovery results"""
@@ -37,6 +42,9 @@ class WebDiscoveryTool:
         self.brave_api_key = os.getenv('BRAVE_SEARCH_API_KEY')
         self.jina_api_key = os.getenv('JINA_API_KEY')
         
+        # Process-wide keep-alive client with per-host limits
+        self.http = get_http_client(config)
+        
     async def discover_destination_content(self, destination: str) -> Dict[str, Any]:
         """Discover web content for a destination"""
         
@@ -143,42 +151,41 @@ class WebDiscoveryTool:
             return []
         
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    'X-Subscription-Token': self.brave_api_key,
-                    'Accept': 'application/json'
-                }
-                
-                params = {
-                    'q': query,
-                    'count': 10,
-                    'search_lang': 'en',
-                    'country': 'US',
-                    'safesearch': 'moderate'
-                }
-                
-                async with session.get(
-                    'https://api.search.brave.com/res/v1/web/search',
-                    headers=headers,
-                    params=params,
-                    timeout=self.timeout
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        results = []
-                        
-                        for result in data.get('web', {}).get('results', []):
-                            results.append({
-                                'url': result.get('url'),
-                                'title': result.get('title'),
-                                'snippet': result.get('description', '')
-                            })
-                        
-                        return results
-                    else:
-                        logger.warning(f"Brave Search API returned status {response.status}")
-                        return []
-                        
+            headers = {
+                'X-Subscription-Token': self.brave_api_key,
+                'Accept': 'application/json'
+            }
+            
+            params = {
+                'q': query,
+                'count': 10,
+                'search_lang': 'en',
+                'country': 'US',
+                'safesearch': 'moderate'
+            }
+            
+            async with self.http.get(
+                'https://api.search.brave.com/res/v1/web/search',
+                headers=headers,
+                params=params,
+                timeout=self.timeout
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    results = []
+                    
+                    for result in data.get('web', {}).get('results', []):
+                        results.append({
+                            'url': result.get('url'),
+                            'title': result.get('title'),
+                            'snippet': result.get('description', '')
+                        })
+                    
+                    return results
+                else:
+                    logger.warning(f"Brave Search API returned status {response.status}")
+                    return []
+                    
         except Exception as e:
             logger.error(f"Brave Search API error: {e}")
             return []
@@ -195,29 +202,28 @@ class WebDiscoveryTool:
         """Extract content using Jina Reader API"""
         
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    'Authorization': f'Bearer {self.jina_api_key}',
-                    'Accept': 'application/json'
-                }
-                
-                jina_url = f'https://r.jina.ai/{url}'
-                
-                async with session.get(
-                    jina_url,
-                    headers=headers,
-                    timeout=self.timeout
-                ) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        return {
-                            'title': f'Content from {url}',
-                            'content': content[:2000],  # Limit content length
-                            'relevance_score': 0.7
-                        }
-                    else:
-                        logger.warning(f"Jina Reader API returned status {response.status} for {url}")
-                        return None
+            headers = {
+                'Authorization': f'Bearer {self.jina_api_key}',
+                'Accept': 'application/json'
+            }
+            
+            jina_url = f'https://r.jina.ai/{url}'
+            
+            async with self.http.get(
+                jina_url,
+                headers=headers,
+                timeout=self.timeout
+            ) as response:
+                if response.status == 200:
+                    content = await response.text()
+                    return {
+                        'title': f'Content from {url}',
+                        'content': content[:2000],  # Limit content length
+                        'relevance_score': 0.7
+                    }
+                else:
+                    logger.warning(f"Jina Reader API returned status {response.status} for {url}")
+                    return None
         except Exception as e:
             logger.error(f"Jina Reader API error for {url}: {e}")
             return None
@@ -226,31 +232,31 @@ class WebDiscoveryTool:
         """Fallback content extraction using basic web scraping"""
         
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            headers = {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            }
+            
+            async with self.http.get(url, headers=headers, timeout=self.timeout) as response:
+                if response.status == 200:
+                    html_content = await response.text()
+                else:
+                    logger.warning(f"HTTP {response.status} for {url}")
+                    return None
+            
+            # Text and title come from one parse, run off the event loop
+            page = await extract_page_async(html_content, TEXT_NOISY_ELEMENTS, self.config)
+            extracted_content = page.text
+            
+            if extracted_content and len(extracted_content) > 100:
+                return {
+                    'title': page.title or "Web Content",
+                    'content': extracted_content[:2000],  # Limit content length
+                    'relevance_score': 0.6
                 }
-                
-                async with session.get(url, headers=headers, timeout=self.timeout) as response:
-                    if response.status == 200:
-                        html_content = await response.text()
-                        
-                        # Basic HTML content extraction
-                        extracted_content = self._extract_text_from_html(html_content)
-                        
-                        if extracted_content and len(extracted_content) > 100:
-                            return {
-                                'title': self._extract_title_from_html(html_content),
-                                'content': extracted_content[:2000],  # Limit content length
-                                'relevance_score': 0.6
-                            }
-                        else:
-                            logger.warning(f"Insufficient content extracted from {url}")
-                            return None
-                    else:
-                        logger.warning(f"HTTP {response.status} for {url}")
-                        return None
-                        
+            else:
+                logger.warning(f"Insufficient content extracted from {url}")
+                return None
+                    
         except Exception as e:
             logger.warning(f"Web scraping failed for {url}: {e}")
             return None
@@ -258,35 +264,7 @@ class WebDiscoveryTool:
     def _extract_text_from_html(self, html_content: str) -> str:
         """Extract readable text from HTML content"""
         try:
-            from bs4 import BeautifulSoup
-            
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "header", "footer"]):
-                script.decompose()
-            
-            # Get text content
-            text = soup.get_text()
-            
-            # Clean up text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            return text
-            
-        except ImportError:
-            # Fallback without BeautifulSoup - basic regex cleaning
-            import re
-            
-            # Remove HTML tags
-            text = re.sub(r'<[^>]+>', '', html_content)
-            
-            # Clean up whitespace
-            text = re.sub(r'\s+', ' ', text).strip()
-            
-            return text
+            return extract_page(html_content, TEXT_NOISY_ELEMENTS).text
         except Exception as e:
             logger.warning(f"HTML text extraction failed: {e}")
             return ""
@@ -294,27 +272,9 @@ class WebDiscoveryTool:
     def _extract_title_from_html(self, html_content: str) -> str:
         """Extract title from HTML content"""
         try:
-            from bs4 import BeautifulSoup
-            
-            soup = BeautifulSoup(html_content, 'html.parser')
-            title_tag = soup.find('title')
-            
-            if title_tag:
-                return title_tag.get_text().strip()
-            else:
-                # Try to find h1 as fallback
-                h1_tag = soup.find('h1')
-                if h1_tag:
-                    return h1_tag.get_text().strip()
-                    
-        except ImportError:
-            # Fallback without BeautifulSoup - basic regex
-            import re
-            
-            title_match = re.search(r'<title[^>]*>([^<]+)</title>', html_content, re.IGNORECASE)
-            if title_match:
-                return title_match.group(1).strip()
-                
+            title = extract_page(html_content, TEXT_NOISY_ELEMENTS).title
+            if title:
+                return title
         except Exception as e:
             logger.warning(f"HTML title extraction failed: {e}")
             